@@ -7,6 +7,7 @@
 # Updates:
 #  7-Jan-2019  jdw moved from ChemRefEtlWorker.
 #  3-Sep-2019  jdw moved again to module rcsb.exdb.chemref
+# 16-Oct-2026  jdw compute unique accession codes on the server using ObjectExtractor.getDistinctValues()
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -16,8 +17,7 @@ __license__ = "Apache 2.0"
 
 import logging
 
-from rcsb.db.mongo.Connection import Connection
-from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
+from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,6 @@ class ChemRefExtractor(object):
 
     def __init__(self, cfgOb):
         self.__cfgOb = cfgOb
-        self.__resourceName = "MONGO_DB"
         #
 
     def getChemCompAccessionMapping(self, extResource, **kwargs):
@@ -46,29 +45,19 @@ class ChemRefExtractor(object):
         idD = {}
         logger.debug("With %r %r", extResource, kwargs)
         try:
-            docList = []
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
-                mg = MongoDbUtil(client)
-                if mg.collectionExists("chem_comp_core", "bird_chem_comp_core"):
-                    logger.info("Document count is %d", mg.count("chem_comp_core", "chem_comp_core"))
-                    qD = {"rcsb_chem_comp_related.resource_name": extResource}
-                    selectL = ["rcsb_chem_comp_related"]
-                    tL = mg.fetch("chem_comp_core", "chem_comp_core", selectL, queryD=qD)
-                    logger.info("CC mapping count %d", len(tL))
-                    docList.extend(tL)
-
-                if mg.collectionExists("bird_chem_comp_core", "bird_chem_comp_core"):
-                    qD = {"rcsb_chem_comp_related.resource_name": extResource}
-                    selectL = ["rcsb_chem_comp_related"]
-                    tL = mg.fetch("bird_chem_comp_core", "bird_chem_comp_core", selectL, queryD=qD)
-                    logger.info("CC/BIRD mapping count %d", len(tL))
-                    docList.extend(tL)
-                #
-                for doc in docList:
-                    dL = doc["rcsb_chem_comp_related"] if "rcsb_chem_comp_related" in doc else []
-                    for dD in dL:
-                        if dD["resource_name"] == extResource and "resource_accession_code" in dD:
-                            idD[dD["resource_accession_code"]] = True
+            for databaseName, collectionName in [("chem_comp_core", "chem_comp_core"), ("bird_chem_comp_core", "bird_chem_comp_core")]:
+                obEx = ObjectExtractor(
+                    self.__cfgOb,
+                    databaseName=databaseName,
+                    collectionName=collectionName,
+                    useCache=False,
+                    selectionQuery={"rcsb_chem_comp_related.resource_name": extResource},
+                )
+                # Unique accession codes are computed on the server from the unwound related resource list
+                tL = obEx.getDistinctValues("rcsb_chem_comp_related[].resource_accession_code", elementQuery={"rcsb_chem_comp_related.resource_name": extResource})
+                logger.info("%s mapping count %d", collectionName, len(tL))
+                for tId in tL:
+                    idD[tId] = True
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return idD
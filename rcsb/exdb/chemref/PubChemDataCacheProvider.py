@@ -7,6 +7,11 @@
 # Updates:
 #  9-May-2020 jdw separate cache behavior with separate option rebuildChemIndices=True/False
 # 16-Jul-2020 jdw separate index and reference data management.
+# 16-Oct-2026 jdw save chunks using bulk upserts ObjectUpdater.update(..., bulk=True)
+# 16-Oct-2026 jdw write only changed content when saving refreshed chunks (changeOnly=True)
+# 16-Oct-2026 jdw reuse a pooled connection for worker chunk saves (usePool=True)
+# 16-Oct-2026 jdw save worker chunks with a write-behind ObjectUpdaterQueue() overlapping fetch and save
+# 16-Oct-2026 jdw exclude identifiers in chunks that failed to save from the worker success list
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -20,6 +25,7 @@ import time
 
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.exdb.utils.ObjectUpdaterQueue import ObjectUpdaterQueue
 from rcsb.utils.chemref.PubChemUtils import PubChemUtils, ChemicalIdentifier
 from rcsb.utils.io.IoUtil import getObjSize
 from rcsb.utils.io.MarshalUtil import MarshalUtil
@@ -62,6 +68,9 @@ class PubChemDataUpdateWorker(object):
         diagList = []
         emptyList = []
         #
+        # Chunks are saved in a background thread while the next chunk is fetched
+        uQ = ObjectUpdaterQueue(self.__cfgOb, changeOnly=True)
+        chunkD = {}
         try:
             tU = TimeUtil()
             pcidList = dataList
@@ -91,18 +100,23 @@ class PubChemDataUpdateWorker(object):
                     else:
                         logger.info("No match result for any form of %s", pcid)
                 # --
-                startTimeL = time.time()
-                logger.info("Saving chunk %d (len=%d)", ii, len(pcidChunk))
-                self.__updateObjectStore(self.__databaseName, self.__refDataCollectionName, tDL)
-                endTimeL = time.time()
-                logger.info("Saved chunk %d (len=%d) in %.3f secs", ii, len(pcidChunk), endTimeL - startTimeL)
+                logger.info("Queueing chunk %d (len=%d)", ii, len(pcidChunk))
+                chunkD[ii] = pcidChunk
+                self.__updateObjectStore(uQ, self.__databaseName, self.__refDataCollectionName, tDL, tag=ii)
         except Exception as e:
             logger.exception("Failing %s for %d data items %s", procName, len(dataList), str(e))
+        finally:
+            # Save any pending chunks before returning
+            uQ.close()
+        failIdS = set([tId for ii in uQ.getFailedTags() for tId in chunkD.get(ii, [])])
+        if failIdS:
+            logger.error("%s failing to save %d identifiers", procName, len(failIdS))
+            successList = [pcid for pcid in successList if pcid not in failIdS]
         logger.info("%s dataList length %d success length %d rst1 %d rst2 %d", procName, len(dataList), len(successList), len(retList1), len(retList2))
         #
         return successList, emptyList, emptyList, diagList
 
-    def __updateObjectStore(self, databaseName, collectionName, objDL):
+    def __updateObjectStore(self, uQ, databaseName, collectionName, objDL, tag=None):
         updateDL = []
         for objD in objDL:
             try:
@@ -110,9 +124,7 @@ class PubChemDataUpdateWorker(object):
                 updateDL.append({"selectD": selectD, "updateD": objD})
             except Exception as e:
                 logger.exception("Failing with %s", str(e))
-        obUpd = ObjectUpdater(self.__cfgOb)
-        numUpd = obUpd.update(databaseName, collectionName, updateDL)
-        logger.info("Updated reference count is %d", numUpd)
+        uQ.put(databaseName, collectionName, updateDL, tag=tag)
 
     def __createCollections(self, databaseName, collectionName, indexAttributeNames=None):
         obUpd = ObjectUpdater(self.__cfgOb)
@@ -404,7 +416,7 @@ class PubChemDataCacheProvider(object):
             obUpd = ObjectUpdater(self.__cfgOb)
             ok = obUpd.createCollection(databaseName, collectionName, indexAttributeNames=indexAttributeNames, checkExists=True, bsonSchema=None)
             if ok:
-                numUpd = obUpd.update(databaseName, collectionName, updateDL)
+                numUpd = obUpd.update(databaseName, collectionName, updateDL, bulk=True)
                 logger.debug("Updated object count is %d", numUpd)
             else:
                 logger.error("Create %s %s failed", databaseName, collectionName)
@@ -7,6 +7,11 @@
 # Updates:
 #  9-May-2020 jdw separate cache behavior with separate option rebuildChemIndices=True/False
 # 16-Jul-2020 jdw separate index and reference data management.
+# 16-Oct-2026 jdw save chunks using bulk upserts ObjectUpdater.update(..., bulk=True)
+# 16-Oct-2026 jdw write only changed content when saving refreshed chunks (changeOnly=True)
+# 16-Oct-2026 jdw reuse a pooled connection for worker chunk saves (usePool=True)
+# 16-Oct-2026 jdw save worker chunks with a write-behind ObjectUpdaterQueue() overlapping fetch and save
+# 16-Oct-2026 jdw exclude identifiers in chunks that failed to save from the worker success list
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -20,6 +25,7 @@ import time
 
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.exdb.utils.ObjectUpdaterQueue import ObjectUpdaterQueue
 from rcsb.utils.chem.ChemCompIndexProvider import ChemCompIndexProvider
 from rcsb.utils.chem.ChemCompSearchIndexProvider import ChemCompSearchIndexProvider
 from rcsb.utils.chemref.PubChemUtils import PubChemUtils, ChemicalIdentifier
@@ -107,6 +113,9 @@ class PubChemUpdateWorker(object):
         diagList = []
         emptyList = []
         #
+        # Chunks are saved in a background thread while the next chunk is fetched
+        uQ = ObjectUpdaterQueue(self.__cfgOb, changeOnly=True)
+        chunkD = {}
         try:
             tU = TimeUtil()
             ccIdList = dataList
@@ -166,18 +175,23 @@ class PubChemUpdateWorker(object):
                     #
                     tIdxDL.append(tIdxD)
                 # --
-                startTimeL = time.time()
-                logger.info("Saving chunk %d (len=%d)", ii, len(ccIdChunk))
-                self.__updateObjectStore(self.__databaseName, self.__matchIndexCollectionName, tIdxDL)
-                endTimeL = time.time()
-                logger.info("Saved chunk %d (len=%d) in %.3f secs", ii, len(ccIdChunk), endTimeL - startTimeL)
+                logger.info("Queueing chunk %d (len=%d)", ii, len(ccIdChunk))
+                chunkD[ii] = ccIdChunk
+                self.__updateObjectStore(uQ, self.__databaseName, self.__matchIndexCollectionName, tIdxDL, tag=ii)
         except Exception as e:
             logger.exception("Failing %s for %d data items %s", procName, len(dataList), str(e))
+        finally:
+            # Save any pending chunks before returning
+            uQ.close()
+        failIdS = set([tId for ii in uQ.getFailedTags() for tId in chunkD.get(ii, [])])
+        if failIdS:
+            logger.error("%s failing to save %d identifiers", procName, len(failIdS))
+            successList = [ccId for ccId in successList if ccId not in failIdS]
         logger.info("%s dataList length %d success length %d rst1 %d rst2 %d", procName, len(dataList), len(successList), len(retList1), len(retList2))
         #
         return successList, emptyList, emptyList, diagList
 
-    def __updateObjectStore(self, databaseName, collectionName, objDL):
+    def __updateObjectStore(self, uQ, databaseName, collectionName, objDL, tag=None):
         updateDL = []
         for objD in objDL:
             try:
@@ -185,9 +199,7 @@ class PubChemUpdateWorker(object):
                 updateDL.append({"selectD": selectD, "updateD": objD})
             except Exception as e:
                 logger.exception("Failing with %s", str(e))
-        obUpd = ObjectUpdater(self.__cfgOb)
-        numUpd = obUpd.update(databaseName, collectionName, updateDL)
-        logger.info("Updated reference count is %d", numUpd)
+        uQ.put(databaseName, collectionName, updateDL, tag=tag)
 
     def __createCollections(self, databaseName, collectionName, indexAttributeNames=None):
         obUpd = ObjectUpdater(self.__cfgOb)
@@ -598,7 +610,7 @@ class PubChemIndexCacheProvider(object):
             obUpd = ObjectUpdater(self.__cfgOb)
             ok = obUpd.createCollection(databaseName, collectionName, indexAttributeNames=indexAttributeNames, checkExists=True, bsonSchema=None)
             if ok:
-                numUpd = obUpd.update(databaseName, collectionName, updateDL)
+                numUpd = obUpd.update(databaseName, collectionName, updateDL, bulk=True)
                 logger.debug("Updated object count is %d", numUpd)
             else:
                 logger.error("Create %s %s failed", databaseName, collectionName)
@@ -5,7 +5,9 @@
 # Selected utilities to extract citation data from the core_entry exchange database schema.
 #
 # Updates:
-#
+# 16-Oct-2026  jdw add random-access indexed cache format (cacheKwargs={"fmt": "indexed"})
+# 16-Oct-2026  jdw build journal indices on demand (getJournalIndex()), store these with indexed caches, add close()
+# 16-Oct-2026  jdw stream extracted citations (ObjectExtractor.iterObjects()) directly into indexed caches
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -17,6 +19,7 @@ __license__ = "Apache 2.0"
 import logging
 import os
 
+from rcsb.exdb.utils.IndexedObjectStore import IndexedObjectStore
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.utils.io.MarshalUtil import MarshalUtil
 
@@ -26,6 +29,8 @@ logger = logging.getLogger(__name__)
 class CitationExtractor(object):
     """ Utilities to extract citation related data from the core_entry collection.
 
+        Indexed caches (cacheKwargs={"fmt": "indexed"}) are memory-mapped and should be released with close()
+        (or by using the extractor as a context manager).
     """
 
     def __init__(self, cfgOb, **kwargs):
@@ -36,16 +41,35 @@ class CitationExtractor(object):
         #
         self.__mU = MarshalUtil()
         #
+        self.__idxD = None
         self.__entryD = self.__rebuildCache(**kwargs)
-        self.__idxD = self.__buildIndices(self.__entryD)
         #
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release the memory-mapped indexed cache (if any)."""
+        if isinstance(self.__entryD, IndexedObjectStore):
+            self.__entryD.close()
+            self.__entryD = {}
+
+    def getJournalIndex(self):
+        """Return the dictionary of primary citation counts for each journal name (built on first use)."""
+        if self.__idxD is None:
+            self.__idxD = self.__buildIndices(self.__entryD)
+        return self.__idxD
+
     def __rebuildCache(self, **kwargs):
         useCache = kwargs.get("useCache", True)
         dirPath = kwargs.get("exdbDirPath", ".")
         cacheKwargs = kwargs.get("cacheKwargs", {"fmt": "pickle"})
         #
-        ext = "pic" if cacheKwargs["fmt"] == "pickle" else "json"
+        extD = {"pickle": "pic", "indexed": "idx"}
+        ext = extD[cacheKwargs["fmt"]] if cacheKwargs["fmt"] in extD else "json"
         fn = "entry-citation-extracted-data-cache" + "." + ext
         cacheFilePath = os.path.join(dirPath, fn)
 
@@ -53,9 +77,23 @@ class CitationExtractor(object):
         try:
             if useCache and cacheFilePath and os.access(cacheFilePath, os.R_OK):
                 logger.info("Using cached entry citation file %s", cacheFilePath)
-                cD = self.__mU.doImport(cacheFilePath, **cacheKwargs)
+                if cacheKwargs["fmt"] == "indexed":
+                    oS = IndexedObjectStore(cacheFilePath)
+                    self.__idxD = oS.getAttributes().get("journalIndex", None)
+                    cD = {"entryD": oS}
+                else:
+                    cD = self.__mU.doImport(cacheFilePath, **cacheKwargs)
+            elif cacheKwargs["fmt"] == "indexed":
+                # Citations are streamed to the indexed cache and only the primary citations are retained for the indices
+                ok = self.__mU.mkdir(dirPath)
+                attributeD = {}
+                ok = IndexedObjectStore.write(cacheFilePath, self.__iterIndexedCitations(attributeD), attributeD=attributeD, compress=cacheKwargs.get("compress", True))
+                oS = IndexedObjectStore(cacheFilePath) if ok else {}
+                self.__idxD = attributeD.get("journalIndex", None)
+                cD["entryD"] = oS
+                logger.info("Saved entry citation results (%d) status %r in %s", len(oS), ok, cacheFilePath)
             else:
-                entryD = self.__extractCitations()
+                entryD = {entryId: eD for entryId, eD in self.__iterCitations()}
                 cD["entryD"] = entryD
                 if cacheFilePath:
                     ok = self.__mU.mkdir(dirPath)
@@ -165,11 +203,19 @@ class CitationExtractor(object):
     def getEntryCount(self):
         return len(self.__entryD)
 
-    def __extractCitations(self):
-        """ Test case - extract unique entity source and host taxonomies
+    def __iterIndexedCitations(self, attributeD):
+        """Iterate over extracted citations and store the journal indices in attributeD when the iteration completes."""
+        primaryD = {}
+        for entryId, eD in self.__iterCitations():
+            primaryD[entryId] = {"citation": eD["citation"][:1]} if "citation" in eD else {}
+            yield entryId, eD
+        attributeD["journalIndex"] = self.__buildIndices(primaryD)
+
+    def __iterCitations(self):
+        """ Iterate over (entryId, entry citation data) pairs streamed from the core_entry collection
         """
         try:
-            obEx = ObjectExtractor(
+            with ObjectExtractor(
                 self.__cfgOb,
                 databaseName=self.__databaseName,
                 collectionName=self.__collectionName,
@@ -181,13 +227,11 @@ class CitationExtractor(object):
                 objectLimit=None,
                 selectionQuery={},
                 selectionList=["rcsb_id", "citation"],
-            )
-            eCount = obEx.getCount()
-            logger.info("Entry count is %d", eCount)
-            objD = obEx.getObjects()
-            # for ky, eD in objD.items():
-            #    logger.info("%s: %r", ky, eD)
-            return objD
+            ) as obEx:
+                eCount = 0
+                for entryId, eD in obEx.iterObjects():
+                    eCount += 1
+                    yield entryId, eD
+                logger.info("Entry count is %d", eCount)
         except Exception as e:
             logger.exception("Failing with %s", str(e))
-        return {}
@@ -7,6 +7,10 @@
 #  Updates:
 #   4-Sep-2019 jdw add Tree and Drugbank loaders
 #  14-Feb-2020 jdw change over to ReferenceSequenceAnnotationProvider/Adapter
+#  16-Oct-2026 jdw pass num_proc to the reference sequence update transform
+#  16-Oct-2026 jdw checkpoint the reference sequence update transform and add --resume option
+#  16-Oct-2026 jdw use a separate --transform_num_proc option (default 1) for the reference sequence update transform
+#  16-Oct-2026 jdw add --no_checkpoint option for the reference sequence update transform
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -59,7 +63,7 @@ def buildResourceCache(cfgOb, configName, cachePath, rebuildCache=False):
     return ret
 
 
-def doReferenceSequenceUpdate(cfgOb, cachePath, useCache, fetchLimit=None, refChunkSize=100):
+def doReferenceSequenceUpdate(cfgOb, cachePath, useCache, fetchLimit=None, refChunkSize=100, transformNumProc=1, checkpoint=True, resume=False):
     try:
         databaseName = "pdbx_core"
         collectionName = "pdbx_core_polymer_entity"
@@ -74,7 +78,15 @@ def doReferenceSequenceUpdate(cfgOb, cachePath, useCache, fetchLimit=None, refCh
         logger.info("Cached reference data count is %d", rsaP.getRefDataCount())
         rsa = ReferenceSequenceAnnotationAdapter(rsaP)
         obTr = ObjectTransformer(cfgOb, objectAdapter=rsa)
-        ok = obTr.doTransform(databaseName=databaseName, collectionName=collectionName, fetchLimit=fetchLimit, selectionQuery={"entity_poly.rcsb_entity_polymer_type": polymerType})
+        ok = obTr.doTransform(
+            databaseName=databaseName,
+            collectionName=collectionName,
+            fetchLimit=fetchLimit,
+            selectionQuery={"entity_poly.rcsb_entity_polymer_type": polymerType},
+            numProc=transformNumProc,
+            checkpoint=checkpoint,
+            resume=resume,
+        )
         return ok
     except Exception as e:
         logger.exception("Failing with %s", str(e))
@@ -90,12 +102,15 @@ def main():
     parser.add_argument("--etl_uniprot", default=False, action="store_true", help="ETL UniProt reference data")
     parser.add_argument("--etl_tree_node_lists", default=False, action="store_true", help="ETL tree node lists")
     parser.add_argument("--upd_ref_seq", default=False, action="store_true", help="Update reference sequence assignments")
+    parser.add_argument("--resume", default=False, action="store_true", help="Resume an interrupted reference sequence update for the current update cycle")
+    parser.add_argument("--no_checkpoint", default=False, action="store_true", help="Do not record checkpoints for the reference sequence update")
     #
     parser.add_argument("--config_path", default=None, help="Path to configuration options file")
     parser.add_argument("--config_name", default=defaultConfigName, help="Configuration section name")
     parser.add_argument("--db_type", default="mongo", help="Database server type (default=mongo)")
     parser.add_argument("--read_back_check", default=False, action="store_true", help="Perform read back check on all documents")
     parser.add_argument("--num_proc", default=2, help="Number of processes to execute (default=2)")
+    parser.add_argument("--transform_num_proc", default=1, help="Number of processes for the reference sequence update transform (default=1)")
     parser.add_argument("--chunk_size", default=10, help="Number of files loaded per process")
     parser.add_argument("--document_limit", default=None, help="Load document limit for testing")
     parser.add_argument("--debug", default=False, action="store_true", help="Turn on verbose logging")
@@ -138,6 +153,7 @@ def main():
         tU = TimeUtil()
         dataSetId = args.data_set_id if args.data_set_id else tU.getCurrentWeekSignature()
         numProc = int(args.num_proc)
+        transformNumProc = int(args.transform_num_proc)
         chunkSize = int(args.chunk_size)
         documentLimit = int(args.document_limit) if args.document_limit else None
         loadType = "full" if args.full else "replace"
@@ -183,7 +199,9 @@ def main():
             okS = loadStatus(crw.getLoadStatus(), cfgOb, cachePath, readBackCheck=readBackCheck)
 
         if args.upd_ref_seq:
-            ok = doReferenceSequenceUpdate(cfgOb, cachePath, useCache, fetchLimit=documentLimit, refChunkSize=100)
+            ok = doReferenceSequenceUpdate(
+                cfgOb, cachePath, useCache, fetchLimit=documentLimit, refChunkSize=100, transformNumProc=transformNumProc, checkpoint=not args.no_checkpoint, resume=args.resume
+            )
             okS = ok
         #
         logger.info("Operation completed with status %r " % ok and okS)
@@ -5,7 +5,8 @@
 # Utilities to extract GO identifiers from the core polymer entity collection.
 #
 # Updates:
-#
+# 16-Oct-2026  jdw stream the entity selection using ObjectExtractor.iterObjects()
+# 16-Oct-2026  jdw compute unique annotation identifiers on the server using ObjectExtractor.getDistinctValues()
 ##
 __docformat__ = "restructuredtext en"
 __author__ = "John Westbrook"
@@ -46,22 +47,11 @@ class AnnotationExtractor(object):
                 uniqueAttributes=["rcsb_id"],
                 cacheKwargs=None,
                 objectLimit=None,
-                # selectionQuery={"rcsb_polymer_entity_annotation.type": annotationType},
-                selectionQuery=None,
-                selectionList=["rcsb_id", "rcsb_polymer_entity_annotation.annotation_id", "rcsb_polymer_entity_annotation.type"],
+                selectionQuery={"rcsb_polymer_entity_annotation.type": annotationType},
             )
-            eCount = obEx.getCount()
-            logger.info("For type %r polymer entity annotation object count is %d", annotationType, eCount)
-            idS = set()
-            objD = obEx.getObjects()
-            for _, eD in objD.items():
-                try:
-                    for tD in eD["rcsb_polymer_entity_annotation"]:
-                        if tD["type"] == annotationType:
-                            idS.add(tD["annotation_id"])
-                except Exception:
-                    pass
-            logger.info("Unique identifiers %d", len(idS))
-            return list(idS)
+            # Unique values are computed on the server with the type filter applied to the unwound annotations
+            idL = obEx.getDistinctValues("rcsb_polymer_entity_annotation[].annotation_id", elementQuery={"rcsb_polymer_entity_annotation.type": annotationType})
+            logger.info("Unique identifiers for type %r %d", annotationType, len(idL))
+            return idL
         except Exception as e:
             logger.exception("Failing with %s", str(e))
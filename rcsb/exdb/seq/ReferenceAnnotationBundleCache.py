@@ -0,0 +1,171 @@
+##
+# File: ReferenceAnnotationBundleCache.py
+# Date: 16-Oct-2026  jdw
+#
+# Per-accession gene, annotation and EC content compiled from reference sequence entries.
+#
+# Updates:
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceAnnotationBundleCache(object):
+    """ Gene, annotation and EC content (bundles) compiled once for each reference sequence accession and held
+        in a least recently used cache of at most maxSize bundles (maxSize=None for an unbounded cache).
+
+        Bundles are compiled with the lookup functions of the calling provider.  GO, Pfam and InterPro names and
+        InterPro lineages are included only if the corresponding lookup functions are provided.
+
+        Bundles are shared by all callers and are read-only; copy any content to be modified (e.g. with copy.deepcopy()).
+
+        Example:
+            bC = ReferenceAnnotationBundleCache(refD, goP.exists, getGeneOntologyLineage, getEcId, maxSize=50000)
+            bD = bC.get("P14118")
+    """
+
+    def __init__(self, refD, goExistsFunc, goLineageFunc, ecIdFunc, goNameFunc=None, pfamNameFunc=None, interProNameFunc=None, interProLineageFunc=None, maxSize=None):
+        """
+        Args:
+            refD (dict): reference sequence entries {<accession>: {"version": ..., "gene": [...], "dbReferences": [...], ...}, ...}
+            goExistsFunc (func): returns True for a current GO identifier
+            goLineageFunc (func): returns the GO lineage [{"id": ..., "name": ...}, ...] for a list of GO identifiers
+            ecIdFunc (func): returns the normalized EC identifier or None if the identifier is not current
+            goNameFunc (func, optional): returns the GO term name. Defaults to None.
+            pfamNameFunc (func, optional): returns the Pfam description. Defaults to None.
+            interProNameFunc (func, optional): returns the InterPro name. Defaults to None.
+            interProLineageFunc (func, optional): returns the InterPro lineage. Defaults to None.
+            maxSize (int, optional): maximum number of cached bundles. Defaults to None (unbounded).
+        """
+        self.__refD = refD
+        self.__goExistsFunc = goExistsFunc
+        self.__goLineageFunc = goLineageFunc
+        self.__ecIdFunc = ecIdFunc
+        self.__goNameFunc = goNameFunc
+        self.__pfamNameFunc = pfamNameFunc
+        self.__interProNameFunc = interProNameFunc
+        self.__interProLineageFunc = interProLineageFunc
+        self.__maxSize = max(1, int(maxSize)) if maxSize is not None else None
+        self.__bundleD = OrderedDict()
+
+    def get(self, unpId):
+        """Return the annotation bundle for the input reference sequence accession.
+
+        Args:
+            unpId (str): UniProt accession
+
+        Returns:
+            dict: {"version": <entry version>,
+                   "gene": [{"provenance_source": "UniProt", "value": <gene name>, "taxonomy_id": <int>}, ...],
+                   "annotation": [{"provenance_source": "UniProt", "annotation_id": ..., "type": <GO|Pfam|InterPro>, ...}, ...],
+                   "ec": [<normalized EC identifier>, ...]}
+                  or None if there is no reference data for the accession.
+        """
+        bD = self.__bundleD.get(unpId)
+        if bD is not None:
+            if self.__maxSize:
+                self.__bundleD.move_to_end(unpId)
+            return bD
+        uD = self.__refD[unpId] if unpId in self.__refD else None
+        if not uD:
+            return None
+        bD = self.build(unpId, uD)
+        self.set(unpId, bD)
+        return bD
+
+    def set(self, unpId, bD):
+        """Store the input bundle for the input accession."""
+        self.__bundleD[unpId] = bD
+        if self.__maxSize:
+            self.__bundleD.move_to_end(unpId)
+            while len(self.__bundleD) > self.__maxSize:
+                self.__bundleD.popitem(last=False)
+
+    def getBundles(self):
+        """Return the dictionary of cached bundles {<accession>: bundle, ...}."""
+        return self.__bundleD
+
+    def __len__(self):
+        return len(self.__bundleD)
+
+    def __contains__(self, unpId):
+        return unpId in self.__bundleD
+
+    def build(self, unpId, uD):
+        """Compile the annotation bundle for the input reference sequence entry (see get())."""
+        geneL = []
+        annL = []
+        ecL = []
+        version = uD.get("version")
+        if "gene" in uD and "taxonomy_id" in uD:
+            taxId = int(uD["taxonomy_id"])
+            geneS = set()
+            for tD in uD["gene"]:
+                if tD["name"] in geneS:
+                    continue
+                geneS.add(tD["name"])
+                geneL.append({"provenance_source": "UniProt", "value": tD["name"], "taxonomy_id": taxId})
+        #
+        resourceS = set()
+        for tD in uD.get("dbReferences", []):
+            if "resource" not in tD or "id_code" not in tD:
+                continue
+            resource = tD["resource"]
+            idCode = tD["id_code"]
+            if resource == "EC":
+                tEc = self.__ecIdFunc(idCode)
+                if tEc and tEc not in ecL:
+                    ecL.append(tEc)
+                continue
+            if resource not in ["GO", "Pfam", "InterPro"]:
+                continue
+            if (resource, idCode) in resourceS:
+                logger.debug("%s skipping duplicate annotation %r %r", unpId, resource, idCode)
+                continue
+            resourceS.add((resource, idCode))
+            if resource == "GO":
+                aD = self.__getGoAnnotation(idCode, version)
+            elif resource == "Pfam":
+                pfamName = self.__pfamNameFunc(idCode) if self.__pfamNameFunc else None
+                aD = {"provenance_source": "UniProt", "annotation_id": idCode, "name": pfamName} if pfamName else {"provenance_source": "UniProt", "annotation_id": idCode}
+                aD.update({"type": resource, "assignment_version": version})
+            else:
+                aD = self.__getInterProAnnotation(idCode, version)
+            if aD:
+                annL.append(aD)
+        return {"version": version, "gene": geneL, "annotation": annL, "ec": ecL}
+
+    def __getGoAnnotation(self, idCode, version):
+        if not self.__goExistsFunc(idCode):
+            return None
+        goLin = self.__goLineageFunc([idCode])
+        goName = self.__goNameFunc(idCode) if self.__goNameFunc else None
+        if not goLin or (self.__goNameFunc and not goName):
+            return None
+        aD = {"provenance_source": "UniProt", "annotation_id": idCode, "type": "GO"}
+        if goName:
+            aD["name"] = goName
+        aD.update({"assignment_version": version, "annotation_lineage": goLin})
+        return aD
+
+    def __getInterProAnnotation(self, idCode, version):
+        interProName = self.__interProNameFunc(idCode) if self.__interProNameFunc else None
+        interProLinL = self.__interProLineageFunc(idCode) if self.__interProLineageFunc else None
+        if interProName and interProLinL:
+            return {
+                "provenance_source": "UniProt",
+                "annotation_id": idCode,
+                "name": interProName,
+                "type": "InterPro",
+                "assignment_version": version,
+                "annotation_lineage": interProLinL,
+            }
+        return {"provenance_source": "UniProt", "annotation_id": idCode, "type": "InterPro", "assignment_version": version}
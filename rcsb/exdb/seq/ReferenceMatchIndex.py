@@ -0,0 +1,303 @@
+##
+# File: ReferenceMatchIndex.py
+# Date: 16-Oct-2026  jdw
+#
+# Compact read-only index of reference sequence accession match results.
+#
+# Updates:
+# 16-Oct-2026  jdw build and write the index from either a match dictionary or an iterable of (accession, match) pairs
+# 16-Oct-2026  jdw add lookupMatch() for match dictionaries or indices
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import mmap
+import os
+import struct
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceMatchIndex(Mapping):
+    """ Compact read-only index of reference sequence accession match results (e.g. matchD from ReferenceSequenceCacheProvider()).
+
+        Each distinct accession (searched or matched) is stored once in a sorted string table.  Match status values
+        are stored as integer codes and the matched accessions and taxonomy identifiers as flat integer arrays.
+
+        File layout (all sections 8-byte aligned):
+
+            MAGIC | header length (8 bytes) | JSON header | string offsets (uint32, N+1) | string bytes |
+            status codes (uint8, N) | match offsets (uint32, N+1) | matched string indices (uint32, M) | taxIds (int32, M)
+
+        Index files are memory-mapped, so the content is shared (not copied) by forked worker processes.
+        Dictionary-style access returns {"matched": <status>, "matchedIds": {<accession>: {"taxId": <int>}, ...}}.
+
+        Example:
+            ReferenceMatchIndex.write(filePath, matchD)
+            mI = ReferenceMatchIndex(filePath)
+            status, matchL = mI.getMatch("P14118")
+    """
+
+    MAGIC = b"RCSBRMI1"
+
+    def __init__(self, filePath=None, buffer=None):
+        """
+        Args:
+            filePath (str, optional): index file path. Defaults to None.
+            buffer (bytes, optional): serialized index content (used if filePath is not provided). Defaults to None.
+        """
+        self.__filePath = filePath
+        self.__fh = None
+        self.__mm = None
+        self.__buffer = buffer
+        self.__viewL = []
+        self.__open()
+
+    @classmethod
+    def build(cls, matchD, filePath=None):
+        """Return an index for the input match dictionary, saved to and memory-mapped from filePath if provided.
+
+        Args:
+            matchD (dict or iterable): {<accession>: {"matched": <status>, "matchedIds": {<accession>: {"taxId": <int>}, ...}}, ...}
+                                       or an iterable of (<accession>, {"matched": ..., "matchedIds": ...}) pairs
+            filePath (str, optional): index file path. Defaults to None.
+
+        Returns:
+            (obj): ReferenceMatchIndex() instance
+        """
+        if filePath:
+            if not cls.write(filePath, matchD):
+                raise IOError("Failing to write match index %s" % filePath)
+            return cls(filePath=filePath)
+        return cls(buffer=cls.__serialize(matchD))
+
+    @classmethod
+    def write(cls, filePath, matchD):
+        """Write the index for the input match dictionary.
+
+        Args:
+            filePath (str): index file path
+            matchD (dict or iterable): {<accession>: {"matched": <status>, "matchedIds": {<accession>: {"taxId": <int>}, ...}}, ...}
+                                       or an iterable of (<accession>, {"matched": ..., "matchedIds": ...}) pairs
+
+        Returns:
+            bool: True for success or False otherwise
+        """
+        tmpPath = filePath + ".tmp"
+        try:
+            bV = cls.__serialize(matchD)
+            with open(tmpPath, "wb") as ofh:
+                ofh.write(bV)
+            os.replace(tmpPath, filePath)
+            return True
+        except Exception as e:
+            logger.exception("Failing for %s with %s", filePath, str(e))
+            if os.access(tmpPath, os.W_OK):
+                os.remove(tmpPath)
+        return False
+
+    @classmethod
+    def __serialize(cls, matchD):
+        entryL = []
+        strS = set()
+        statusL = []
+        for rId, mD in matchD.items() if isinstance(matchD, Mapping) else matchD:
+            mD = mD if mD else {}
+            mIdD = mD.get("matchedIds") or {}
+            status = mD.get("matched")
+            if status not in statusL:
+                statusL.append(status)
+            strS.add(rId)
+            strS.update(mIdD.keys())
+            entryL.append((rId, status, [(mId, tD.get("taxId") if isinstance(tD, dict) else None) for mId, tD in mIdD.items()]))
+        if len(statusL) > 254:
+            raise ValueError("Too many distinct match status values %d" % len(statusL))
+        #
+        strL = sorted(strS)
+        idxD = {tS: ii for ii, tS in enumerate(strL)}
+        numStr = len(strL)
+        entryD = {idxD[rId]: (status, matchL) for rId, status, matchL in entryL}
+        #
+        strOffsets = array("I", [0])
+        strBytes = bytearray()
+        for tS in strL:
+            strBytes.extend(tS.encode("utf-8"))
+            strOffsets.append(len(strBytes))
+        statusCodes = bytearray(numStr)
+        matchOffsets = array("I", [0])
+        matchIds = array("I")
+        taxIds = array("i")
+        for ii in range(numStr):
+            if ii in entryD:
+                status, matchL = entryD[ii]
+                statusCodes[ii] = statusL.index(status) + 1
+                for mId, taxId in matchL:
+                    matchIds.append(idxD[mId])
+                    taxIds.append(int(taxId) if taxId is not None else -1)
+            matchOffsets.append(len(matchIds))
+        #
+        sectionL = [strOffsets.tobytes(), bytes(strBytes), bytes(statusCodes), matchOffsets.tobytes(), matchIds.tobytes(), taxIds.tobytes()]
+        hD = {"statusList": statusL, "numStrings": numStr, "numEntries": len(entryD), "numMatches": len(matchIds), "sections": []}
+        # Section offsets are relative to the end of the header
+        offset = 0
+        for bV in sectionL:
+            hD["sections"].append([offset, len(bV)])
+            offset += cls.__pad(len(bV))
+        hV = json.dumps(hD).encode("utf-8")
+        hV += b" " * (cls.__pad(len(cls.MAGIC) + 8 + len(hV)) - (len(cls.MAGIC) + 8 + len(hV)))
+        #
+        oV = bytearray(cls.MAGIC)
+        oV.extend(struct.pack("<Q", len(hV)))
+        oV.extend(hV)
+        for bV in sectionL:
+            oV.extend(bV)
+            oV.extend(b"\0" * (cls.__pad(len(bV)) - len(bV)))
+        return bytes(oV)
+
+    @staticmethod
+    def __pad(num):
+        return (num + 7) // 8 * 8
+
+    def __open(self):
+        hLen = len(self.MAGIC)
+        if self.__filePath:
+            self.__fh = open(self.__filePath, "rb")
+            self.__mm = mmap.mmap(self.__fh.fileno(), 0, access=mmap.ACCESS_READ)
+            buf = self.__mm
+        else:
+            buf = self.__buffer
+        if buf[:hLen] != self.MAGIC:
+            self.close()
+            raise ValueError("Unrecognized match index format %r" % self.__filePath)
+        (hdrLen,) = struct.unpack("<Q", buf[hLen : hLen + 8])
+        hD = json.loads(bytes(buf[hLen + 8 : hLen + 8 + hdrLen]).decode("utf-8"))
+        self.__statusL = hD["statusList"]
+        self.__numStr = hD["numStrings"]
+        self.__numEntries = hD["numEntries"]
+        start = hLen + 8 + hdrLen
+        mv = memoryview(buf)
+        self.__viewL = [mv]
+        fmtL = ["I", None, None, "I", "I", "i"]
+        vL = []
+        for (offset, length), fmt in zip(hD["sections"], fmtL):
+            tV = mv[start + offset : start + offset + length]
+            self.__viewL.append(tV)
+            vL.append(tV.cast(fmt) if fmt else tV)
+        self.__viewL.extend(vL)
+        self.__strOffsets, self.__strBytes, self.__statusCodes, self.__matchOffsets, self.__matchIds, self.__taxIds = vL
+
+    def __getString(self, idx):
+        return bytes(self.__strBytes[self.__strOffsets[idx] : self.__strOffsets[idx + 1]])
+
+    def __find(self, rId):
+        try:
+            bKey = rId.encode("utf-8")
+        except Exception:
+            return -1
+        lo = 0
+        hi = self.__numStr
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__getString(mid) < bKey:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.__numStr and self.__getString(lo) == bKey:
+            return lo
+        return -1
+
+    def getMatchStatus(self, rId):
+        """Return the match status (e.g. primary or secondary) for the input accession or None if the accession is not indexed."""
+        idx = self.__find(rId)
+        if idx < 0 or not self.__statusCodes[idx]:
+            return None
+        return self.__statusL[self.__statusCodes[idx] - 1]
+
+    def getMatch(self, rId):
+        """Return the match status and matched accessions for the input accession.
+
+        Args:
+            rId (str): searched accession
+
+        Returns:
+            (str, list): match status (None if the accession is not indexed), [(matched accession, taxId or None), ...]
+        """
+        idx = self.__find(rId)
+        if idx < 0 or not self.__statusCodes[idx]:
+            return None, []
+        matchL = []
+        for jj in range(self.__matchOffsets[idx], self.__matchOffsets[idx + 1]):
+            taxId = self.__taxIds[jj]
+            matchL.append((self.__getString(self.__matchIds[jj]).decode("utf-8"), taxId if taxId >= 0 else None))
+        return self.__statusL[self.__statusCodes[idx] - 1], matchL
+
+    @staticmethod
+    def lookupMatch(matchD, rId):
+        """Return the match status and matched accessions for the input accession from either a match index or
+        a match dictionary (e.g. {<accession>: {"matched": <status>, "matchedIds": {<accession>: {"taxId": <int>}, ...}}, ...}).
+
+        Args:
+            matchD (obj): ReferenceMatchIndex() or dictionary-like match data
+            rId (str): searched accession
+
+        Returns:
+            (str, list): match status (None if there is no match data for the accession), [(matched accession, taxId), ...]
+        """
+        if isinstance(matchD, ReferenceMatchIndex):
+            # -- avoid decoding a match dictionary for each lookup
+            return matchD.getMatch(rId)
+        if rId not in matchD:
+            return None, []
+        mD = matchD[rId]
+        return mD["matched"], [(mId, tD["taxId"]) for mId, tD in mD["matchedIds"].items()] if "matchedIds" in mD else []
+
+    def getStatusCounts(self):
+        """Return the number of indexed accessions for each match status."""
+        countD = defaultdict(int)
+        for code in self.__statusCodes:
+            if code:
+                countD[self.__statusL[code - 1]] += 1
+        return dict(countD)
+
+    def __getitem__(self, rId):
+        status, matchL = self.getMatch(rId)
+        if status is None and not self.__contains__(rId):
+            raise KeyError(rId)
+        return {"matched": status, "matchedIds": {mId: {"taxId": taxId} for mId, taxId in matchL}}
+
+    def __contains__(self, rId):
+        idx = self.__find(rId)
+        return idx >= 0 and self.__statusCodes[idx] > 0
+
+    def __iter__(self):
+        for idx in range(self.__numStr):
+            if self.__statusCodes[idx]:
+                yield self.__getString(idx).decode("utf-8")
+
+    def __len__(self):
+        return self.__numEntries
+
+    def __getstate__(self):
+        return {"filePath": self.__filePath, "buffer": None if self.__filePath else self.__buffer}
+
+    def __setstate__(self, state):
+        self.__init__(filePath=state["filePath"], buffer=state["buffer"])
+
+    def close(self):
+        for tV in reversed(self.__viewL):
+            tV.release()
+        self.__viewL = []
+        if self.__mm is not None:
+            self.__mm.close()
+            self.__mm = None
+        if self.__fh is not None:
+            self.__fh.close()
+            self.__fh = None
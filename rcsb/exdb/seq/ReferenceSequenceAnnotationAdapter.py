@@ -6,6 +6,11 @@
 # in the core_entity collection.
 #
 # Updates:
+# 16-Oct-2026  jdw use memoized EC lookups from ReferenceSequenceAnnotationProvider
+# 16-Oct-2026  jdw merge precomputed per-accession annotation bundles
+# 16-Oct-2026  jdw run accession and alignment re-mapping against either match dictionaries or a compact ReferenceMatchIndex()
+# 16-Oct-2026  jdw look up accession matches with the provider getMatch() accessor
+# 16-Oct-2026  jdw copy shared bundle gene and annotation content into each entity document
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -33,8 +38,6 @@ class ReferenceSequenceAnnotationAdapter(ObjectAdapterBase):
         #
         self.__rsaP = referenceSequenceAnnotationProvider
         self.__ssP = self.__rsaP.getSiftsSummaryProvider()
-        self.__ecP = self.__rsaP.getEcProvider()
-        self.__refD = self.__rsaP.getRefData()
         self.__matchD = self.__rsaP.getMatchInfo()
         #
 
@@ -93,81 +96,30 @@ class ReferenceSequenceAnnotationAdapter(ObjectAdapterBase):
             #
             unpGeneDL = []
             unpAnnDL = []
+            unpEcL = []
             geneLookupD = {}
             geneFilterD = defaultdict(int)
             resourceFilterD = defaultdict(int)
             for unpId in unpIdS:
-                uD = self.__refD[unpId] if unpId in self.__refD else None
-                if not uD:
+                bD = self.__rsaP.getAnnotationBundle(unpId)
+                if not bD:
                     logger.info("%s no reference data for unexpected UniProt accession %r", entityKey, unpId)
                     continue
-                if "gene" in uD and "taxonomy_id" in uD:
-                    taxId = int(uD["taxonomy_id"])
-                    logger.debug("%s : %r gene names %r", entityKey, unpId, uD["gene"])
-                    for tD in uD["gene"]:
-                        geneFilterD[tD["name"]] += 1
-                        if geneFilterD[tD["name"]] > 1:
-                            continue
-                        geneLookupD[tD["name"].upper()] = tD["name"]
-                        unpGeneDL.append({"provenance_source": "UniProt", "value": tD["name"], "taxonomy_id": taxId})
-                if "dbReferences" in uD:
-                    logger.debug("%s : %r references %d", entityKey, unpId, len(uD["dbReferences"]))
-                    for tD in uD["dbReferences"]:
-                        if "resource" in tD and "id_code" in tD and tD["resource"] in ["GO", "Pfam", "InterPro"]:
-                            resourceFilterD[(tD["resource"], tD["id_code"])] += 1
-                            if resourceFilterD[(tD["resource"], tD["id_code"])] > 1:
-                                logger.debug("Skipping duplicate annotation %r %r", tD["resource"], tD["id_code"])
-                                continue
-                            if tD["resource"] in ["GO"]:
-                                if self.__rsaP.goIdExists(tD["id_code"]):
-                                    goLin = self.__rsaP.getGeneOntologyLineage([tD["id_code"]])
-                                    goName = self.__rsaP.getGeneOntologyName(tD["id_code"])
-                                    if goLin and goName:
-                                        unpAnnDL.append(
-                                            {
-                                                "provenance_source": "UniProt",
-                                                "annotation_id": tD["id_code"],
-                                                "type": tD["resource"],
-                                                "name": goName,
-                                                "assignment_version": uD["version"],
-                                                "annotation_lineage": goLin,
-                                            }
-                                        )
-                            elif tD["resource"] in ["Pfam"]:
-                                pfamName = self.__rsaP.getPfamName(tD["id_code"])
-                                if pfamName:
-                                    unpAnnDL.append(
-                                        {
-                                            "provenance_source": "UniProt",
-                                            "annotation_id": tD["id_code"],
-                                            "name": pfamName,
-                                            "type": tD["resource"],
-                                            "assignment_version": uD["version"],
-                                        }
-                                    )
-                                else:
-                                    unpAnnDL.append({"provenance_source": "UniProt", "annotation_id": tD["id_code"], "type": tD["resource"], "assignment_version": uD["version"]})
-
-                            elif tD["resource"] in ["InterPro"]:
-                                interProName = self.__rsaP.getInterProName(tD["id_code"])
-                                interProLinL = self.__rsaP.getInterProLineage(tD["id_code"])
-                                if interProName and interProLinL:
-                                    unpAnnDL.append(
-                                        {
-                                            "provenance_source": "UniProt",
-                                            "annotation_id": tD["id_code"],
-                                            "name": interProName,
-                                            "type": tD["resource"],
-                                            "assignment_version": uD["version"],
-                                            "annotation_lineage": interProLinL,
-                                        }
-                                    )
-                                else:
-                                    unpAnnDL.append({"provenance_source": "UniProt", "annotation_id": tD["id_code"], "type": tD["resource"], "assignment_version": uD["version"]})
-
-                            else:
-                                unpAnnDL.append({"provenance_source": "UniProt", "annotation_id": tD["id_code"], "type": tD["resource"], "assignment_version": uD["version"]})
-
+                logger.debug("%s : %r genes %d annotations %d", entityKey, unpId, len(bD["gene"]), len(bD["annotation"]))
+                for gD in bD["gene"]:
+                    geneFilterD[gD["value"]] += 1
+                    if geneFilterD[gD["value"]] > 1:
+                        continue
+                    geneLookupD[gD["value"].upper()] = gD["value"]
+                    # Bundle content is shared across entities (read-only)
+                    unpGeneDL.append(dict(gD))
+                for aD in bD["annotation"]:
+                    resourceFilterD[(aD["type"], aD["annotation_id"])] += 1
+                    if resourceFilterD[(aD["type"], aD["annotation_id"])] > 1:
+                        logger.debug("Skipping duplicate annotation %r %r", aD["type"], aD["annotation_id"])
+                        continue
+                    unpAnnDL.append(copy.deepcopy(aD))
+                unpEcL.extend(bD["ec"])
             #
             # raD {'resource_identifier': 'PF00503', 'provenance_source': 'SIFTS', 'resource_name': 'Pfam'}
             # "provenance_source":  <"PDB"|"RCSB"|"SIFTS"|"UniProt"> "GO", "InterPro", "Pfam"
@@ -230,20 +182,7 @@ class ReferenceSequenceAnnotationAdapter(ObjectAdapterBase):
                         enzD = {tD["ec"]: tD["provenance_source"] for tD in peObj["rcsb_enzyme_class_combined"]}
                         logger.debug("%s PDB EC assignment mapped %r", entityKey, enzD)
                     #
-                    unpEcD = {}
-                    for unpId in unpIdS:
-                        uD = self.__refD[unpId] if unpId in self.__refD else None
-                        if not uD:
-                            logger.info("%s no data for unexpected UniProt accession %r", entityKey, unpId)
-                            continue
-                        if "dbReferences" in uD:
-                            logger.debug("%s : %r references %d", entityKey, unpId, len(uD["dbReferences"]))
-                            for tD in uD["dbReferences"]:
-                                if "resource" in tD and "id_code" in tD and tD["resource"] in ["EC"]:
-                                    logger.debug("%s UniProt accession %r EC %r", entityKey, unpId, tD)
-                                    tEc = self.__ecP.normalize(tD["id_code"])
-                                    if self.__ecP.exists(tEc):
-                                        unpEcD[tEc] = "UniProt"
+                    unpEcD = {tEc: "UniProt" for tEc in unpEcL}
                     # integrate the UniProt data and update the object -
                     if unpEcD:
                         logger.debug("%s UniProt EC assignment %r", entityKey, unpEcD)
@@ -252,7 +191,7 @@ class ReferenceSequenceAnnotationAdapter(ObjectAdapterBase):
                                 continue
                             enzD[ecId] = unpEcD[ecId]
                         for ecId in enzD:
-                            tL = self.__ecP.getLineage(ecId)
+                            tL = self.__rsaP.getEcLineage(ecId)
                             if tL:
                                 linL.extend(tL)
                         peObj["rcsb_enzyme_class_combined"] = [{"ec": k, "provenance_source": v, "depth": k.count(".") + 1} for k, v in enzD.items()]
@@ -399,21 +338,22 @@ class ReferenceSequenceAnnotationAdapter(ObjectAdapterBase):
             isMatchedAltDb = False
         elif rsiD["database_name"] == referenceDatabaseName and rsiD["provenance_source"] in provSourceL:
             try:
-                if rId in self.__matchD and self.__matchD[rId]["matched"] in ["primary"]:
+                matchStatus, matchL = self.__rsaP.getMatch(rId)
+                if matchStatus in ["primary"]:
                     # no change
                     isMatchedRefDb = True
-                elif rId in self.__matchD and self.__matchD[rId]["matched"] in ["secondary"]:
-                    logger.debug("secondary %r matched len %d", self.__matchD[rId]["matched"], len(self.__matchD[rId]["matchedIds"]))
-                    if len(self.__matchD[rId]["matchedIds"]) == 1:
-                        for mId, mD in self.__matchD[rId]["matchedIds"].items():
+                elif matchStatus in ["secondary"]:
+                    logger.debug("secondary %r matched len %d", matchStatus, len(matchL))
+                    if len(matchL) == 1:
+                        for mId, _ in matchL:
                             rsiD["database_accession"] = mId
                             logger.debug("%s matched secondary %s -> %s", entityKey, rId, mId)
                             isMatchedRefDb = True
                     elif taxIdL and len(taxIdL) == 1:
                         #  -- simplest match case --
                         numM = 0
-                        for mId, mD in self.__matchD[rId]["matchedIds"].items():
-                            if taxIdL[0] == mD["taxId"]:
+                        for mId, taxId in matchL:
+                            if taxIdL[0] == taxId:
                                 rsiD["database_accession"] = mId
                                 numM += 1
                         if numM == 1:
@@ -461,19 +401,20 @@ class ReferenceSequenceAnnotationAdapter(ObjectAdapterBase):
             isMatchedAltDb = False
         elif alignD["reference_database_name"] == referenceDatabaseName and alignD["provenance_source"] in provSourceL:
             try:
-                if rId in self.__matchD and self.__matchD[rId]["matched"] in ["primary"]:
+                matchStatus, matchL = self.__rsaP.getMatch(rId)
+                if matchStatus in ["primary"]:
                     # no change
                     isMatchedRefDb = True
-                elif rId in self.__matchD and self.__matchD[rId]["matched"] in ["secondary"]:
-                    if len(self.__matchD[rId]["matchedIds"]) == 1:
-                        for mId, mD in self.__matchD[rId]["matchedIds"].items():
+                elif matchStatus in ["secondary"]:
+                    if len(matchL) == 1:
+                        for mId, _ in matchL:
                             alignD["reference_database_accession"] = mId
                             isMatchedRefDb = True
                     elif taxIdL and len(taxIdL) == 1:
                         #  -- simplest match case --
                         numM = 0
-                        for mId, mD in self.__matchD[rId]["matchedIds"].items():
-                            if taxIdL[0] == mD["taxId"]:
+                        for mId, taxId in matchL:
+                            if taxIdL[0] == taxId:
                                 alignD["reference_database_accession"] = mId
                                 numM += 1
                         if numM == 1:
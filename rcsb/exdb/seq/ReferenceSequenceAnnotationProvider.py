@@ -5,6 +5,14 @@
 # Utilities to cache content required to update referencence sequence annotations.
 #
 # Updates:
+# 16-Oct-2026  jdw add bounded memo for GO, InterPro and EC lookups with hit/miss counters and warmMemo()
+# 16-Oct-2026  jdw add precomputed per-accession annotation bundles with an optional disk cache
+# 16-Oct-2026  jdw add lazyLoad option for on-demand loading of reference sequence data
+# 16-Oct-2026  jdw add compactMatchIndex option to serve match data from a memory-mapped ReferenceMatchIndex()
+# 16-Oct-2026  jdw add fetchThreads option for concurrent reference sequence fetching
+# 16-Oct-2026  jdw build the compact match index in ReferenceSequenceCacheProvider() and add getMatch()
+# 16-Oct-2026  jdw invalidate cached annotation bundles when the GO, Pfam, InterPro or EC data files change
+# 16-Oct-2026  jdw compile bundles with the shared ReferenceAnnotationBundleCache()
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -12,10 +20,13 @@ __author__ = "John Westbrook"
 __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
+import glob
 import logging
 import os
+from collections import OrderedDict
 from collections import defaultdict
 
+from rcsb.exdb.seq.ReferenceAnnotationBundleCache import ReferenceAnnotationBundleCache
 from rcsb.exdb.seq.ReferenceSequenceCacheProvider import ReferenceSequenceCacheProvider
 from rcsb.utils.ec.EnzymeDatabaseProvider import EnzymeDatabaseProvider
 from rcsb.utils.go.GeneOntologyProvider import GeneOntologyProvider
@@ -32,28 +43,88 @@ logger = logging.getLogger(__name__)
 class ReferenceSequenceAnnotationProvider(object):
     """  Utilities to cache content required to update referencence sequence annotations.
 
+         GO, InterPro and EC lookups are memoized in bounded (least recently used) memos
+         of at most memoSize entries for each lookup type (memoSize=0 disables memoization).
+
+         The gene, annotation and EC content derived from each reference sequence entry is compiled
+         once per accession (getAnnotationBundle()).  With buildBundles=True, bundles for all reference
+         sequences are compiled on construction and saved in (and reloaded from) the exdb cache directory.
+         Saved bundles are discarded if the GO, Pfam, InterPro or EC data files have changed.
+
+         With lazyLoad=True, reference sequence and match data are loaded on demand (see ReferenceSequenceCacheProvider()).
+         With compactMatchIndex=True, match data are served from a memory-mapped ReferenceMatchIndex() file in the exdb cache
+         directory (shared by forked worker processes) built by ReferenceSequenceCacheProvider().
     """
 
-    def __init__(self, cfgOb, maxChunkSize=100, fetchLimit=None, numProc=2, expireDays=14, **kwargs):
+    def __init__(
+        self,
+        cfgOb,
+        maxChunkSize=100,
+        fetchLimit=None,
+        numProc=2,
+        expireDays=14,
+        memoSize=50000,
+        warmMemo=False,
+        buildBundles=False,
+        lazyLoad=False,
+        lazyCacheSize=20000,
+        compactMatchIndex=False,
+        fetchThreads=1,
+        **kwargs
+    ):
         self.__cfgOb = cfgOb
         self.__mU = MarshalUtil()
         #
         self.__maxChunkSize = maxChunkSize
         self.__statusList = []
         #
+        self.__memoSize = max(0, int(memoSize)) if memoSize is not None else 0
+        self.__memoD = defaultdict(OrderedDict)
+        self.__memoCountD = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self.__cachePath = kwargs.get("cachePath", ".")
+        self.__useCache = kwargs.get("useCache", True)
+        self.__cacheKwargs = kwargs.get("cacheKwargs", {"fmt": "pickle"})
+        #
         self.__pfP = self.__fetchPfamProvider(self.__cfgOb, self.__cfgOb.getDefaultSectionName(), **kwargs)
         self.__ipP = self.__fetchInterProProvider(self.__cfgOb, self.__cfgOb.getDefaultSectionName(), **kwargs)
         self.__ssP = self.__fetchSiftsSummaryProvider(self.__cfgOb, self.__cfgOb.getDefaultSectionName(), **kwargs)
         self.__goP = self.__fetchGoProvider(self.__cfgOb, self.__cfgOb.getDefaultSectionName(), **kwargs)
         self.__ecP = self.__fetchEcProvider(self.__cfgOb, self.__cfgOb.getDefaultSectionName(), **kwargs)
         self.__rsaP = ReferenceSequenceCacheProvider(
-            self.__cfgOb, siftsProvider=self.__ssP, maxChunkSize=maxChunkSize, numProc=numProc, fetchLimit=fetchLimit, expireDays=expireDays
+            self.__cfgOb,
+            siftsProvider=self.__ssP,
+            maxChunkSize=maxChunkSize,
+            numProc=numProc,
+            fetchLimit=fetchLimit,
+            expireDays=expireDays,
+            lazyLoad=lazyLoad,
+            lazyCacheSize=lazyCacheSize,
+            fetchThreads=fetchThreads,
+            compactMatchIndex=compactMatchIndex,
+            cachePath=self.__cachePath,
         )
         self.__matchD = self.__rsaP.getMatchInfo()
         self.__refD = self.__rsaP.getRefData()
         self.__missingMatchedIdCodes = self.__rsaP.getMissingMatchedIdCodes()
+        self.__bundleC = ReferenceAnnotationBundleCache(
+            self.__refD,
+            self.goIdExists,
+            self.getGeneOntologyLineage,
+            self.getEcId,
+            goNameFunc=self.getGeneOntologyName,
+            pfamNameFunc=self.getPfamName,
+            interProNameFunc=self.getInterProName,
+            interProLineageFunc=self.getInterProLineage,
+        )
+        if warmMemo:
+            self.warmMemo()
+        if buildBundles:
+            self.buildAnnotationBundles(useCache=self.__useCache)
 
     def goIdExists(self, goId):
+        return self.__memoize("go_exists", goId, self.__goIdExists, goId)
+
+    def __goIdExists(self, goId):
         try:
             return self.__goP.exists(goId)
         except Exception as e:
@@ -61,6 +132,9 @@ class ReferenceSequenceAnnotationProvider(object):
         return False
 
     def getGeneOntologyName(self, goId):
+        return self.__memoize("go_name", goId, self.__getGeneOntologyName, goId)
+
+    def __getGeneOntologyName(self, goId):
         try:
             return self.__goP.getName(goId)
         except Exception as e:
@@ -69,6 +143,10 @@ class ReferenceSequenceAnnotationProvider(object):
 
     def getGeneOntologyLineage(self, goIdL):
         # "id"     "name"
+        gL = self.__memoize("go_lineage", tuple(goIdL), self.__getGeneOntologyLineage, goIdL)
+        return [dict(gD) for gD in gL]
+
+    def __getGeneOntologyLineage(self, goIdL):
         gL = []
         try:
             gTupL = self.__goP.getUniqueDescendants(goIdL)
@@ -88,9 +166,13 @@ class ReferenceSequenceAnnotationProvider(object):
         return self.__ipP
 
     def getInterProName(self, idCode):
-        return self.__ipP.getDescription(idCode)
+        return self.__memoize("interpro_name", idCode, self.__ipP.getDescription, idCode)
 
     def getInterProLineage(self, idCode):
+        linL = self.__memoize("interpro_lineage", idCode, self.__getInterProLineage, idCode)
+        return [dict(linD) for linD in linL]
+
+    def __getInterProLineage(self, idCode):
         linL = []
         try:
             tupL = self.__ipP.getLineageWithNames(idCode)
@@ -103,12 +185,170 @@ class ReferenceSequenceAnnotationProvider(object):
     def getEcProvider(self):
         return self.__ecP
 
+    def getEcId(self, ecId):
+        """Return the normalized EC identifier if it exists in the enzyme database or None otherwise."""
+        return self.__memoize("ec_id", ecId, self.__getEcId, ecId)
+
+    def __getEcId(self, ecId):
+        tEc = self.__ecP.normalize(ecId)
+        return tEc if self.__ecP.exists(tEc) else None
+
+    def getEcLineage(self, ecId):
+        """Return the EC lineage list [(depth, id, name), ...] for the input EC identifier or None."""
+        tL = self.__memoize("ec_lineage", ecId, self.__ecP.getLineage, ecId)
+        return list(tL) if tL else tL
+
+    def warmMemo(self):
+        """Pre-load the lookup memos for the GO, InterPro and EC identifiers referenced in the reference sequence data.
+
+        Returns:
+            int: number of distinct identifiers looked up
+        """
+        idD = defaultdict(set)
+        try:
+            for uD in self.__refD.values():
+                for tD in uD.get("dbReferences", []) if uD else []:
+                    if "resource" in tD and "id_code" in tD and tD["resource"] in ["GO", "InterPro", "EC"]:
+                        idD[tD["resource"]].add(tD["id_code"])
+            for goId in idD["GO"]:
+                if self.goIdExists(goId):
+                    self.getGeneOntologyLineage([goId])
+                    self.getGeneOntologyName(goId)
+            for idCode in idD["InterPro"]:
+                self.getInterProName(idCode)
+                self.getInterProLineage(idCode)
+            for ecId in idD["EC"]:
+                tEc = self.getEcId(ecId)
+                if tEc:
+                    self.getEcLineage(tEc)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        numIds = sum([len(idS) for idS in idD.values()])
+        logger.info("Warmed lookup memos for %d identifiers (GO %d InterPro %d EC %d)", numIds, len(idD["GO"]), len(idD["InterPro"]), len(idD["EC"]))
+        return numIds
+
+    def getAnnotationBundle(self, unpId):
+        """Return the compiled annotation bundle for the input reference sequence accession.
+
+        Args:
+            unpId (str): UniProt accession
+
+        Returns:
+            dict: {"version": <entry version>,
+                   "gene": [{"provenance_source": "UniProt", "value": <gene name>, "taxonomy_id": <int>}, ...],
+                   "annotation": [{"provenance_source": "UniProt", "annotation_id": ..., "type": <GO|Pfam|InterPro>, ...}, ...],
+                   "ec": [<normalized EC identifier>, ...]}
+                  or None if there is no reference data for the accession.
+
+            Bundles are shared between callers (read-only).
+        """
+        return self.__bundleC.get(unpId)
+
+    def buildAnnotationBundles(self, useCache=True):
+        """Compile annotation bundles for all reference sequence accessions and save these in the exdb cache directory.
+
+        Cached bundles are reused for accessions with unchanged reference sequence entry versions provided that
+        the GO, Pfam, InterPro and EC data files (file names, sizes and modification times) are unchanged.
+
+        Args:
+            useCache (bool, optional): reuse cached bundles. Defaults to True.
+
+        Returns:
+            int: number of compiled bundles
+        """
+        try:
+            ext = "pic" if self.__cacheKwargs["fmt"] == "pickle" else "json"
+            dirPath = os.path.join(self.__cachePath, self.__cfgOb.get("EXDB_CACHE_DIR", sectionName=self.__cfgOb.getDefaultSectionName()))
+            bundleCacheFilePath = os.path.join(dirPath, "UniProt-ref-annotation-bundle-cache" + "." + ext)
+            fingerprintD = self.__getBundleFingerprint()
+            cacheD = {}
+            if useCache and self.__mU.exists(bundleCacheFilePath):
+                tD = self.__mU.doImport(bundleCacheFilePath, **self.__cacheKwargs) or {}
+                if tD.get("fingerprint") == fingerprintD:
+                    cacheD = tD.get("bundles", {})
+                else:
+                    logger.info("Discarding cached annotation bundles compiled from prior GO, Pfam, InterPro or EC data")
+            #
+            numCached = 0
+            bundleD = self.__bundleC.getBundles()
+            for unpId, uD in self.__refD.items():
+                if not uD:
+                    continue
+                if unpId in cacheD and cacheD[unpId]["version"] == uD.get("version"):
+                    self.__bundleC.set(unpId, cacheD[unpId])
+                    numCached += 1
+                elif unpId not in bundleD or bundleD[unpId]["version"] != uD.get("version"):
+                    self.__bundleC.set(unpId, self.__bundleC.build(unpId, uD))
+            #
+            if numCached < len(bundleD) or len(cacheD) != numCached:
+                self.__mU.mkdir(dirPath)
+                ok = self.__mU.doExport(bundleCacheFilePath, {"fingerprint": fingerprintD, "bundles": dict(bundleD)}, **self.__cacheKwargs)
+                logger.info("Annotation bundle cache save status %r", ok)
+            logger.info("Compiled annotation bundles %d (cached %d)", len(bundleD), numCached)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return len(self.__bundleC)
+
+    def __getBundleFingerprint(self):
+        """Return the file names, sizes and modification times of the GO, Pfam, InterPro and EC data files from which
+        annotation bundles are compiled (file locations follow the provider constructors in __fetch*Provider()).
+        """
+        sectionName = self.__cfgOb.getDefaultSectionName()
+        goDirPath = os.path.join(self.__cachePath, self.__cfgOb.get("EXDB_CACHE_DIR", sectionName=sectionName))
+        ecDirPath = os.path.join(self.__cachePath, self.__cfgOb.get("ENZYME_CLASSIFICATION_CACHE_DIR", sectionName=sectionName))
+        pathD = {
+            "GO": glob.glob(os.path.join(goDirPath, "go-basic.obo")),
+            "Pfam": glob.glob(os.path.join(self.__cachePath, "pfam", "pfam-data.*")) + glob.glob(os.path.join(self.__cachePath, "pfam", "pfam-mapping-data.*")),
+            "InterPro": glob.glob(os.path.join(self.__cachePath, "interPro", "interPro-data.*")),
+            "EC": glob.glob(os.path.join(ecDirPath, "enzyme-data.json")),
+        }
+        fingerprintD = {}
+        for resource, pathL in pathD.items():
+            fingerprintD[resource] = [[os.path.basename(pth), os.path.getsize(pth), int(os.path.getmtime(pth))] for pth in sorted(pathL) if os.path.isfile(pth)]
+        return fingerprintD
+
+    def getMemoCounts(self):
+        """Return the memo hit, miss and size counts for each lookup type.
+
+        Returns:
+            dict: {lookup type: {"hits": <int>, "misses": <int>, "size": <int>}, ...}
+        """
+        rD = {}
+        for ky, cD in self.__memoCountD.items():
+            rD[ky] = {"hits": cD["hits"], "misses": cD["misses"], "size": len(self.__memoD[ky])}
+        return rD
+
+    def clearMemo(self):
+        """Discard all memoized lookups and reset the memo counters."""
+        self.__memoD.clear()
+        self.__memoCountD.clear()
+
+    def __memoize(self, memoType, key, func, *args):
+        cD = self.__memoCountD[memoType]
+        mD = self.__memoD[memoType]
+        if self.__memoSize:
+            if key in mD:
+                mD.move_to_end(key)
+                cD["hits"] += 1
+                return mD[key]
+        cD["misses"] += 1
+        val = func(*args)
+        if self.__memoSize:
+            mD[key] = val
+            if len(mD) > self.__memoSize:
+                mD.popitem(last=False)
+        return val
+
     def getSiftsSummaryProvider(self):
         return self.__ssP
 
     def getMatchInfo(self):
         return self.__matchD
 
+    def getMatch(self, rId):
+        """Return the match status and the list of matched accessions [(accession, taxId), ...] for the input accession."""
+        return self.__rsaP.getMatch(rId)
+
     def getRefData(self):
         return self.__refD
 
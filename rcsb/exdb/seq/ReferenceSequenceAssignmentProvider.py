@@ -5,6 +5,9 @@
 # Utilities to cache content required to update referencence sequence assignments.
 #
 # Updates:
+# 16-Oct-2026  jdw add getMatch() accessor for accession match results
+# 16-Oct-2026  jdw add per-accession annotation bundles (getAnnotationBundle()) compiled once per accession
+# 16-Oct-2026  jdw compile bundles with the shared ReferenceAnnotationBundleCache() bounded by bundleCacheSize
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -17,6 +20,8 @@ import os
 from collections import defaultdict
 
 
+from rcsb.exdb.seq.ReferenceAnnotationBundleCache import ReferenceAnnotationBundleCache
+from rcsb.exdb.seq.ReferenceMatchIndex import ReferenceMatchIndex
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.utils.ec.EnzymeDatabaseProvider import EnzymeDatabaseProvider
 from rcsb.utils.io.IoUtil import getObjSize
@@ -45,6 +50,7 @@ class ReferenceSequenceAssignmentProvider(object):
         provSource="PDB",
         maxChunkSize=100,
         fetchLimit=None,
+        bundleCacheSize=50000,
         **kwargs
     ):
         self.__cfgOb = cfgOb
@@ -60,6 +66,7 @@ class ReferenceSequenceAssignmentProvider(object):
         self.__goP = self.__fetchGoProvider(self.__cfgOb, self.__cfgOb.getDefaultSectionName(), **kwargs)
         self.__ecP = self.__fetchEcProvider(self.__cfgOb, self.__cfgOb.getDefaultSectionName(), **kwargs)
         self.__refIdMapD, self.__matchD, self.__refD = self.__reload(databaseName, collectionName, polymerType, referenceDatabaseName, provSource, fetchLimit, **kwargs)
+        self.__bundleC = ReferenceAnnotationBundleCache(self.__refD, self.goIdExists, self.getGeneOntologyLineage, self.__getEcId, maxSize=bundleCacheSize)
 
     def goIdExists(self, goId):
         try:
@@ -94,9 +101,41 @@ class ReferenceSequenceAssignmentProvider(object):
     def getMatchInfo(self):
         return self.__matchD
 
+    def getMatch(self, rId):
+        """Return the match status and the list of matched accessions for the input accession.
+
+        Args:
+            rId (str): searched accession
+
+        Returns:
+            (str, list): match status (None if there is no match data for the accession), [(matched accession, taxId), ...]
+        """
+        return ReferenceMatchIndex.lookupMatch(self.__matchD, rId)
+
     def getRefData(self):
         return self.__refD
 
+    def getAnnotationBundle(self, unpId):
+        """Return the gene, annotation and EC content compiled (once) for the input reference sequence accession.
+
+        Args:
+            unpId (str): UniProt accession
+
+        Returns:
+            dict: {"version": <entry version>,
+                   "gene": [{"provenance_source": "UniProt", "value": <gene name>, "taxonomy_id": <int>}, ...],
+                   "annotation": [{"provenance_source": "UniProt", "annotation_id": ..., "type": <GO|Pfam|InterPro>, ...}, ...],
+                   "ec": [<normalized EC identifier>, ...]}
+                  or None if there is no reference data for the accession.
+
+            Bundles are shared between callers (read-only) and are held in a cache of at most bundleCacheSize bundles.
+        """
+        return self.__bundleC.get(unpId)
+
+    def __getEcId(self, ecId):
+        tEc = self.__ecP.normalize(ecId)
+        return tEc if self.__ecP.exists(tEc) else None
+
     def getDocuments(self, formatType="exchange"):
         fobj = UniProtUtils(saveText=False)
         exObjD = fobj.reformat(self.__refD, formatType=formatType)
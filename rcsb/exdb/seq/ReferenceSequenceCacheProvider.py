@@ -6,6 +6,20 @@
 #
 # Updates:
 # 8-Apr-2020 jdw change testCache() conditions to specifically track missing matched reference Id codes.
+# 16-Oct-2026 jdw save chunks using bulk upserts ObjectUpdater.update(..., bulk=True)
+# 16-Oct-2026 jdw write only changed content when saving refreshed chunks (changeOnly=True)
+# 16-Oct-2026 jdw reuse a pooled connection for worker chunk saves (usePool=True)
+# 16-Oct-2026 jdw purge obsolete identifiers with chunked set-based deletions limited to failureFraction of each collection
+# 16-Oct-2026 jdw fetch in chunks of maxChunkSize and save with a write-behind ObjectUpdaterQueue() overlapping fetch and save
+# 16-Oct-2026 jdw add lazyLoad option returning reference and match data as on-demand LazyObjectMap() objects
+# 16-Oct-2026 jdw add concurrent (fetchThreads > 1) rate-limited fetch mode using UniProtFetcher() within each worker
+# 16-Oct-2026 jdw guard purges with a separate maxPurgeFraction option and report per-collection purge counts (getPurgeCounts())
+# 16-Oct-2026 jdw exclude identifiers in chunks that failed to save from the worker success list
+# 16-Oct-2026 jdw fetch only the reference identifiers (getDistinctValues()) when checking cached and expired reference data
+# 16-Oct-2026 jdw add compactMatchIndex option serving match data from a ReferenceMatchIndex() streamed from the match collection, add getMatch()
+# 16-Oct-2026 jdw close the concurrent fetcher on failure and divide the requestsPerSecond limit among worker processes
+# 16-Oct-2026 jdw serve getMatch() directly from the match index in compact mode
+# 16-Oct-2026 jdw use the shared ReferenceMatchIndex.lookupMatch() in getMatch()
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -14,12 +28,18 @@ __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
 import logging
+import os
 from collections import defaultdict
 
 
+from rcsb.exdb.seq.ReferenceMatchIndex import ReferenceMatchIndex
+from rcsb.exdb.seq.UniProtFetcher import UniProtFetcher
+from rcsb.exdb.utils.LazyObjectMap import LazyObjectMap
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.exdb.utils.ObjectUpdaterQueue import ObjectUpdaterQueue
 from rcsb.utils.io.IoUtil import getObjSize
+from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.io.TimeUtil import TimeUtil
 from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
 from rcsb.utils.seq.UniProtUtils import UniProtUtils
@@ -51,6 +71,7 @@ class ReferenceUpdateWorker(object):
         fetchLimit = optionsD.get("fetchLimit", None)
         refDbName = optionsD.get("refDbName", "UniProt")
         maxChunkSize = optionsD.get("maxChunkSize", 50)
+        fetchThreads = optionsD.get("fetchThreads", 1)
         successList = []
         retList1 = []
         retList2 = []
@@ -58,27 +79,21 @@ class ReferenceUpdateWorker(object):
         emptyList = []
         #
         try:
-            tU = TimeUtil()
             idList = dataList[:fetchLimit] if fetchLimit else dataList
             logger.info("%s starting fetch for %d %s entries", procName, len(idList), refDbName)
             if refDbName == "UniProt":
-                fobj = UniProtUtils(saveText=saveText)
-                logger.debug("Maximum reference chunk size %d", maxChunkSize)
-                refD, matchD = fobj.fetchList(idList, maxChunkSize=maxChunkSize)
-                if len(matchD) == len(idList):
-                    for uId, tD in matchD.items():
-                        tD["rcsb_id"] = uId.strip()
-                        tD["rcsb_last_update"] = tU.getDateTimeObj(tU.getTimestamp())
-                        retList1.append(tD)
-                    for uId, tD in refD.items():
-                        tD["rcsb_id"] = uId.strip()
-                        tD["rcsb_last_update"] = tU.getDateTimeObj(tU.getTimestamp())
-                        retList2.append(tD)
-                    successList.extend(idList)
-                    self.__updateReferenceData(self.__databaseName, self.__refDataCollectionName, retList2)
-                    self.__updateReferenceData(self.__databaseName, self.__matchDataCollectionName, retList1)
+                logger.debug("Maximum reference chunk size %d fetch threads %d", maxChunkSize, fetchThreads)
+                if fetchThreads > 1:
+                    with UniProtFetcher(
+                        urlPrimary=optionsD.get("urlPrimary", "https://rest.uniprot.org"),
+                        maxInFlight=fetchThreads,
+                        requestsPerSecond=optionsD.get("requestsPerSecond", 10.0),
+                        saveText=saveText,
+                    ) as uF:
+                        successList, retList1, retList2 = self.__saveChunks(procName, uF.iterFetch(idList, maxChunkSize=maxChunkSize))
+                        logger.info("%s fetch request counts %r", procName, uF.getCounts())
                 else:
-                    logger.info("Failing with fetch for %d entries with matchD %r", len(idList), matchD)
+                    successList, retList1, retList2 = self.__saveChunks(procName, self.__iterFetch(UniProtUtils(saveText=saveText), idList, maxChunkSize))
             else:
                 logger.error("Unsupported reference database %r", refDbName)
         except Exception as e:
@@ -87,7 +102,50 @@ class ReferenceUpdateWorker(object):
         #
         return successList, emptyList, emptyList, diagList
 
-    def __updateReferenceData(self, databaseName, collectionName, objDL):
+    def __saveChunks(self, procName, chunkIter):
+        """Save the fetched (idList, refD, matchD) chunks and return the identifiers in saved chunks
+        and the saved match and reference data.
+        """
+        tU = TimeUtil()
+        successList = []
+        retList1 = []
+        retList2 = []
+        # Fetched chunks are saved in a background thread while the next chunks are fetched
+        chunkD = {}
+        with ObjectUpdaterQueue(self.__cfgOb, changeOnly=True) as uQ:
+            for ii, (tIdList, refD, matchD) in enumerate(chunkIter):
+                if len(matchD) == len(tIdList):
+                    tRetList1 = []
+                    tRetList2 = []
+                    for uId, tD in matchD.items():
+                        tD["rcsb_id"] = uId.strip()
+                        tD["rcsb_last_update"] = tU.getDateTimeObj(tU.getTimestamp())
+                        tRetList1.append(tD)
+                    for uId, tD in refD.items():
+                        tD["rcsb_id"] = uId.strip()
+                        tD["rcsb_last_update"] = tU.getDateTimeObj(tU.getTimestamp())
+                        tRetList2.append(tD)
+                    successList.extend(tIdList)
+                    retList1.extend(tRetList1)
+                    retList2.extend(tRetList2)
+                    chunkD[ii] = tIdList
+                    self.__updateReferenceData(uQ, self.__databaseName, self.__refDataCollectionName, tRetList2, tag=ii)
+                    self.__updateReferenceData(uQ, self.__databaseName, self.__matchDataCollectionName, tRetList1, tag=ii)
+                else:
+                    logger.info("Failing with fetch for %d entries with matchD %r", len(tIdList), matchD)
+        failIdS = set([tId for ii in uQ.getFailedTags() for tId in chunkD.get(ii, [])])
+        if failIdS:
+            logger.error("%s failing to save %d identifiers", procName, len(failIdS))
+            successList = [tId for tId in successList if tId not in failIdS]
+        return successList, retList1, retList2
+
+    def __iterFetch(self, fobj, idList, maxChunkSize):
+        for ii in range(0, len(idList), maxChunkSize):
+            tIdList = idList[ii : ii + maxChunkSize]
+            refD, matchD = fobj.fetchList(tIdList, maxChunkSize=maxChunkSize)
+            yield tIdList, refD, matchD
+
+    def __updateReferenceData(self, uQ, databaseName, collectionName, objDL, tag=None):
         updateDL = []
         for objD in objDL:
             try:
@@ -95,9 +153,7 @@ class ReferenceUpdateWorker(object):
                 updateDL.append({"selectD": selectD, "updateD": objD})
             except Exception as e:
                 logger.exception("Failing with %s", str(e))
-        obUpd = ObjectUpdater(self.__cfgOb)
-        numUpd = obUpd.update(databaseName, collectionName, updateDL)
-        logger.debug("Updated reference count is %d", numUpd)
+        uQ.put(databaseName, collectionName, updateDL, tag=tag)
 
     def __createCollections(self, databaseName, collectionName, indexAttributeNames=None):
         obUpd = ObjectUpdater(self.__cfgOb)
@@ -108,13 +164,50 @@ class ReferenceUpdateWorker(object):
 class ReferenceSequenceCacheProvider(object):
     """  Utilities to cache referencence sequence data and correspondence mappings.
 
+         With lazyLoad=True, reference and match data are returned as dictionary-like LazyObjectMap()
+         objects which fetch documents on first access and retain at most lazyCacheSize documents.
+
+         With compactMatchIndex=True, match data are served from a memory-mapped ReferenceMatchIndex() saved in the
+         exdb cache directory.  The index is streamed from the match collection (the match documents are not retained)
+         and an existing index file is reused when no reference data are updated.
+
+         With fetchThreads > 1, each worker process fetches reference sequence chunks concurrently with
+         up to fetchThreads requests in flight over a shared, rate limited HTTP session.  The overall
+         request rate limit (requestsPerSecond, default 10.0) is divided among the numProc worker processes.
+
+         Obsolete reference data are purged only if the purge removes at most maxPurgeFraction (default 0.05)
+         of each collection.
     """
 
-    def __init__(self, cfgOb, siftsProvider=None, maxChunkSize=50, fetchLimit=None, expireDays=7, numProc=1, **kwargs):
+    def __init__(
+        self,
+        cfgOb,
+        siftsProvider=None,
+        maxChunkSize=50,
+        fetchLimit=None,
+        expireDays=7,
+        numProc=1,
+        lazyLoad=False,
+        lazyCacheSize=20000,
+        fetchThreads=1,
+        compactMatchIndex=False,
+        maxPurgeFraction=0.05,
+        **kwargs
+    ):
         self.__cfgOb = cfgOb
+        self.__mU = MarshalUtil()
         #
         self.__maxChunkSize = maxChunkSize
         self.__numProc = numProc
+        self.__fetchThreads = fetchThreads
+        self.__fetchOptD = {ky: kwargs[ky] for ky in ["urlPrimary", "requestsPerSecond"] if ky in kwargs}
+        self.__maxPurgeFraction = maxPurgeFraction
+        self.__purgeCountD = {}
+        self.__lazyLoad = lazyLoad
+        self.__lazyCacheSize = lazyCacheSize
+        self.__compactMatchIndex = compactMatchIndex
+        self.__cachePath = kwargs.get("cachePath", ".")
+        self.__numUpdated = 0
         #
         self.__databaseName = "uniprot_exdb"
         self.__refDataCollectionName = "reference_entry"
@@ -126,12 +219,27 @@ class ReferenceSequenceCacheProvider(object):
     def getMatchInfo(self):
         return self.__matchD
 
+    def getMatch(self, rId):
+        """Return the match status and the list of matched accessions for the input accession.
+
+        Args:
+            rId (str): searched accession
+
+        Returns:
+            (str, list): match status (None if there is no match data for the accession), [(matched accession, taxId), ...]
+        """
+        return ReferenceMatchIndex.lookupMatch(self.__matchD, rId)
+
     def getRefData(self):
         return self.__refD
 
     def getMissingMatchedIdCodes(self):
         return self.__missingMatchIds
 
+    def getPurgeCounts(self):
+        """Return the number of obsolete documents purged from each collection {collectionName: count, ...}."""
+        return self.__purgeCountD
+
     def getDocuments(self, formatType="exchange"):
         fobj = UniProtUtils(saveText=False)
         exObjD = fobj.reformat(self.__refD, formatType=formatType)
@@ -192,7 +300,6 @@ class ReferenceSequenceCacheProvider(object):
         logger.info("Reference identifiers expired/missing %d", numMissing)
         # --
         refIdMapD = {}
-        matchD = {}
         refD = {}
         failList = []
         assignRefD = self.__getPolymerReferenceSequenceAssignments(fetchLimit)
@@ -215,21 +322,76 @@ class ReferenceSequenceCacheProvider(object):
         else:
             logger.info("No reference sequence updates required")
         #
-        matchD = self.__getReferenceData(self.__databaseName, self.__matchDataCollectionName)
-        refD = self.__getReferenceData(self.__databaseName, self.__refDataCollectionName)
+        matchD = None
+        if self.__compactMatchIndex:
+            matchD = self.__getMatchIndex(cacheUnpIdList)
+        elif self.__numUpdated and self.__mU.exists(self.__getMatchIndexPath()):
+            # -- an index saved in a prior run is now stale
+            self.__mU.remove(self.__getMatchIndexPath())
+        if self.__lazyLoad:
+            if matchD is None:
+                matchD = LazyObjectMap(self.__cfgOb, self.__databaseName, self.__matchDataCollectionName, maxSize=self.__lazyCacheSize, batchSize=self.__maxChunkSize)
+            refD = LazyObjectMap(self.__cfgOb, self.__databaseName, self.__refDataCollectionName, maxSize=self.__lazyCacheSize, batchSize=self.__maxChunkSize)
+        else:
+            if matchD is None:
+                matchD = self.__getReferenceData(self.__databaseName, self.__matchDataCollectionName)
+            refD = self.__getReferenceData(self.__databaseName, self.__refDataCollectionName)
         logger.info("Completed - returning match length %d and reference data length %d num missing %d", len(matchD), len(refD), len(failList))
         return matchD, refD, len(failList)
 
+    def __getMatchIndex(self, cacheUnpIdList):
+        """Return the reference match index reusing the index file in the exdb cache directory if the reference data
+        are unchanged or streaming the index from the match collection otherwise.
+
+        Args:
+            cacheUnpIdList (list): reference identifiers in the match collection prior to any update
+
+        Returns:
+            (obj): ReferenceMatchIndex() instance or None for failure
+        """
+        try:
+            filePath = self.__getMatchIndexPath()
+            if not self.__numUpdated and self.__mU.exists(filePath):
+                try:
+                    mI = ReferenceMatchIndex(filePath)
+                    if len(mI) == len(cacheUnpIdList):
+                        logger.info("Reusing reference match index length %d", len(mI))
+                        return mI
+                    mI.close()
+                except Exception as e:
+                    logger.warning("Rebuilding unreadable reference match index %s (%s)", filePath, str(e))
+            #
+            self.__mU.mkdir(os.path.dirname(filePath))
+            with ObjectExtractor(
+                self.__cfgOb,
+                databaseName=self.__databaseName,
+                collectionName=self.__matchDataCollectionName,
+                useCache=False,
+                keyAttribute="rcsb_id",
+                uniqueAttributes=["rcsb_id"],
+                selectionList=["rcsb_id", "matched", "matchedIds"],
+            ) as obEx:
+                mI = ReferenceMatchIndex.build(obEx.iterObjects(), filePath=filePath)
+            logger.info("Built reference match index length %d status counts %r", len(mI), mI.getStatusCounts())
+            return mI
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return None
+
+    def __getMatchIndexPath(self):
+        dirPath = os.path.join(self.__cachePath, self.__cfgOb.get("EXDB_CACHE_DIR", sectionName=self.__cfgOb.getDefaultSectionName()))
+        return os.path.join(dirPath, "UniProt-ref-match-index.idx")
+
     def __refreshReferenceData(self, expireDays=14, failureFraction=0.75):
-        """Update expired reference data and purge any obsolete data not to exceeding the
-        the input failureFraction.
+        """Update expired reference data and purge any obsolete data if the fraction of failed updates
+        is less than the input failureFraction.  Each purge is limited to maxPurgeFraction of the collection.
 
         Args:
             expireDays (int, optional): expiration interval in days. Defaults to 14.
-            failureFraction (float, optional): fractional limit of obsolete entries purged. Defaults to 0.75.
+            failureFraction (float, optional): fractional limit of failed updates for which obsolete entries are purged. Defaults to 0.75.
 
         Returns:
-            (int): number of obsolete entries purged
+            (int): number of obsolete (failed update) entries
 
         """
         idList = self.__getReferenceDataIds(expireDays=expireDays)
@@ -240,15 +402,13 @@ class ReferenceSequenceCacheProvider(object):
         ok, failList = self.__updateReferenceData(idList)
         logger.info("After reference update (status=%r) missing expired match identifiers %d", ok, len(failList))
         tFrac = float(len(failList)) / float(len(idList))
-        if tFrac < failureFraction:
+        if failList and tFrac < failureFraction:
             obUpd = ObjectUpdater(self.__cfgOb)
             selectD = {"rcsb_id": failList}
-            numPurge = obUpd.delete(self.__databaseName, self.__matchDataCollectionName, selectD)
-            if len(failList) != numPurge:
-                logger.info("Update match failures %d purge count %d", len(failList), numPurge)
-            numPurge = obUpd.delete(self.__databaseName, self.__refDataCollectionName, selectD)
-            if len(failList) != numPurge:
-                logger.info("Update reference data failures %d purge count %d", len(failList), numPurge)
+            for collectionName in [self.__matchDataCollectionName, self.__refDataCollectionName]:
+                numPurge = obUpd.delete(self.__databaseName, collectionName, selectD, maxFraction=self.__maxPurgeFraction)
+                self.__purgeCountD[collectionName] = numPurge
+                logger.info("%s update failures %d purge count %d (limit fraction %.3f)", collectionName, len(failList), numPurge, self.__maxPurgeFraction)
         return len(failList)
 
     def __getReferenceDataIds(self, expireDays=14):
@@ -260,20 +420,30 @@ class ReferenceSequenceCacheProvider(object):
 
         Returns:
             (list): reference identifier list
+
+        Raises:
+            Exception: failures reading the match collection are raised (and are not taken as an empty cache)
         """
         selectD = None
         if expireDays > 0:
             tU = TimeUtil()
             tS = tU.getTimestamp(useUtc=True, before={"days": expireDays})
             selectD = {"rcsb_latest_update": {"$lt": tU.getDateTimeObj(tS)}}
-        matchD = self.__getReferenceData(self.__databaseName, self.__matchDataCollectionName, selectD=selectD)
-        return sorted(matchD.keys())
+        # Only the identifiers are transferred (server-side distinct values) rather than the match documents
+        with ObjectExtractor(self.__cfgOb, databaseName=self.__databaseName, collectionName=self.__matchDataCollectionName, selectionQuery=selectD) as obEx:
+            idL = obEx.getDistinctValues("rcsb_id")
+        return sorted(idL)
 
     def __updateReferenceData(self, idList):
         numProc = self.__numProc
         chunkSize = self.__maxChunkSize
         logger.info("Length starting list is %d", len(idList))
-        optD = {"maxChunkSize": chunkSize}
+        self.__numUpdated += len(idList)
+        optD = {"maxChunkSize": chunkSize, "fetchThreads": self.__fetchThreads}
+        optD.update(self.__fetchOptD)
+        # The request rate limit is shared by the worker processes
+        requestsPerSecond = self.__fetchOptD.get("requestsPerSecond", 10.0)
+        optD["requestsPerSecond"] = float(requestsPerSecond) / max(1, numProc) if requestsPerSecond else None
         rWorker = ReferenceUpdateWorker(self.__cfgOb)
         mpu = MultiProcUtil(verbose=True)
         mpu.setOptions(optD)
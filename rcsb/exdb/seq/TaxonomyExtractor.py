@@ -5,7 +5,8 @@
 # Utilities to extract taxonomy details from the core entity collection.
 #
 # Updates:
-#
+# 16-Oct-2026  jdw stream the entity selection using ObjectExtractor.iterObjects()
+# 16-Oct-2026  jdw compute unique taxonomy identifiers on the server using ObjectExtractor.getDistinctValues()
 ##
 __docformat__ = "restructuredtext en"
 __author__ = "John Westbrook"
@@ -48,23 +49,11 @@ class TaxonomyExtractor(object):
                 objectLimit=None,
                 # selectionQuery={"entity.type": "polymer"},
                 selectionQuery=None,
-                selectionList=["rcsb_id", "rcsb_entity_source_organism.ncbi_taxonomy_id", "rcsb_entity_host_organism.ncbi_taxonomy_id"],
             )
-            eCount = obEx.getCount()
-            logger.info("Polymer entity count is %d", eCount)
+            # Unique values are computed on the server from the unwound organism arrays
             taxIdS = set()
-            objD = obEx.getObjects()
-            for _, eD in objD.items():
-                try:
-                    for tD in eD["rcsb_entity_source_organism"]:
-                        taxIdS.add(tD["ncbi_taxonomy_id"])
-                except Exception:
-                    pass
-                try:
-                    for tD in eD["rcsb_entity_host_organism"]:
-                        taxIdS.add(tD["ncbi_taxonomy_id"])
-                except Exception:
-                    pass
+            for valuePath in ["rcsb_entity_source_organism[].ncbi_taxonomy_id", "rcsb_entity_host_organism[].ncbi_taxonomy_id"]:
+                taxIdS.update(obEx.getDistinctValues(valuePath))
             logger.info("Unique taxons %d", len(taxIdS))
             return list(taxIdS)
         except Exception as e:
@@ -5,7 +5,7 @@
 # ETL utilities for processing and loading UniProt reference data.
 #
 # Updates:
-#
+# 16-Oct-2026 jdw use cached compiled validators and add first error validation option
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -15,14 +15,12 @@ __license__ = "Apache 2.0"
 
 import logging
 
-from jsonschema import Draft4Validator
-from jsonschema import FormatChecker
-
 from rcsb.db.helpers.DocumentDefinitionHelper import DocumentDefinitionHelper
 from rcsb.db.mongo.DocumentLoader import DocumentLoader
 from rcsb.db.processors.DataExchangeStatus import DataExchangeStatus
 from rcsb.db.utils.SchemaProvider import SchemaProvider
 from rcsb.exdb.seq.ReferenceSequenceAssignmentProvider import ReferenceSequenceAssignmentProvider
+from rcsb.exdb.utils.SchemaValidatorCache import SchemaValidatorCache
 
 #
 
@@ -33,7 +31,7 @@ class UniProtEtlWorker(object):
     """ Prepare and load UniProt 'core' sequence reference data collections.
     """
 
-    def __init__(self, cfgOb, cachePath, useCache=True, numProc=2, chunkSize=10, readBackCheck=False, documentLimit=None, doValidate=False, verbose=False):
+    def __init__(self, cfgOb, cachePath, useCache=True, numProc=2, chunkSize=10, readBackCheck=False, documentLimit=None, doValidate=False, verbose=False, firstErrorOnly=False):
         self.__cfgOb = cfgOb
         self.__cachePath = cachePath
         self.__useCache = useCache
@@ -47,8 +45,11 @@ class UniProtEtlWorker(object):
         self.__statusList = []
         self.__schP = SchemaProvider(self.__cfgOb, self.__cachePath, useCache=self.__useCache)
         self.__docHelper = DocumentDefinitionHelper(cfgOb=self.__cfgOb)
+        self.__valCache = SchemaValidatorCache(self.__cfgOb, cachePath=self.__cachePath, useCache=self.__useCache, schemaProvider=self.__schP)
         self.__valInst = None
         self.__doValidate = doValidate
+        # report only the first validation error for each object
+        self.__firstErrorOnly = firstErrorOnly
         #
 
     def __updateStatus(self, updateId, databaseName, collectionName, status, startTimestamp):
@@ -122,7 +123,7 @@ class UniProtEtlWorker(object):
                 logger.error("Unsupported external resource %r", extResource)
             #
             if self.__doValidate:
-                self.__valInst = self.__getValidator(databaseName, collectionName, schemaLevel="full")
+                self.__valInst = self.__getValidator(databaseName, collectionName, schemaLevel="full", schemaVersion=collectionVersion)
                 for dObj in dList:
                     self.__validateObj(databaseName, collectionName, dObj, label="Original")
             #
@@ -148,20 +149,21 @@ class UniProtEtlWorker(object):
     def getLoadStatus(self):
         return self.__statusList
 
-    def __getValidator(self, databaseName, collectionName, schemaLevel="full"):
+    def __getValidator(self, databaseName, collectionName, schemaLevel="full", schemaVersion=None):
         # _ = self.__schP.makeSchemaDef(databaseName, dataTyping="ANY", saveSchema=True)
         # cD = self.__schP.makeSchema(databaseName, collectionName, encodingType="JSON", level=schemaLevel, saveSchema=True)
-        logger.info("Fetch schema for %r %r validation level %r", databaseName, collectionName, schemaLevel)
-        cD = self.__schP.getJsonSchema(databaseName, collectionName, encodingType="JSON", level=schemaLevel)
-        # Raises exceptions for schema compliance.
-        Draft4Validator.check_schema(cD)
-        valInst = Draft4Validator(cD, format_checker=FormatChecker())
-        return valInst
+        return self.__valCache.getValidator(databaseName, collectionName, level=schemaLevel, schemaVersion=schemaVersion)
 
     def __validateObj(self, databaseName, collectionName, rObj, label=""):
         try:
             eCount = 0
             tId = rObj["rcsb_id"] if rObj and "rcsb_id" in rObj else "anonymous"
+            if self.__firstErrorOnly:
+                error = next(self.__valInst.iter_errors(rObj), None)
+                if error is not None:
+                    logger.info("Database %s collection %s (%s %r) path %s error: %s", databaseName, collectionName, label, tId, error.path, error.message)
+                    eCount = 1
+                return eCount
             for error in sorted(self.__valInst.iter_errors(rObj), key=str):
                 logger.info("Database %s collection %s (%s %r) path %s error: %s", databaseName, collectionName, label, tId, error.path, error.message)
                 logger.debug(">>> Failing object is %r", rObj)
@@ -0,0 +1,245 @@
+##
+# File: UniProtFetcher.py
+# Date: 16-Oct-2026  jdw
+#
+# Concurrent fetch of UniProt reference entries over a shared HTTP session.
+#
+# Updates:
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rcsb.utils.seq.UniProtReader import UniProtReader
+from rcsb.utils.seq.UniProtUtils import UniProtUtils
+
+logger = logging.getLogger(__name__)
+
+# Earliest start time for the next request to each host in the current process {host: monotonic time, ...}
+_hostNextRequestD = {}
+_hostLock = threading.Lock()
+
+
+def _waitForHost(host, requestsPerSecond):
+    """Delay the calling thread to limit the request rate to the input host (shared by all threads)."""
+    if not requestsPerSecond:
+        return
+    with _hostLock:
+        now = time.monotonic()
+        startTime = max(now, _hostNextRequestD.get(host, now))
+        _hostNextRequestD[host] = startTime + 1.0 / float(requestsPerSecond)
+    if startTime > now:
+        time.sleep(startTime - now)
+
+
+class UniProtFetcher(object):
+    """ Concurrent fetch of UniProt reference entries using a pool of threads sharing one HTTP session.
+
+        Requests to each host are rate limited (requestsPerSecond) across all threads in the current process.
+        Connection failures and transient responses (429 and 5xx) are retried with jittered exponential
+        backoff (honoring any Retry-After interval).  Chunks failing the primary service are optionally
+        fetched with UniProtUtils() using the alternative service (retryAltApi=True).
+
+        Example:
+            uF = UniProtFetcher(maxInFlight=4, requestsPerSecond=10)
+            for idList, refD, matchD in uF.iterFetch(unpIdList, maxChunkSize=50):
+                ...
+    """
+
+    def __init__(
+        self, urlPrimary="https://rest.uniprot.org", maxInFlight=4, requestsPerSecond=10.0, maxRetries=4, backoffSeconds=1.0, maxBackoffSeconds=60.0, timeout=600, **kwargs
+    ):
+        """
+        Args:
+            urlPrimary (str, optional): UniProt REST service base URL. Defaults to "https://rest.uniprot.org".
+            maxInFlight (int, optional): maximum number of concurrent requests. Defaults to 4.
+            requestsPerSecond (float, optional): maximum request rate for each host (None for no limit). Defaults to 10.0.
+            maxRetries (int, optional): maximum number of retries for each request. Defaults to 4.
+            backoffSeconds (float, optional): initial backoff interval. Defaults to 1.0.
+            maxBackoffSeconds (float, optional): maximum backoff interval. Defaults to 60.0.
+            timeout (int, optional): request timeout (seconds). Defaults to 600.
+            kwargs: retryAltApi (bool, default True), saveText (bool, default False) options for UniProtUtils()
+        """
+        self.__urlPrimary = urlPrimary.rstrip("/")
+        self.__host = urlparse(self.__urlPrimary).netloc
+        self.__maxInFlight = max(1, int(maxInFlight))
+        self.__requestsPerSecond = requestsPerSecond
+        self.__maxRetries = max(0, int(maxRetries))
+        self.__backoffSeconds = backoffSeconds
+        self.__maxBackoffSeconds = maxBackoffSeconds
+        self.__timeout = timeout
+        self.__retryAltApi = kwargs.get("retryAltApi", True)
+        self.__saveText = kwargs.get("saveText", False)
+        #
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.__maxInFlight)
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+        self.__lock = threading.Lock()
+        self.__countD = {"requests": 0, "retries": 0, "failures": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.__session.close()
+
+    def getCounts(self):
+        """Return request statistics {"requests": <int>, "retries": <int>, "failures": <int>}."""
+        with self.__lock:
+            return dict(self.__countD)
+
+    def iterFetch(self, idList, maxChunkSize=50):
+        """Fetch the input identifiers in chunks with at most maxInFlight concurrent chunk requests.
+
+        Args:
+            idList (list): UniProt identifiers
+            maxChunkSize (int, optional): identifiers in each request. Defaults to 50.
+
+        Yields:
+            (list, dict, dict): chunk identifier list, reference data and match details (as UniProtUtils.fetchList()) in order of completion
+        """
+        chunkIter = (idList[ii : ii + maxChunkSize] for ii in range(0, len(idList), maxChunkSize))
+        with ThreadPoolExecutor(max_workers=self.__maxInFlight, thread_name_prefix="UniProtFetcher") as executor:
+            futureD = {}
+            for tIdList in chunkIter:
+                futureD[executor.submit(self.fetchList, tIdList)] = tIdList
+                if len(futureD) >= self.__maxInFlight:
+                    break
+            while futureD:
+                doneS, _ = wait(futureD, return_when=FIRST_COMPLETED)
+                for future in doneS:
+                    tIdList = futureD.pop(future)
+                    nextIdList = next(chunkIter, None)
+                    if nextIdList:
+                        futureD[executor.submit(self.fetchList, nextIdList)] = nextIdList
+                    refD, matchD = future.result()
+                    yield tIdList, refD, matchD
+
+    def fetchList(self, idList):
+        """Fetch reference data for the input identifiers in a single request.
+
+        Args:
+            idList (list): UniProt identifiers (variant identifiers (e.g. P12345-2) are supported)
+
+        Returns:
+            dict: {unpId: {'key':val, ... }} dictionary of UniProt reference data
+            dict: {unpId: {match details}, ...} } dictionary of match details
+        """
+        referenceD = {}
+        matchD = {}
+        try:
+            variantD = {}
+            searchIdS = set()
+            for tId in idList:
+                idx = tId.find("-")
+                sId = tId if idx == -1 else tId[0:idx]
+                if idx != -1:
+                    variantD[tId] = sId
+                searchIdS.add(sId)
+            searchIdL = sorted(searchIdS)
+            #
+            ok, xmlTextL = self.__fetchEntries(searchIdL)
+            if not ok:
+                if self.__retryAltApi:
+                    logger.info("Retrying fetch for %d identifiers using the alternative service", len(idList))
+                    return UniProtUtils(saveText=self.__saveText).fetchList(idList, maxChunkSize=len(idList), usePrimary=False, retryAltApi=True)
+                return referenceD, matchD
+            referenceD.update(self.__parseText(xmlTextL, variantD))
+            #
+            # Re-fetch any missing identifiers using the corresponding demerged (secondary) accessions
+            demergedIdL = []
+            for accId in searchIdL:
+                if not any(["<accession>" + accId + "</accession>" in xmlText for xmlText in xmlTextL]):
+                    _, jD = self.__get("uniprotkb/" + accId, headers={"Accept": "application/json"}, returnJson=True)
+                    if jD and "inactiveReason" in jD:
+                        demergedIdL.extend(jD["inactiveReason"].get("mergeDemergeTo", []))
+            if demergedIdL:
+                logger.info("Re-fetching missing identifiers using demerged identifiers %r", demergedIdL)
+                ok, xmlTextL = self.__fetchEntries(sorted(set(demergedIdL)))
+                if ok:
+                    referenceD.update(self.__parseText(xmlTextL, variantD))
+            matchD = UniProtUtils().rebuildMatchResultIndex(idList, referenceD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return referenceD, matchD
+
+    def __fetchEntries(self, searchIdL):
+        """Return the list of entry XML documents for the input accessions bisecting requests rejected for invalid accessions."""
+        if not searchIdL:
+            return True, []
+        statusCode, xmlText = self.__get("uniprotkb/accessions", paramD={"accessions": ",".join(searchIdL)}, headers={"Accept": "application/xml"})
+        if statusCode == 200 and xmlText:
+            return True, [xmlText]
+        if statusCode == 400:
+            if len(searchIdL) == 1:
+                logger.info("Rejected accession %r", searchIdL[0])
+                return True, []
+            mid = len(searchIdL) // 2
+            ok1, xmlTextL1 = self.__fetchEntries(searchIdL[:mid])
+            ok2, xmlTextL2 = self.__fetchEntries(searchIdL[mid:])
+            return ok1 and ok2, xmlTextL1 + xmlTextL2
+        return False, []
+
+    def __parseText(self, xmlTextL, variantD):
+        retD = {}
+        for xmlText in xmlTextL:
+            ur = UniProtReader()
+            for vId, aId in variantD.items():
+                ur.addVariant(aId, vId)
+            retD.update(ur.readString(xmlText))
+        return retD
+
+    def __get(self, endPoint, paramD=None, headers=None, returnJson=False):
+        """Return the status code and the response content (text or JSON) with retries for transient failures."""
+        url = self.__urlPrimary + "/" + endPoint
+        statusCode = None
+        for attempt in range(self.__maxRetries + 1):
+            retryAfter = None
+            _waitForHost(self.__host, self.__requestsPerSecond)
+            try:
+                with self.__lock:
+                    self.__countD["requests"] += 1
+                resp = self.__session.get(url, params=paramD, headers=headers, timeout=self.__timeout)
+                statusCode = resp.status_code
+                if statusCode == 200:
+                    return statusCode, resp.json() if returnJson else resp.text
+                if statusCode not in [429, 500, 502, 503, 504]:
+                    logger.debug("Request %s failing with status %r", endPoint, statusCode)
+                    return statusCode, None
+                retryAfter = resp.headers.get("Retry-After")
+                logger.info("Request %s status %r (attempt %d)", endPoint, statusCode, attempt + 1)
+            except requests.RequestException as e:
+                logger.info("Request %s failing (attempt %d) with %s", endPoint, attempt + 1, str(e))
+            if attempt < self.__maxRetries:
+                with self.__lock:
+                    self.__countD["retries"] += 1
+                time.sleep(self.__getBackoff(attempt, retryAfter))
+        with self.__lock:
+            self.__countD["failures"] += 1
+        logger.error("Request %s failing after %d attempts", endPoint, self.__maxRetries + 1)
+        return statusCode, None
+
+    def __getBackoff(self, attempt, retryAfter=None):
+        # Full jitter -
+        delay = random.uniform(0, min(self.__maxBackoffSeconds, self.__backoffSeconds * 2 ** attempt))
+        try:
+            delay = max(delay, min(self.__maxBackoffSeconds, float(retryAfter)))
+        except (TypeError, ValueError):
+            pass
+        return delay
@@ -0,0 +1,111 @@
+##
+# File:    ConnectionPoolTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+# 16-Oct-2026 jdw pooled connections are closed by closeAll() rather than instance close()
+#
+##
+"""
+Tests for persistent pooled document object server connections.
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import multiprocessing
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.ConnectionPool import ConnectionPool
+from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.utils.config.ConfigUtil import ConfigUtil
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+POOL_CLIENT_STATE = {}
+
+
+def isInheritedClient(_):
+    """Return True if the pooled client in a forked process is the client inherited from the parent."""
+    with ConnectionPool(POOL_CLIENT_STATE["cfgOb"], usePool=True).connection() as client:
+        return client is POOL_CLIENT_STATE["client"]
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        #
+        self.__mockTopPath = os.path.join(TOPDIR, "rcsb", "mock-data")
+        configPath = os.path.join(TOPDIR, "rcsb", "mock-data", "config", "dbload-setup-example.yml")
+        configName = "site_info_configuration"
+        self.__cfgOb = ConfigUtil(configPath=configPath, defaultSectionName=configName, mockTopPath=self.__mockTopPath)
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testPooledConnectionReuse(self):
+        """ Test case - pooled connections are reused within a process until closed
+        """
+        try:
+            with ConnectionPool(self.__cfgOb, usePool=True) as cP:
+                with cP.connection() as client1:
+                    self.assertNotEqual(client1, None)
+                with ConnectionPool(self.__cfgOb, usePool=True).connection() as client2:
+                    self.assertTrue(client1 is client2)
+            # Closing an instance leaves the shared client open for other users in the process
+            with ConnectionPool(self.__cfgOb, usePool=True).connection() as client3:
+                self.assertTrue(client1 is client3)
+            ConnectionPool.closeAll()
+            with ConnectionPool(self.__cfgOb, usePool=True).connection() as client3:
+                self.assertFalse(client1 is client3)
+            #
+            with ConnectionPool(self.__cfgOb, usePool=False).connection() as client4:
+                self.assertFalse(client3 is client4)
+            #
+            with ObjectUpdater(self.__cfgOb, usePool=True) as obUpd:
+                for _ in range(5):
+                    self.assertTrue(obUpd.count("test_exdb", "test_pool") >= 0)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testPooledConnectionFork(self):
+        """ Test case - pooled connections inherited across a fork are reopened in the child process
+        """
+        try:
+            cP = ConnectionPool(self.__cfgOb, usePool=True)
+            with cP.connection() as client:
+                POOL_CLIENT_STATE["client"] = client
+                POOL_CLIENT_STATE["cfgOb"] = self.__cfgOb
+            ctx = multiprocessing.get_context("fork")
+            with ctx.Pool(2) as pool:
+                rL = pool.map(isInheritedClient, range(2))
+            self.assertEqual(rL, [False, False])
+            ConnectionPool.closeAll()
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def connectionPoolSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ConnectionPoolTests("testPooledConnectionReuse"))
+    suiteSelect.addTest(ConnectionPoolTests("testPooledConnectionFork"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = connectionPoolSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
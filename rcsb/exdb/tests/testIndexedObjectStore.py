@@ -0,0 +1,143 @@
+##
+# File:    IndexedObjectStoreTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+# 16-Oct-2026 jdw add test closing the indexed cache store opened by ObjectExtractor()
+#
+##
+"""
+Tests for the indexed random-access object store.
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import pickle
+import time
+import unittest
+
+from rcsb.exdb.utils.IndexedObjectStore import IndexedObjectStore
+from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class IndexedObjectStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output")
+        self.__objectD = {
+            "%04d_%d" % (ii, jj): {"rcsb_id": "%04d_%d" % (ii, jj), "values": list(range(ii)), "nested": {"name": "entity %d" % jj, "score": ii * 0.5}}
+            for ii in range(200)
+            for jj in range(1, 4)
+        }
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testStoreReadWrite(self):
+        """ Test case - write and randomly access an indexed object store
+        """
+        try:
+            for compress in [True, False]:
+                filePath = os.path.join(self.__workPath, "indexed-object-store-%r.idx" % compress)
+                ok = IndexedObjectStore.write(filePath, self.__objectD, attributeD={"incrementalMark": {"value": 1}}, compress=compress)
+                self.assertTrue(ok)
+                oS = IndexedObjectStore(filePath)
+                self.assertEqual(len(oS), len(self.__objectD))
+                self.assertEqual(oS["0150_2"], self.__objectD["0150_2"])
+                self.assertTrue("0199_3" in oS)
+                self.assertFalse("9999_1" in oS)
+                self.assertEqual(oS.get("9999_1"), None)
+                self.assertEqual(oS.getAttributes(), {"incrementalMark": {"value": 1}})
+                self.assertEqual(dict(oS.items()), self.__objectD)
+                #
+                # pickled instances reopen the store
+                tS = pickle.loads(pickle.dumps(oS))
+                self.assertEqual(tS["0001_1"], self.__objectD["0001_1"])
+                tS.close()
+                oS.close()
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testStoreStreamedWrite(self):
+        """ Test case - write an indexed object store from streamed (key, object) pairs
+        """
+        try:
+            filePath = os.path.join(self.__workPath, "indexed-object-store-streamed.idx")
+            countD = {}
+
+            def iterObjects():
+                for ky, obj in self.__objectD.items():
+                    countD[ky[:4]] = countD.get(ky[:4], 0) + 1
+                    yield ky, obj
+
+            ok = IndexedObjectStore.write(filePath, iterObjects(), attributeD={"counts": countD})
+            self.assertTrue(ok)
+            with IndexedObjectStore(filePath) as oS:
+                self.assertEqual(len(oS), len(self.__objectD))
+                self.assertEqual(oS["0042_3"], self.__objectD["0042_3"])
+                self.assertEqual(len(oS.getAttributes()["counts"]), 200)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractorCacheClose(self):
+        """ Test case - the indexed cache store opened by ObjectExtractor() is closed with the extractor
+        """
+        try:
+            filePath = os.path.join(self.__workPath, "indexed-object-store-extractor.idx")
+            ok = IndexedObjectStore.write(filePath, self.__objectD)
+            self.assertTrue(ok)
+            with ObjectExtractor(None, cacheFilePath=filePath, useCache=True, keyAttribute="entity", cacheKwargs={"fmt": "indexed"}) as obEx:
+                oS = obEx.getObjects()
+                self.assertTrue(isinstance(oS, IndexedObjectStore))
+                self.assertTrue(oS.isOpen())
+                self.assertEqual(oS["0150_2"], self.__objectD["0150_2"])
+            self.assertFalse(oS.isOpen())
+            #
+            # The cache is reopened on use after close()
+            obEx = ObjectExtractor(None, cacheFilePath=filePath, useCache=True, keyAttribute="entity", cacheKwargs={"fmt": "indexed"})
+            self.assertEqual(obEx.getCount(), len(self.__objectD))
+            obEx.close()
+            self.assertEqual(dict(obEx.iterObjects()), self.__objectD)
+            obEx.close()
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testStoreFormatCheck(self):
+        """ Test case - reject files not in the indexed object store format
+        """
+        filePath = os.path.join(self.__workPath, "indexed-object-store-bad.idx")
+        with open(filePath, "wb") as ofh:
+            ofh.write(b"not an indexed store")
+        with self.assertRaises(ValueError):
+            IndexedObjectStore(filePath)
+
+
+def indexedObjectStoreSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(IndexedObjectStoreTests("testStoreReadWrite"))
+    suiteSelect.addTest(IndexedObjectStoreTests("testStoreStreamedWrite"))
+    suiteSelect.addTest(IndexedObjectStoreTests("testStoreFormatCheck"))
+    suiteSelect.addTest(IndexedObjectStoreTests("testExtractorCacheClose"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = indexedObjectStoreSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,119 @@
+##
+# File:    LazyObjectMapTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+# 16-Oct-2026 jdw add read-ahead test
+#
+##
+"""
+Tests for on-demand dictionary-like access to stored objects.
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.IndexedObjectStore import IndexedObjectStore
+from rcsb.exdb.utils.LazyObjectMap import LazyObjectMap
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class LazyObjectMapTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output")
+        self.__objectD = {"P%05d" % ii: {"rcsb_id": "P%05d" % ii, "sequence": "MK" * ii, "version": ii % 7} for ii in range(500)}
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testLocalStoreAccess(self):
+        """ Test case - on-demand access to objects in a local indexed object store
+        """
+        try:
+            filePath = os.path.join(self.__workPath, "lazy-object-map-store.idx")
+            ok = IndexedObjectStore.write(filePath, self.__objectD)
+            self.assertTrue(ok)
+            oS = IndexedObjectStore(filePath)
+            oM = LazyObjectMap(None, "uniprot_exdb", "reference_entry", maxSize=10, batchSize=25, readAhead=False, localStore=oS)
+            self.assertEqual(len(oM), len(self.__objectD))
+            self.assertEqual(oM.getCounts()["fetched"], 0)
+            #
+            self.assertTrue("P00123" in oM)
+            self.assertFalse("Q99999" in oM)
+            self.assertEqual(oM["P00123"], self.__objectD["P00123"])
+            self.assertEqual(oM["P00123"], self.__objectD["P00123"])
+            self.assertEqual(oM.get("Q99999"), None)
+            with self.assertRaises(KeyError):
+                _ = oM["Q99999"]
+            cD = oM.getCounts()
+            self.assertEqual(cD["hits"], 1)
+            self.assertEqual(cD["fetched"], 1)
+            #
+            # Batched loading is bounded by the cache size
+            numLoad = oM.prefetch(["P%05d" % ii for ii in range(100)])
+            self.assertEqual(numLoad, 10)
+            self.assertEqual(oM.getCounts()["size"], 10)
+            self.assertEqual(oM["P00099"], self.__objectD["P00099"])
+            self.assertEqual(oM.getCounts()["hits"], 2)
+            #
+            # Streamed items are not cached
+            self.assertEqual(dict(oM.items()), self.__objectD)
+            self.assertEqual(oM.getCounts()["size"], 10)
+            oS.close()
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testReadAhead(self):
+        """ Test case - a cache miss loads a block of uncached objects following the requested key
+        """
+        try:
+            filePath = os.path.join(self.__workPath, "lazy-object-map-store.idx")
+            ok = IndexedObjectStore.write(filePath, self.__objectD)
+            self.assertTrue(ok)
+            oS = IndexedObjectStore(filePath)
+            oM = LazyObjectMap(None, "uniprot_exdb", "reference_entry", maxSize=40, batchSize=25, localStore=oS)
+            for ii in range(100, 150):
+                self.assertEqual(oM["P%05d" % ii], self.__objectD["P%05d" % ii])
+            cD = oM.getCounts()
+            self.assertEqual(cD["fetches"], 2)
+            self.assertEqual(cD["misses"], 2)
+            self.assertEqual(cD["hits"], 48)
+            self.assertEqual(cD["size"], 40)
+            #
+            # Read ahead skips cached objects and is bounded by the cache size
+            self.assertEqual(oM["P00149"], self.__objectD["P00149"])
+            self.assertEqual(oM["P00499"], self.__objectD["P00499"])
+            self.assertEqual(oM.getCounts()["fetched"], 51)
+            oS.close()
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def lazyObjectMapSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(LazyObjectMapTests("testLocalStoreAccess"))
+    suiteSelect.addTest(LazyObjectMapTests("testReadAhead"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = lazyObjectMapSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,171 @@
+##
+# File:    ObjectColumnarExporterTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+# 16-Oct-2026 jdw add inconsistent column type test
+# 16-Oct-2026 jdw add ObjectExtractor.exportColumnar() default path list test
+#
+##
+"""
+Tests for columnar (Parquet/Arrow) export of document objects.
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.ObjectColumnarExporter import ObjectColumnarExporter
+from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+
+try:
+    import pyarrow  # noqa: F401 pylint: disable=unused-import
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+@unittest.skipUnless(HAS_PYARROW, "Requires optional dependency pyarrow")
+class ObjectColumnarExporterTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output")
+        self.__objL = [
+            (
+                "%04d_1" % ii,
+                {
+                    "rcsb_id": "%04d_1" % ii,
+                    "entity_poly": {"rcsb_sample_sequence_length": 100 + ii},
+                    "rcsb_entity_source_organism": [{"ncbi_taxonomy_id": 9606}, {"ncbi_taxonomy_id": 10090 + ii}],
+                    "rcsb_polymer_entity_container_identifiers": {"auth_asym_ids": ["A", "B"][: 1 + ii % 2]},
+                },
+            )
+            for ii in range(25)
+        ]
+        self.__pathList = [
+            "rcsb_id",
+            "entity_poly.rcsb_sample_sequence_length",
+            "rcsb_entity_source_organism[].ncbi_taxonomy_id",
+            "rcsb_polymer_entity_container_identifiers.auth_asym_ids[]",
+        ]
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testExportParquet(self):
+        """ Test case - chunked Parquet export
+        """
+        try:
+            import pyarrow.parquet as pq
+
+            filePath = os.path.join(self.__workPath, "columnar-export.parquet")
+            ocE = ObjectColumnarExporter(self.__pathList)
+            ok, numRows = ocE.export(filePath, iter(self.__objL), fmt="parquet", rowGroupSize=10)
+            self.assertTrue(ok)
+            self.assertEqual(numRows, 25)
+            pF = pq.ParquetFile(filePath)
+            self.assertEqual(pF.metadata.num_row_groups, 3)
+            dD = pq.read_table(filePath).to_pydict()
+            self.assertEqual(dD["_key"][3], "0003_1")
+            self.assertEqual(dD["entity_poly.rcsb_sample_sequence_length"][24], 124)
+            self.assertEqual(dD["rcsb_entity_source_organism.ncbi_taxonomy_id"][2], [9606, 10092])
+            self.assertEqual(dD["rcsb_polymer_entity_container_identifiers.auth_asym_ids"][1], ["A", "B"])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExportArrow(self):
+        """ Test case - chunked Arrow IPC export
+        """
+        try:
+            import pyarrow as pa
+
+            filePath = os.path.join(self.__workPath, "columnar-export.arrow")
+            ocE = ObjectColumnarExporter(self.__pathList, keyColumnName="key", typeD={"entity_poly.rcsb_sample_sequence_length": pa.int32()})
+            ok, numRows = ocE.export(filePath, iter(self.__objL), fmt="arrow", rowGroupSize=10)
+            self.assertTrue(ok)
+            self.assertEqual(numRows, 25)
+            with pa.memory_map(filePath) as src:
+                rdr = pa.ipc.open_file(src)
+                self.assertEqual(rdr.num_record_batches, 3)
+                tab = rdr.read_all()
+            self.assertEqual(tab.schema.field("entity_poly.rcsb_sample_sequence_length").type, pa.int32())
+            self.assertEqual(tab.column("key").to_pylist()[0], "0000_1")
+            #
+            ok, numRows = ocE.export(filePath, iter([]), fmt="arrow")
+            self.assertFalse(ok)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExportInconsistentType(self):
+        """ Test case - fail the export for values inconsistent with a non-text column type
+        """
+        try:
+            filePath = os.path.join(self.__workPath, "columnar-export-inconsistent.parquet")
+            if os.access(filePath, os.W_OK):
+                os.remove(filePath)
+            objL = list(self.__objL)
+            objL[20][1]["entity_poly"]["rcsb_sample_sequence_length"] = "unknown"
+            ocE = ObjectColumnarExporter(self.__pathList)
+            ok, _ = ocE.export(filePath, iter(objL), fmt="parquet", rowGroupSize=10)
+            self.assertFalse(ok)
+            self.assertFalse(os.access(filePath, os.R_OK))
+            self.assertFalse(os.access(filePath + ".tmp", os.R_OK))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractorExportDefaultPathList(self):
+        """ Test case - ObjectExtractor.exportColumnar() exports only the leaf paths accumulated by genPathList()
+        """
+        try:
+            import pyarrow.parquet as pq
+
+            cacheFilePath = os.path.join(self.__workPath, "columnar-export-objects.pic")
+            filePath = os.path.join(self.__workPath, "columnar-export-default.parquet")
+            MarshalUtil().doExport(cacheFilePath, {"entity": dict(self.__objL)}, fmt="pickle")
+            obEx = ObjectExtractor(None, cacheFilePath=cacheFilePath, useCache=True, keyAttribute="entity", cacheKwargs={"fmt": "pickle"})
+            for _, obj in obEx.iterObjects():
+                obEx.genPathList(obj)
+            ok, numRows = obEx.exportColumnar(filePath, rowGroupSize=10)
+            self.assertTrue(ok)
+            self.assertEqual(numRows, 25)
+            colL = pq.read_schema(filePath).names
+            self.assertEqual(sorted(colL[1:]), sorted([pth.replace("[]", "") for pth in obEx.getPathList()]))
+            self.assertFalse("" in colL)
+            self.assertFalse("entity_poly" in colL)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def objectColumnarExporterSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ObjectColumnarExporterTests("testExportParquet"))
+    suiteSelect.addTest(ObjectColumnarExporterTests("testExportArrow"))
+    suiteSelect.addTest(ObjectColumnarExporterTests("testExportInconsistentType"))
+    suiteSelect.addTest(ObjectColumnarExporterTests("testExtractorExportDefaultPathList"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = objectColumnarExporterSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
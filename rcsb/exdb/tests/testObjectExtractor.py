@@ -4,7 +4,15 @@
 # Date:    25-Apr-2019
 #
 # Updates:
-#
+# 16-Oct-2026 jdw add batched identifier resolution test
+# 16-Oct-2026 jdw add streaming iterObjects() test
+# 16-Oct-2026 jdw add partitioned multiprocess extraction test
+# 16-Oct-2026 jdw add incremental cache test
+# 16-Oct-2026 jdw add indexed cache format test
+# 16-Oct-2026 jdw add JSON path walker test
+# 16-Oct-2026 jdw add leaf path filtering and path count tests
+# 16-Oct-2026 jdw add server-side unique value aggregation test
+# 16-Oct-2026 jdw add incremental cache high-water mark tie test
 ##
 """
 Tests for extractor selected values from collections (limited tests from mock-data repos)
@@ -24,9 +32,11 @@ import time
 import unittest
 from collections import defaultdict
 
+from bson.objectid import ObjectId
 from rcsb.db.mongo.Connection import Connection
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.utils.config.ConfigUtil import ConfigUtil
+from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.io.TimeUtil import TimeUtil
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
@@ -136,6 +146,196 @@ class ObjectExtractorTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testExtractEntriesBatched(self):
+        """ Test case - extract entries resolving identifiers in batches
+
+        """
+        try:
+            rD = {}
+            for fetchBatchSize in [1, 3, 100]:
+                obEx = ObjectExtractor(
+                    self.__cfgOb,
+                    databaseName="pdbx_core",
+                    collectionName="pdbx_core_entry",
+                    useCache=False,
+                    keyAttribute="entry",
+                    uniqueAttributes=["rcsb_id"],
+                    objectLimit=self.__objectLimitTest,
+                    fetchBatchSize=fetchBatchSize,
+                )
+                self.assertEqual(obEx.getCount(), self.__objectLimitTest)
+                rD[fetchBatchSize] = list(obEx.getObjects().keys())
+            self.assertEqual(rD[1], rD[3])
+            self.assertEqual(rD[1], rD[100])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testIterEntities(self):
+        """ Test case - stream selected entity content
+
+        """
+        try:
+            kwargs = {
+                "databaseName": "pdbx_core",
+                "collectionName": "pdbx_core_polymer_entity",
+                "useCache": False,
+                "keyAttribute": "entity",
+                "uniqueAttributes": ["rcsb_id"],
+                "objectLimit": self.__objectLimitTest,
+                "selectionQuery": {"entity_poly.rcsb_entity_polymer_type": "Protein"},
+                "selectionList": ["rcsb_id", "rcsb_polymer_entity_container_identifiers"],
+            }
+            obEx = ObjectExtractor(self.__cfgOb, **kwargs)
+            iD = {ky: obj for ky, obj in obEx.iterObjects()}
+            self.assertEqual(len(iD), self.__objectLimitTest)
+            for obj in iD.values():
+                self.assertTrue("_id" not in obj)
+                self.assertTrue("rcsb_polymer_entity_container_identifiers" in obj)
+            #
+            obEx = ObjectExtractor(self.__cfgOb, **kwargs)
+            self.assertEqual(iD, obEx.getObjects())
+            self.assertEqual(len(list(obEx.iterObjects())), self.__objectLimitTest)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractEntitiesPartitioned(self):
+        """ Test case - extract selected entity content in parallel identifier range partitions
+
+        """
+        try:
+            kwargs = {
+                "databaseName": "pdbx_core",
+                "collectionName": "pdbx_core_polymer_entity",
+                "useCache": False,
+                "keyAttribute": "entity",
+                "uniqueAttributes": ["rcsb_id"],
+                "selectionQuery": {"entity_poly.rcsb_entity_polymer_type": "Protein"},
+                "selectionList": ["rcsb_id", "rcsb_polymer_entity_container_identifiers"],
+            }
+            obEx = ObjectExtractor(self.__cfgOb, **kwargs)
+            objD = obEx.getObjects()
+            self.assertGreaterEqual(len(objD), self.__objectLimitTest)
+            #
+            obEx = ObjectExtractor(self.__cfgOb, numProc=2, numPartitions=4, **kwargs)
+            self.assertEqual(obEx.getObjects(), objD)
+            #
+            obEx = ObjectExtractor(self.__cfgOb, numProc=2, objectLimit=self.__objectLimitTest, **kwargs)
+            self.assertEqual(obEx.getCount(), self.__objectLimitTest)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractEntitiesIncremental(self):
+        """ Test case - extract selected entity content maintaining an incremental cache
+
+        """
+        try:
+            kwargs = {
+                "databaseName": "pdbx_core",
+                "collectionName": "pdbx_core_polymer_entity",
+                "cacheFilePath": os.path.join(self.__workPath, "entity-incremental-test-cache.pic"),
+                "cacheKwargs": {"fmt": "pickle"},
+                "keyAttribute": "entity",
+                "uniqueAttributes": ["rcsb_id"],
+                "selectionQuery": {"entity_poly.rcsb_entity_polymer_type": "Protein"},
+                "selectionList": ["rcsb_id", "rcsb_polymer_entity_container_identifiers"],
+                "incrementalCache": True,
+            }
+            obEx = ObjectExtractor(self.__cfgOb, useCache=False, **kwargs)
+            objD = obEx.getObjects()
+            self.assertGreaterEqual(len(objD), self.__objectLimitTest)
+            #
+            # Simulate a stale cache with an obsolete object and a missing object tied with the high-water mark
+            mU = MarshalUtil()
+            cD = mU.doImport(kwargs["cacheFilePath"], fmt="pickle")
+            self.assertTrue("incrementalMark" in cD)
+            cD["entity"]["OBSOLETE_1"] = {"rcsb_id": "OBSOLETE_1"}
+            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+                dD = client["pdbx_core"]["pdbx_core_polymer_entity"].find_one({"_id": ObjectId(cD["incrementalMark"]["value"])})
+            del cD["entity"][dD["rcsb_id"]]
+            mU.doExport(kwargs["cacheFilePath"], cD, fmt="pickle")
+            #
+            obEx = ObjectExtractor(self.__cfgOb, useCache=True, **kwargs)
+            self.assertEqual(obEx.getObjects(), objD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractEntitiesIndexedCache(self):
+        """ Test case - extract selected entity content with a random-access indexed cache
+
+        """
+        try:
+            kwargs = {
+                "databaseName": "pdbx_core",
+                "collectionName": "pdbx_core_polymer_entity",
+                "cacheFilePath": os.path.join(self.__workPath, "entity-indexed-test-cache.idx"),
+                "cacheKwargs": {"fmt": "indexed"},
+                "keyAttribute": "entity",
+                "uniqueAttributes": ["rcsb_id"],
+                "selectionList": ["rcsb_id", "rcsb_polymer_entity_container_identifiers"],
+            }
+            obEx = ObjectExtractor(self.__cfgOb, useCache=False, **kwargs)
+            objD = obEx.getObjects()
+            self.assertGreaterEqual(len(objD), self.__objectLimitTest)
+            #
+            obEx = ObjectExtractor(self.__cfgOb, useCache=True, **kwargs)
+            self.assertEqual(obEx.getCount(), len(objD))
+            for ky in list(objD.keys())[: self.__objectLimitTest]:
+                self.assertEqual(obEx.getObjects()[ky], objD[ky])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testPathWalker(self):
+        """ Test case - JSON path and value accumulation
+
+        """
+        try:
+            obj = {
+                "rcsb_id": "1ABC_1",
+                "entity_poly": {"type": "polypeptide(L)"},
+                "rcsb_entity_source_organism": [{"ncbi_taxonomy_id": 9606, "ncbi_scientific_name": "Homo sapiens"}, {"ncbi_taxonomy_id": 10090}],
+                "rcsb_polymer_entity_container_identifiers": {"auth_asym_ids": ["A", "B"]},
+            }
+            obEx = ObjectExtractor(self.__cfgOb)
+            self.assertEqual(obEx.genPathList(obj), obj)
+            obEx.genPathList(obj)
+            pL = obEx.getPathList(filterList=False)
+            self.assertTrue("rcsb_entity_source_organism[].ncbi_taxonomy_id" in pL)
+            self.assertTrue("rcsb_polymer_entity_container_identifiers.auth_asym_ids[]" in pL)
+            pL = obEx.getPathList(filterList=True)
+            self.assertEqual(
+                pL,
+                [
+                    "entity_poly.type",
+                    "rcsb_entity_source_organism[].ncbi_scientific_name",
+                    "rcsb_entity_source_organism[].ncbi_taxonomy_id",
+                    "rcsb_polymer_entity_container_identifiers.auth_asym_ids",
+                ],
+            )
+            cD = obEx.getPathCounts()
+            self.assertEqual(sorted(cD.keys()), pL)
+            self.assertEqual(cD["entity_poly.type"], 2)
+            self.assertEqual(cD["rcsb_entity_source_organism[].ncbi_taxonomy_id"], 4)
+            self.assertEqual(obEx.getPathCounts(filterList=False)["rcsb_entity_source_organism[]"], 4)
+            #
+            obEx.setPathList(pL)
+            obEx.genValueList(obj)
+            vD = obEx.getValues()
+            self.assertEqual(vD["rcsb_entity_source_organism.ncbi_taxonomy_id"], [9606, 10090])
+            self.assertEqual(vD["rcsb_polymer_entity_container_identifiers.auth_asym_ids"], ["A", "B"])
+            self.assertEqual(vD["entity_poly.type"], "polypeptide(L)")
+            #
+            obEx.setPathList(["software[].name"])
+            obEx.genValueList([{"name": "REFMAC"}, {"name": "PHENIX"}], path=["software"])
+            self.assertEqual(obEx.getValues(), {"software.name": ["REFMAC", "PHENIX"]})
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
     def testExtractEntities(self):
         """ Test case - extract entities
 
@@ -308,11 +508,51 @@ class ObjectExtractorTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testExtractDistinctValues(self):
+        """ Test case - server-side unique value aggregation is consistent with client-side extraction
+        """
+        try:
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                useCache=False,
+                uniqueAttributes=["rcsb_id"],
+                selectionQuery=None,
+                selectionList=["rcsb_id", "rcsb_entity_source_organism.ncbi_taxonomy_id", "rcsb_polymer_entity_annotation"],
+            )
+            taxIdS = set()
+            goIdS = set()
+            for _, eD in obEx.iterObjects():
+                for tD in eD.get("rcsb_entity_source_organism", []):
+                    if "ncbi_taxonomy_id" in tD:
+                        taxIdS.add(tD["ncbi_taxonomy_id"])
+                for tD in eD.get("rcsb_polymer_entity_annotation", []):
+                    if tD["type"] == "GO" and "annotation_id" in tD:
+                        goIdS.add(tD["annotation_id"])
+            taxIdL = obEx.getDistinctValues("rcsb_entity_source_organism[].ncbi_taxonomy_id")
+            self.assertGreater(len(taxIdL), 0)
+            self.assertEqual(set(taxIdL), taxIdS)
+            goIdL = obEx.getDistinctValues("rcsb_polymer_entity_annotation[].annotation_id", elementQuery={"rcsb_polymer_entity_annotation.type": "GO"})
+            self.assertEqual(len(goIdL), len(goIdS))
+            self.assertEqual(set(goIdL), goIdS)
+            logger.info("Unique taxons %d GO identifiers %d", len(taxIdL), len(goIdL))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def objectExtractorSuite():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(ObjectExtractorTests("testExtractEntries"))
+    suiteSelect.addTest(ObjectExtractorTests("testExtractEntriesBatched"))
     suiteSelect.addTest(ObjectExtractorTests("testExtractEntities"))
+    suiteSelect.addTest(ObjectExtractorTests("testIterEntities"))
+    suiteSelect.addTest(ObjectExtractorTests("testExtractEntitiesPartitioned"))
+    suiteSelect.addTest(ObjectExtractorTests("testExtractEntitiesIncremental"))
+    suiteSelect.addTest(ObjectExtractorTests("testExtractEntitiesIndexedCache"))
+    suiteSelect.addTest(ObjectExtractorTests("testPathWalker"))
+    suiteSelect.addTest(ObjectExtractorTests("testExtractDistinctValues"))
     suiteSelect.addTest(ObjectExtractorTests("testExtractSelectedEntityContent"))
     return suiteSelect
 
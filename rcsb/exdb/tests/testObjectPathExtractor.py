@@ -0,0 +1,130 @@
+##
+# File:    ObjectPathExtractorTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+# 16-Oct-2026 jdw add test for the default compiled path list
+#
+##
+"""
+Tests for compiled path value extraction from document objects.
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
+from rcsb.exdb.utils.ObjectPathExtractor import ObjectPathExtractor
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class ObjectPathExtractorTests(unittest.TestCase):
+    def setUp(self):
+        self.__objL = [
+            {
+                "rcsb_id": "1ABC_1",
+                "entity_poly": {"type": "polypeptide(L)", "rcsb_sample_sequence_length": 129},
+                "rcsb_entity_source_organism": [{"ncbi_taxonomy_id": 9606, "ncbi_scientific_name": "Homo sapiens"}, {"ncbi_taxonomy_id": 10090}],
+                "rcsb_polymer_entity_container_identifiers": {"auth_asym_ids": ["A", "B"], "entry_id": "1ABC"},
+            },
+            {
+                "rcsb_id": "2XYZ_2",
+                "entity_poly": {"type": "polyribonucleotide"},
+                "rcsb_polymer_entity_container_identifiers": {"auth_asym_ids": ["C"], "entry_id": "2XYZ"},
+            },
+        ]
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testCompiledValues(self):
+        """ Test case - compiled path values are consistent with ObjectExtractor.genValueList()
+        """
+        try:
+            obEx = ObjectExtractor(None)
+            for obj in self.__objL:
+                obEx.genPathList(obj)
+            for pL in [obEx.getPathList(filterList=True), obEx.getPathList(filterList=False), ["rcsb_entity_source_organism[].ncbi_taxonomy_id"]]:
+                obEx.setPathList(pL)
+                pE = obEx.compilePathList()
+                for obj in self.__objL:
+                    obEx.genValueList(obj)
+                    self.assertEqual(pE.getValues(obj), obEx.getValues())
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testCompiledDefaultPathList(self):
+        """ Test case - compiled default path list is limited to the leaf paths accumulated by genPathList()
+        """
+        try:
+            obEx = ObjectExtractor(None)
+            for obj in self.__objL:
+                obEx.genPathList(obj)
+            pE = obEx.compilePathList()
+            self.assertEqual(pE.getKeys(), [pth.replace("[]", "") for pth in obEx.getPathList()])
+            self.assertFalse("" in pE.getKeys())
+            self.assertFalse("entity_poly" in pE.getKeys())
+            vD = pE.getValues(self.__objL[0])
+            self.assertEqual(vD["entity_poly.rcsb_sample_sequence_length"], 129)
+            self.assertTrue(all([not isinstance(val, dict) for val in vD.values()]))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testCompiledColumns(self):
+        """ Test case - columnar path values
+        """
+        try:
+            pL = [
+                "rcsb_id",
+                "entity_poly.rcsb_sample_sequence_length",
+                "rcsb_entity_source_organism[].ncbi_taxonomy_id",
+                "rcsb_polymer_entity_container_identifiers.auth_asym_ids[]",
+            ]
+            pE = ObjectPathExtractor(pL)
+            self.assertEqual(
+                pE.getKeys(),
+                ["rcsb_id", "entity_poly.rcsb_sample_sequence_length", "rcsb_entity_source_organism.ncbi_taxonomy_id", "rcsb_polymer_entity_container_identifiers.auth_asym_ids"],
+            )
+            colD = pE.getColumns(iter(self.__objL))
+            self.assertEqual(colD["rcsb_id"], ["1ABC_1", "2XYZ_2"])
+            self.assertEqual(colD["entity_poly.rcsb_sample_sequence_length"], [129, None])
+            self.assertEqual(colD["rcsb_entity_source_organism.ncbi_taxonomy_id"], [[9606, 10090], None])
+            self.assertEqual(colD["rcsb_polymer_entity_container_identifiers.auth_asym_ids"], [["A", "B"], ["C"]])
+            #
+            colD = pE.getColumns(self.__objL, useNumpy=True)
+            self.assertEqual(colD["rcsb_id"].shape, (2,))
+            self.assertEqual(list(colD["rcsb_polymer_entity_container_identifiers.auth_asym_ids"][1]), ["C"])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def objectPathExtractorSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ObjectPathExtractorTests("testCompiledValues"))
+    suiteSelect.addTest(ObjectPathExtractorTests("testCompiledDefaultPathList"))
+    suiteSelect.addTest(ObjectPathExtractorTests("testCompiledColumns"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = objectPathExtractorSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
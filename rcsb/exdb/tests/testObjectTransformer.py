@@ -4,6 +4,10 @@
 # Date:    25-Apr-2019
 #
 # Updates:
+# 16-Oct-2026 jdw add parallel transform test
+# 16-Oct-2026 jdw add checkpoint/resume transform test
+# 16-Oct-2026 jdw add skip unchanged transform test
+# 16-Oct-2026 jdw restore the transformed fixture documents after each test
 #
 ##
 """
@@ -20,6 +24,9 @@ import os
 import time
 import unittest
 
+from rcsb.db.mongo.Connection import Connection
+from rcsb.exdb.utils.ObjectAdapterBase import ObjectAdapterBase
+from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.exdb.utils.ObjectTransformer import ObjectTransformer
 from rcsb.utils.config.ConfigUtil import ConfigUtil
 
@@ -30,6 +37,28 @@ HERE = os.path.abspath(os.path.dirname(__file__))
 TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
 
 
+class MarkAdapter(ObjectAdapterBase):
+    """Test adapter marking each object with the identifier of its entry (optionally failing after failAfter objects)."""
+
+    def __init__(self, failAfter=None):
+        self.count = 0
+        self.__failAfter = failAfter
+
+    def filter(self, obj, **kwargs):
+        if self.__failAfter is not None and self.count >= self.__failAfter:
+            raise ValueError("Simulated transform failure")
+        self.count += 1
+        obj["test_transform_mark"] = obj["rcsb_id"].split("_")[0] if "rcsb_id" in obj else None
+        return True, obj
+
+
+class ReorderAdapter(ObjectAdapterBase):
+    """Test adapter returning each object with its content unchanged and its keys reordered."""
+
+    def filter(self, obj, **kwargs):
+        return True, {ky: obj[ky] for ky in reversed(list(obj.keys()))}
+
+
 class ObjectTransformerTests(unittest.TestCase):
     def __init__(self, methodName="runTest"):
         super(ObjectTransformerTests, self).__init__(methodName)
@@ -45,10 +74,21 @@ class ObjectTransformerTests(unittest.TestCase):
         #
         self.__fetchLimit = 5
         #
+        # The test adapters modify the selected documents so these are restored in tearDown()
+        self.__databaseName = "pdbx_core"
+        self.__collectionName = "pdbx_core_polymer_entity"
+        self.__selectionQuery = {"entity_poly.rcsb_entity_polymer_type": "Protein"}
+        with Connection(cfgOb=self.__cfgOb, resourceName="MONGO_DB") as client:
+            self.__savedDocL = list(client[self.__databaseName][self.__collectionName].find(self.__selectionQuery))
+        #
         self.__startTime = time.time()
         logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
 
     def tearDown(self):
+        with Connection(cfgOb=self.__cfgOb, resourceName="MONGO_DB") as client:
+            clt = client[self.__databaseName][self.__collectionName]
+            for dD in self.__savedDocL:
+                clt.replace_one({"_id": dD["_id"]}, dD)
         endTime = time.time()
         logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
 
@@ -67,10 +107,106 @@ class ObjectTransformerTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testTransformEntityProteinContentParallel(self):
+        """ Test case - transform selected entity protein documents with multiple worker processes
+        """
+        try:
+            databaseName = "pdbx_core"
+            collectionName = "pdbx_core_polymer_entity"
+            obTr = ObjectTransformer(self.__cfgOb, objectAdapter=MarkAdapter())
+            ok = obTr.doTransform(
+                databaseName=databaseName,
+                collectionName=collectionName,
+                selectionQuery={"entity_poly.rcsb_entity_polymer_type": "Protein"},
+                numProc=2,
+                chunkSize=5,
+                fetchBatchSize=4,
+                writeBatchSize=3,
+            )
+            self.assertTrue(ok)
+            #
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName=databaseName,
+                collectionName=collectionName,
+                useCache=False,
+                keyAttribute="entity",
+                uniqueAttributes=["rcsb_id"],
+                selectionQuery={"entity_poly.rcsb_entity_polymer_type": "Protein"},
+                selectionList=["rcsb_id", "test_transform_mark"],
+            )
+            objD = obEx.getObjects()
+            self.assertGreater(len(objD), 0)
+            for rcsbId, obj in objD.items():
+                self.assertEqual(obj.get("test_transform_mark", None), rcsbId.split("_")[0])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testTransformResume(self):
+        """ Test case - resume an interrupted transform from its checkpoint
+        """
+        try:
+            databaseName = "pdbx_core"
+            collectionName = "pdbx_core_polymer_entity"
+            updateId = "2026_42_resume_test"
+            qD = {"entity_poly.rcsb_entity_polymer_type": "Protein"}
+            # Interrupted run ...
+            mA = MarkAdapter(failAfter=self.__fetchLimit)
+            obTr = ObjectTransformer(self.__cfgOb, objectAdapter=mA)
+            ok = obTr.doTransform(databaseName=databaseName, collectionName=collectionName, selectionQuery=qD, updateId=updateId, checkpoint=True)
+            self.assertFalse(ok)
+            self.assertEqual(mA.count, self.__fetchLimit)
+            # Resumed run skips the committed objects ...
+            mA = MarkAdapter()
+            obTr = ObjectTransformer(self.__cfgOb, objectAdapter=mA)
+            ok = obTr.doTransform(databaseName=databaseName, collectionName=collectionName, selectionQuery=qD, updateId=updateId, resume=True)
+            self.assertTrue(ok)
+            numObj = mA.count + self.__fetchLimit
+            # Completed update cycle ...
+            mA = MarkAdapter()
+            obTr = ObjectTransformer(self.__cfgOb, objectAdapter=mA)
+            ok = obTr.doTransform(databaseName=databaseName, collectionName=collectionName, selectionQuery=qD, updateId=updateId, resume=True)
+            self.assertTrue(ok)
+            self.assertEqual(mA.count, 0)
+            # New run clears the checkpoint ...
+            ok = obTr.doTransform(databaseName=databaseName, collectionName=collectionName, selectionQuery=qD, updateId=updateId, checkpoint=True)
+            self.assertTrue(ok)
+            self.assertEqual(mA.count, numObj)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testTransformSkipUnchanged(self):
+        """ Test case - skip replacing objects unchanged by the object adapter
+        """
+        try:
+            databaseName = "pdbx_core"
+            collectionName = "pdbx_core_polymer_entity"
+            qD = {"entity_poly.rcsb_entity_polymer_type": "Protein"}
+            obTr = ObjectTransformer(self.__cfgOb, objectAdapter=MarkAdapter())
+            ok = obTr.doTransform(databaseName=databaseName, collectionName=collectionName, fetchLimit=self.__fetchLimit, selectionQuery=qD)
+            self.assertTrue(ok)
+            #
+            obTr = ObjectTransformer(self.__cfgOb, objectAdapter=ReorderAdapter())
+            for numProc in [1, 2]:
+                ok = obTr.doTransform(databaseName=databaseName, collectionName=collectionName, fetchLimit=self.__fetchLimit, selectionQuery=qD, numProc=numProc)
+                self.assertTrue(ok)
+                self.assertEqual(obTr.getLoadStatus()[-1]["update_skipped_count"], self.__fetchLimit)
+            ok = obTr.doTransform(databaseName=databaseName, collectionName=collectionName, fetchLimit=self.__fetchLimit, selectionQuery=qD, skipUnchanged=False)
+            self.assertTrue(ok)
+            self.assertEqual(obTr.getLoadStatus()[-1]["update_skipped_count"], 0)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def objectTransformerSuite():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(ObjectTransformerTests("testTransformEntityProteinContent"))
+    suiteSelect.addTest(ObjectTransformerTests("testTransformEntityProteinContentParallel"))
+    suiteSelect.addTest(ObjectTransformerTests("testTransformResume"))
+    suiteSelect.addTest(ObjectTransformerTests("testTransformSkipUnchanged"))
     return suiteSelect
 
 
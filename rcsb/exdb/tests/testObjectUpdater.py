@@ -4,7 +4,9 @@
 # Date:    25-Apr-2019
 #
 # Updates:
-#
+# 16-Oct-2026 jdw add bulk upsert test
+# 16-Oct-2026 jdw add change-only update test
+# 16-Oct-2026 jdw add chunked identifier deletion test
 ##
 """
 Tests for extractor and updater or selected values from collections (limited tests from mock-data repos)
@@ -15,6 +17,7 @@ __author__ = "John Westbrook"
 __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
+import datetime
 import logging
 import os
 import time
@@ -104,10 +107,107 @@ class ObjectUpdaterTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testBulkUpdate(self):
+        """ Test case - unordered bulk upserts with matched/upserted/modified counts
+        """
+        try:
+            databaseName = "test_exdb"
+            collectionName = "test_bulk_update"
+            obUpd = ObjectUpdater(self.__cfgOb)
+            obUpd.delete(databaseName, collectionName, {})
+            ok = obUpd.createCollection(databaseName, collectionName, indexAttributeNames=["rcsb_id"], checkExists=True)
+            self.assertTrue(ok)
+            updateDL = [{"selectD": {"rcsb_id": "ID_%04d" % ii}, "updateD": {"rcsb_id": "ID_%04d" % ii, "value": ii}} for ii in range(120)]
+            cD = obUpd.bulkUpdate(databaseName, collectionName, updateDL, batchSize=50)
+            self.assertEqual(cD["upserted"], 120)
+            self.assertEqual(cD["matched"], 0)
+            self.assertEqual(obUpd.count(databaseName, collectionName), 120)
+            #
+            for ii, uD in enumerate(updateDL):
+                if ii % 2:
+                    uD["updateD"]["value"] = -ii
+            cD = obUpd.bulkUpdate(databaseName, collectionName, updateDL, batchSize=50)
+            self.assertEqual(cD["matched"], 120)
+            self.assertEqual(cD["modified"], 60)
+            self.assertEqual(cD["upserted"], 0)
+            numUpd = obUpd.update(databaseName, collectionName, updateDL[:10], bulk=True)
+            self.assertEqual(numUpd, 0)
+            logger.info("Bulk update counts %r", cD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testChangeOnlyUpdate(self):
+        """ Test case - change-only updates skip unchanged documents and write $set/$unset differences
+        """
+        try:
+            databaseName = "test_exdb"
+            collectionName = "test_change_update"
+            obUpd = ObjectUpdater(self.__cfgOb)
+            obUpd.delete(databaseName, collectionName, {})
+            ok = obUpd.createCollection(databaseName, collectionName, indexAttributeNames=["rcsb_id"], checkExists=True)
+            self.assertTrue(ok)
+            tS = datetime.datetime(2026, 1, 1)
+            updateDL = [
+                {"selectD": {"rcsb_id": "ID_%04d" % ii}, "updateD": {"rcsb_id": "ID_%04d" % ii, "value": ii, "nested": {"a": ii, "b": [1, 2]}, "rcsb_last_update": tS}}
+                for ii in range(20)
+            ]
+            cD = obUpd.bulkUpdate(databaseName, collectionName, updateDL, changeOnly=True)
+            self.assertEqual(cD["upserted"], 20)
+            #
+            for uD in updateDL:
+                uD["updateD"]["rcsb_last_update"] = tS + datetime.timedelta(days=1)
+            cD = obUpd.bulkUpdate(databaseName, collectionName, updateDL, changeOnly=True)
+            self.assertEqual(cD["skipped"], 20)
+            self.assertEqual(cD["modified"], 0)
+            #
+            updateDL[0]["updateD"]["nested"] = {"a": -1}
+            cD = obUpd.bulkUpdate(databaseName, collectionName, updateDL, changeOnly=True)
+            self.assertEqual(cD["skipped"], 19)
+            self.assertEqual(cD["modified"], 1)
+            obEx = ObjectExtractor(self.__cfgOb, databaseName=databaseName, collectionName=collectionName, useCache=False, selectionQuery={"rcsb_id": "ID_0000"})
+            objD = obEx.getObjects()
+            self.assertEqual(objD["ID_0000"]["nested"], {"a": -1})
+            self.assertEqual(objD["ID_0000"]["rcsb_last_update"], tS + datetime.timedelta(days=1))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testChunkedDelete(self):
+        """ Test case - chunked deletion of identifier collections with a size guard
+        """
+        try:
+            databaseName = "test_exdb"
+            collectionName = "test_chunked_delete"
+            obUpd = ObjectUpdater(self.__cfgOb)
+            obUpd.delete(databaseName, collectionName, {})
+            ok = obUpd.createCollection(databaseName, collectionName, indexAttributeNames=["rcsb_id"], checkExists=True)
+            self.assertTrue(ok)
+            updateDL = [{"selectD": {"rcsb_id": "ID_%04d" % ii}, "updateD": {"rcsb_id": "ID_%04d" % ii, "value": ii}} for ii in range(100)]
+            obUpd.update(databaseName, collectionName, updateDL, bulk=True)
+            #
+            idL = ["ID_%04d" % ii for ii in range(0, 60, 2)] + ["ID_9999"]
+            numDel = obUpd.delete(databaseName, collectionName, {"rcsb_id": idL}, chunkSize=7)
+            self.assertEqual(numDel, 30)
+            self.assertEqual(obUpd.count(databaseName, collectionName), 70)
+            #
+            idL = ["ID_%04d" % ii for ii in range(1, 60, 2)]
+            numDel = obUpd.delete(databaseName, collectionName, {"rcsb_id": idL}, chunkSize=7, maxFraction=0.25)
+            self.assertEqual(numDel, 0)
+            self.assertEqual(obUpd.count(databaseName, collectionName), 70)
+            numDel = obUpd.delete(databaseName, collectionName, {"rcsb_id": set(idL), "value": {"$lt": 11}}, chunkSize=7, maxFraction=0.5)
+            self.assertEqual(numDel, 5)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def objectUpdaterSuite():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(ObjectUpdaterTests("testUpdateSelectedEntityContent"))
+    suiteSelect.addTest(ObjectUpdaterTests("testBulkUpdate"))
+    suiteSelect.addTest(ObjectUpdaterTests("testChangeOnlyUpdate"))
+    suiteSelect.addTest(ObjectUpdaterTests("testChunkedDelete"))
     return suiteSelect
 
 
@@ -0,0 +1,103 @@
+##
+# File:    ObjectUpdaterQueueTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+# 16-Oct-2026 jdw add failed chunk reporting test
+#
+##
+"""
+Tests for write-behind chunk saves using ObjectUpdater().
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.exdb.utils.ObjectUpdaterQueue import ObjectUpdaterQueue
+from rcsb.utils.config.ConfigUtil import ConfigUtil
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class ObjectUpdaterQueueTests(unittest.TestCase):
+    def setUp(self):
+        #
+        self.__mockTopPath = os.path.join(TOPDIR, "rcsb", "mock-data")
+        configPath = os.path.join(TOPDIR, "rcsb", "mock-data", "config", "dbload-setup-example.yml")
+        configName = "site_info_configuration"
+        self.__cfgOb = ConfigUtil(configPath=configPath, defaultSectionName=configName, mockTopPath=self.__mockTopPath)
+        self.__databaseName = "test_exdb"
+        self.__collectionName = "test_updater_queue"
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testWriteBehindChunks(self):
+        """ Test case - chunks saved in a background thread are flushed on exit
+        """
+        try:
+            obUpd = ObjectUpdater(self.__cfgOb)
+            obUpd.delete(self.__databaseName, self.__collectionName, {})
+            ok = obUpd.createCollection(self.__databaseName, self.__collectionName, indexAttributeNames=["rcsb_id"], checkExists=True)
+            self.assertTrue(ok)
+            with ObjectUpdaterQueue(self.__cfgOb, maxQueueSize=1, bulk=True) as uQ:
+                for ii in range(10):
+                    updateDL = [{"selectD": {"rcsb_id": "ID_%02d_%02d" % (ii, jj)}, "updateD": {"rcsb_id": "ID_%02d_%02d" % (ii, jj), "value": jj}} for jj in range(25)]
+                    uQ.put(self.__databaseName, self.__collectionName, updateDL)
+                uQ.flush()
+                self.assertEqual(obUpd.count(self.__databaseName, self.__collectionName), 250)
+                uQ.put(self.__databaseName, self.__collectionName, [{"selectD": {"rcsb_id": "ID_LAST"}, "updateD": {"rcsb_id": "ID_LAST"}}])
+            cD = uQ.getCounts()
+            self.assertEqual(cD["chunks"], 11)
+            self.assertEqual(cD["updated"], 251)
+            self.assertEqual(cD["errors"], 0)
+            self.assertEqual(obUpd.count(self.__databaseName, self.__collectionName), 251)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testFailedChunks(self):
+        """ Test case - chunks with unsaved items are reported by tag
+        """
+        try:
+            obUpd = ObjectUpdater(self.__cfgOb)
+            ok = obUpd.createCollection(self.__databaseName, self.__collectionName, indexAttributeNames=["rcsb_id"], checkExists=True)
+            self.assertTrue(ok)
+            with ObjectUpdaterQueue(self.__cfgOb, changeOnly=True) as uQ:
+                for ii in range(3):
+                    updateDL = [{"selectD": {"rcsb_id": "ID_F%02d" % ii}, "updateD": {"rcsb_id": "ID_F%02d" % ii}}]
+                    # Chunk 1 targets a missing collection
+                    uQ.put(self.__databaseName, self.__collectionName if ii != 1 else "missing_collection", updateDL, tag=ii)
+            self.assertEqual(uQ.getCounts()["errors"], 1)
+            self.assertEqual(uQ.getFailedTags(), [1])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def objectUpdaterQueueSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ObjectUpdaterQueueTests("testWriteBehindChunks"))
+    suiteSelect.addTest(ObjectUpdaterQueueTests("testFailedChunks"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = objectUpdaterQueueSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
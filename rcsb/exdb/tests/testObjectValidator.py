@@ -0,0 +1,144 @@
+##
+# File:    ObjectValidatorTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+# 16-Oct-2026 jdw restore the transformed fixture documents after each test and check unsampled objects are transformed
+#
+##
+"""
+Tests for sampled and parallel validation of transformed collection objects (limited tests from mock-data repos)
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.db.mongo.Connection import Connection
+from rcsb.exdb.utils.ObjectAdapterBase import ObjectAdapterBase
+from rcsb.exdb.utils.ObjectValidator import ObjectValidator
+from rcsb.utils.config.ConfigUtil import ConfigUtil
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class InvalidAttributeAdapter(ObjectAdapterBase):
+    """Test adapter setting an attribute value inconsistent with the collection schema."""
+
+    def filter(self, obj, **kwargs):
+        if "entity_poly" in obj:
+            obj["entity_poly"]["rcsb_sample_sequence_length"] = "not-an-integer"
+        return True, obj
+
+
+class ObjectValidatorTests(unittest.TestCase):
+    def __init__(self, methodName="runTest"):
+        super(ObjectValidatorTests, self).__init__(methodName)
+        self.__verbose = True
+
+    def setUp(self):
+        #
+        self.__mockTopPath = os.path.join(TOPDIR, "rcsb", "mock-data")
+        configPath = os.path.join(TOPDIR, "rcsb", "mock-data", "config", "dbload-setup-example.yml")
+        #
+        configName = "site_info_configuration"
+        self.__cfgOb = ConfigUtil(configPath=configPath, defaultSectionName=configName, mockTopPath=self.__mockTopPath)
+        self.__cachePath = os.path.join(TOPDIR, "CACHE")
+        self.__workPath = os.path.join(HERE, "test-output")
+        #
+        # The test adapter modifies the selected documents so these are restored in tearDown()
+        self.__databaseName = "pdbx_core"
+        self.__collectionName = "pdbx_core_polymer_entity"
+        self.__selectionQuery = {"entity_poly.rcsb_entity_polymer_type": "Protein"}
+        with Connection(cfgOb=self.__cfgOb, resourceName="MONGO_DB") as client:
+            self.__savedDocL = list(client[self.__databaseName][self.__collectionName].find(self.__selectionQuery))
+        #
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        with Connection(cfgOb=self.__cfgOb, resourceName="MONGO_DB") as client:
+            clt = client[self.__databaseName][self.__collectionName]
+            for dD in self.__savedDocL:
+                clt.replace_one({"_id": dD["_id"]}, dD)
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def __getTransformedCount(self):
+        with Connection(cfgOb=self.__cfgOb, resourceName="MONGO_DB") as client:
+            return client[self.__databaseName][self.__collectionName].count_documents({"entity_poly.rcsb_sample_sequence_length": "not-an-integer"})
+
+    def testValidateSampled(self):
+        """ Test case - validate a stratified sample of transformed entity protein documents
+        """
+        try:
+            obVal = ObjectValidator(self.__cfgOb, objectAdapter=InvalidAttributeAdapter(), cachePath=self.__cachePath, useCache=True)
+            summaryFilePath = os.path.join(self.__workPath, "validation-summary.json")
+            ok = obVal.doTransform(
+                databaseName=self.__databaseName,
+                collectionName=self.__collectionName,
+                selectionQuery=self.__selectionQuery,
+                sampleSize=4,
+                sampleSeed=1,
+                validateOriginal=False,
+                summaryFilePath=summaryFilePath,
+            )
+            self.assertTrue(ok)
+            sD = obVal.getValidationSummary()
+            self.assertEqual(sD["validated_count"], 4)
+            self.assertGreaterEqual(sD["selected_count"], 4)
+            pD = {(tD["label"], tD["path"]): tD["count"] for tD in sD["path_errors"]}
+            self.assertEqual(pD[("Updated", "entity_poly.rcsb_sample_sequence_length")], 4)
+            self.assertTrue(os.access(summaryFilePath, os.R_OK))
+            # All selected objects are transformed (not only the validation sample)
+            self.assertEqual(self.__getTransformedCount(), sD["selected_count"])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testValidateParallel(self):
+        """ Test case - validate transformed entity protein documents with multiple worker processes
+        """
+        try:
+            obVal = ObjectValidator(self.__cfgOb, objectAdapter=InvalidAttributeAdapter(), cachePath=self.__cachePath, useCache=True)
+            ok = obVal.doTransform(
+                databaseName=self.__databaseName,
+                collectionName=self.__collectionName,
+                selectionQuery=self.__selectionQuery,
+                sampleFraction=0.5,
+                numProc=2,
+                chunkSize=2,
+                firstErrorOnly=True,
+            )
+            self.assertTrue(ok)
+            sD = obVal.getValidationSummary()
+            self.assertGreater(sD["validated_count"], 0)
+            # Only the first error is counted for each (invalid) updated object
+            self.assertEqual(sum([tD["count"] for tD in sD["path_errors"] if tD["label"] == "Updated"]), sD["validated_count"])
+            self.assertEqual(self.__getTransformedCount(), sD["selected_count"])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def objectValidatorSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ObjectValidatorTests("testValidateSampled"))
+    suiteSelect.addTest(ObjectValidatorTests("testValidateParallel"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = objectValidatorSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,130 @@
+##
+# File:    ReferenceAnnotationBundleCacheTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for per-accession reference sequence annotation bundles.
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.seq.ReferenceAnnotationBundleCache import ReferenceAnnotationBundleCache
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class ReferenceAnnotationBundleCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__refD = {
+            "P%05d" % ii: {
+                "version": ii % 4,
+                "taxonomy_id": "9606",
+                "gene": [{"name": "GENE%d" % ii}, {"name": "GENE%d" % ii}],
+                "dbReferences": [
+                    {"resource": "GO", "id_code": "GO:%07d" % ii},
+                    {"resource": "GO", "id_code": "GO:%07d" % ii},
+                    {"resource": "GO", "id_code": "GO:obsolete"},
+                    {"resource": "Pfam", "id_code": "PF%05d" % ii},
+                    {"resource": "InterPro", "id_code": "IPR%06d" % ii},
+                    {"resource": "EC", "id_code": " 1.1.1.%d" % ii},
+                    {"resource": "EC", "id_code": "9.9.9.9"},
+                    {"resource": "PDB", "id_code": "1ABC"},
+                ],
+            }
+            for ii in range(20)
+        }
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def __getBundleCache(self, withNames=True, maxSize=None):
+        def getEcId(ecId):
+            tEc = ecId.strip()
+            return tEc if tEc.startswith("1.") else None
+
+        kwD = {}
+        if withNames:
+            kwD = {
+                "goNameFunc": lambda goId: "name " + goId,
+                "pfamNameFunc": lambda idCode: "description " + idCode,
+                "interProNameFunc": lambda idCode: "name " + idCode,
+                "interProLineageFunc": lambda idCode: [{"id": idCode, "name": "name " + idCode, "depth": 1}],
+            }
+        return ReferenceAnnotationBundleCache(
+            self.__refD, lambda goId: goId != "GO:obsolete", lambda goIdL: [{"id": goIdL[0], "name": "name " + goIdL[0]}], getEcId, maxSize=maxSize, **kwD
+        )
+
+    def testBundleContent(self):
+        """ Test case - compile gene, annotation and EC bundles with and without name lookups
+        """
+        try:
+            bC = self.__getBundleCache()
+            bD = bC.get("P00003")
+            self.assertEqual(bD["version"], 3)
+            self.assertEqual(bD["gene"], [{"provenance_source": "UniProt", "value": "GENE3", "taxonomy_id": 9606}])
+            self.assertEqual(bD["ec"], ["1.1.1.3"])
+            self.assertEqual([(aD["type"], aD["annotation_id"]) for aD in bD["annotation"]], [("GO", "GO:0000003"), ("Pfam", "PF00003"), ("InterPro", "IPR000003")])
+            self.assertEqual([aD.get("name") for aD in bD["annotation"]], ["name GO:0000003", "description PF00003", "name IPR000003"])
+            self.assertTrue(all(["annotation_lineage" in aD for aD in bD["annotation"] if aD["type"] != "Pfam"]))
+            self.assertTrue(bC.get("P00003") is bD)
+            self.assertEqual(bC.get("Q99999"), None)
+            #
+            bD = self.__getBundleCache(withNames=False).get("P00003")
+            self.assertEqual([aD.get("name") for aD in bD["annotation"]], [None, None, None])
+            self.assertEqual([("annotation_lineage" in aD) for aD in bD["annotation"]], [True, False, False])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testBundleCacheSize(self):
+        """ Test case - least recently used bundles are discarded beyond the cache size
+        """
+        try:
+            bC = self.__getBundleCache(maxSize=5)
+            bD = bC.get("P00000")
+            for ii in range(1, 10):
+                bC.get("P%05d" % ii)
+                bC.get("P00000")
+            self.assertEqual(len(bC), 5)
+            self.assertTrue("P00000" in bC)
+            self.assertFalse("P00001" in bC)
+            self.assertTrue(bC.get("P00000") is bD)
+            #
+            bC = self.__getBundleCache()
+            for ii in range(20):
+                bC.get("P%05d" % ii)
+            self.assertEqual(len(bC), 20)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def referenceAnnotationBundleCacheSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ReferenceAnnotationBundleCacheTests("testBundleContent"))
+    suiteSelect.addTest(ReferenceAnnotationBundleCacheTests("testBundleCacheSize"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = referenceAnnotationBundleCacheSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
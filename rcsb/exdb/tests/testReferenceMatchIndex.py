@@ -0,0 +1,107 @@
+##
+# File:    ReferenceMatchIndexTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the compact reference sequence accession match index.
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import pickle
+import time
+import unittest
+
+from rcsb.exdb.seq.ReferenceMatchIndex import ReferenceMatchIndex
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class ReferenceMatchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output")
+        self.__matchD = {
+            "P14118": {"searchId": "P14118", "matched": "secondary", "matchedIds": {"P84099": {"taxId": 10090}, "P84100": {"taxId": 10116}, "P84098": {"taxId": 9606}}},
+            "P84098": {"searchId": "P84098", "matched": "primary", "matchedIds": {"P84098": {"taxId": 9606}}},
+            "Q9XXX1": {"searchId": "Q9XXX1", "matched": "none"},
+        }
+        for ii in range(500):
+            self.__matchD["A%05d" % ii] = {"matched": "secondary" if ii % 5 else "primary", "matchedIds": {"B%05d" % (ii % 50): {"taxId": 9606 + ii % 3}}}
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testMatchIndex(self):
+        """ Test case - build, save and memory-map a compact match index
+        """
+        try:
+            filePath = os.path.join(self.__workPath, "reference-match-index.idx")
+            # -- from the match dictionary, saved to a file and from a stream of (accession, match) pairs
+            mIL = [
+                ReferenceMatchIndex.build(self.__matchD),
+                ReferenceMatchIndex.build(self.__matchD, filePath=filePath),
+                ReferenceMatchIndex.build((rId, mD) for rId, mD in self.__matchD.items()),
+            ]
+            for mI in mIL:
+                self.assertEqual(len(mI), len(self.__matchD))
+                self.assertEqual(set(mI), set(self.__matchD))
+                self.assertEqual(mI.getMatchStatus("P84098"), "primary")
+                status, matchL = mI.getMatch("P14118")
+                self.assertEqual(status, "secondary")
+                self.assertEqual(sorted(matchL), [("P84098", 9606), ("P84099", 10090), ("P84100", 10116)])
+                self.assertEqual(mI.getMatch("Q9XXX1"), ("none", []))
+                # matched-only accessions are not search keys
+                self.assertFalse("P84099" in mI)
+                self.assertEqual(mI.getMatch("P84099"), (None, []))
+                self.assertEqual(mI.get("Z99999"), None)
+                self.assertEqual(mI["P14118"], {"matched": "secondary", "matchedIds": self.__matchD["P14118"]["matchedIds"]})
+                self.assertEqual(mI.getStatusCounts(), {"primary": 101, "secondary": 401, "none": 1})
+                #
+                tI = pickle.loads(pickle.dumps(mI))
+                self.assertEqual(tI.getMatch("A00007"), ("secondary", [("B00007", 9607)]))
+                tI.close()
+                mI.close()
+            #
+            mI = ReferenceMatchIndex(filePath)
+            self.assertEqual(len(mI), len(self.__matchD))
+            mI.close()
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testMatchIndexFormatCheck(self):
+        """ Test case - reject files not in the match index format
+        """
+        filePath = os.path.join(self.__workPath, "reference-match-index-bad.idx")
+        with open(filePath, "wb") as ofh:
+            ofh.write(b"not a match index")
+        with self.assertRaises(ValueError):
+            ReferenceMatchIndex(filePath)
+
+
+def referenceMatchIndexSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ReferenceMatchIndexTests("testMatchIndex"))
+    suiteSelect.addTest(ReferenceMatchIndexTests("testMatchIndexFormatCheck"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = referenceMatchIndexSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
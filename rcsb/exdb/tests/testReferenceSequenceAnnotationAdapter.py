@@ -4,6 +4,9 @@
 # Date:    14-Feb-2020
 #
 # Updates:
+# 16-Oct-2026 jdw add test for the GO/InterPro/EC lookup memos
+# 16-Oct-2026 jdw add test for cached per-accession annotation bundles
+# 16-Oct-2026 jdw add test for the compact reference match index
 #
 ##
 """
@@ -22,6 +25,7 @@ import time
 import tracemalloc
 import unittest
 
+from rcsb.exdb.seq.ReferenceMatchIndex import ReferenceMatchIndex
 from rcsb.exdb.seq.ReferenceSequenceAnnotationAdapter import ReferenceSequenceAnnotationAdapter
 from rcsb.exdb.seq.ReferenceSequenceAnnotationProvider import ReferenceSequenceAnnotationProvider
 from rcsb.exdb.utils.ObjectTransformer import ObjectTransformer
@@ -97,10 +101,126 @@ class ReferenceSequenceAnnotationAdapterTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testAnnotationLookupMemo(self):
+        """ Test case - pre-warmed and bounded memos for GO, InterPro and EC lookups.
+        """
+        try:
+            rsaP = ReferenceSequenceAnnotationProvider(self.__cfgOb, cachePath=self.__cachePath, useCache=True, warmMemo=True)
+            ok = rsaP.testCache()
+            self.assertTrue(ok)
+            mD = rsaP.getMemoCounts()
+            self.assertGreater(mD["go_exists"]["size"], 0)
+            self.assertEqual(mD["go_exists"]["hits"], 0)
+            #
+            goId = None
+            for uD in rsaP.getRefData().values():
+                for tD in uD.get("dbReferences", []):
+                    if tD.get("resource") == "GO" and rsaP.goIdExists(tD["id_code"]):
+                        goId = tD["id_code"]
+                        break
+                if goId:
+                    break
+            self.assertIsNotNone(goId)
+            goLin = rsaP.getGeneOntologyLineage([goId])
+            self.assertTrue(goLin)
+            # Returned lineages are copies of the memoized values
+            goLin[0]["name"] = "modified"
+            self.assertNotEqual(rsaP.getGeneOntologyLineage([goId])[0]["name"], "modified")
+            self.assertGreaterEqual(rsaP.getMemoCounts()["go_lineage"]["hits"], 2)
+            #
+            rsa = ReferenceSequenceAnnotationAdapter(rsaP)
+            obTr = ObjectTransformer(self.__cfgOb, objectAdapter=rsa)
+            ok = obTr.doTransform(
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                fetchLimit=self.__fetchLimit,
+                selectionQuery={"entity_poly.rcsb_entity_polymer_type": "Protein"},
+            )
+            self.assertTrue(ok)
+            mD = rsaP.getMemoCounts()
+            logger.info("Lookup memo counts %r", mD)
+            self.assertGreater(mD["go_exists"]["hits"], 0)
+            #
+            rsaP = ReferenceSequenceAnnotationProvider(self.__cfgOb, cachePath=self.__cachePath, useCache=True, memoSize=2, warmMemo=True)
+            mD = rsaP.getMemoCounts()
+            self.assertTrue(all([cD["size"] <= 2 for cD in mD.values()]))
+            rsaP.clearMemo()
+            self.assertEqual(rsaP.getMemoCounts(), {})
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testAnnotationBundles(self):
+        """ Test case - compile, cache and reload per-accession annotation bundles.
+        """
+        try:
+            rsaP = ReferenceSequenceAnnotationProvider(self.__cfgOb, cachePath=self.__cachePath, useCache=True, buildBundles=True)
+            ok = rsaP.testCache()
+            self.assertTrue(ok)
+            numRef = rsaP.getRefDataCount()
+            self.assertEqual(rsaP.buildAnnotationBundles(), numRef)
+            unpId = list(rsaP.getRefData().keys())[0]
+            bD = rsaP.getAnnotationBundle(unpId)
+            self.assertIsNotNone(bD)
+            self.assertTrue(all([ky in bD for ky in ["version", "gene", "annotation", "ec"]]))
+            self.assertIsNone(rsaP.getAnnotationBundle("NOT-AN-ACCESSION"))
+            #
+            # ---  Reload bundles from cache (no ontology lookups required) ---
+            rsaP = ReferenceSequenceAnnotationProvider(self.__cfgOb, cachePath=self.__cachePath, useCache=True, buildBundles=True)
+            self.assertEqual(rsaP.getMemoCounts().get("go_exists", {"misses": 0})["misses"], 0)
+            self.assertEqual(rsaP.getAnnotationBundle(unpId), bD)
+            #
+            rsa = ReferenceSequenceAnnotationAdapter(rsaP)
+            obTr = ObjectTransformer(self.__cfgOb, objectAdapter=rsa)
+            ok = obTr.doTransform(
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                fetchLimit=self.__fetchLimit,
+                selectionQuery={"entity_poly.rcsb_entity_polymer_type": "Protein"},
+            )
+            self.assertTrue(ok)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testAnnotationAdapterMatchIndex(self):
+        """ Test case - update reference sequence assignments using the compact reference match index.
+        """
+        try:
+            rsaP = ReferenceSequenceAnnotationProvider(self.__cfgOb, cachePath=self.__cachePath, useCache=True)
+            matchD = rsaP.getMatchInfo()
+            rsaP = ReferenceSequenceAnnotationProvider(self.__cfgOb, cachePath=self.__cachePath, useCache=True, compactMatchIndex=True)
+            ok = rsaP.testCache()
+            self.assertTrue(ok)
+            mI = rsaP.getMatchInfo()
+            self.assertIsInstance(mI, ReferenceMatchIndex)
+            self.assertEqual(len(mI), len(matchD))
+            for rId, mD in matchD.items():
+                status, matchL = mI.getMatch(rId)
+                self.assertEqual(status, mD["matched"])
+                self.assertEqual(len(matchL), len(mD.get("matchedIds", {})))
+                self.assertEqual(rsaP.getMatch(rId), (status, matchL))
+            #
+            rsa = ReferenceSequenceAnnotationAdapter(rsaP)
+            obTr = ObjectTransformer(self.__cfgOb, objectAdapter=rsa)
+            ok = obTr.doTransform(
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                fetchLimit=self.__fetchLimit,
+                selectionQuery={"entity_poly.rcsb_entity_polymer_type": "Protein"},
+            )
+            self.assertTrue(ok)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def referenceSequenceAnnotationAdapterSuite():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(ReferenceSequenceAnnotationAdapterTests("testAnnotationAdapter"))
+    suiteSelect.addTest(ReferenceSequenceAnnotationAdapterTests("testAnnotationLookupMemo"))
+    suiteSelect.addTest(ReferenceSequenceAnnotationAdapterTests("testAnnotationBundles"))
+    suiteSelect.addTest(ReferenceSequenceAnnotationAdapterTests("testAnnotationAdapterMatchIndex"))
     return suiteSelect
 
 
@@ -4,6 +4,7 @@
 # Date:    10-Feb-2020
 #
 # Updates:
+# 16-Oct-2026 jdw add test for on-demand (lazyLoad) reference data
 #
 ##
 """
@@ -84,10 +85,40 @@ class ReferenceSequenceCacheProviderTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testReferenceCacheProviderLazy(self):
+        """ Test case - read cached reference sequences on demand.
+        """
+        try:
+            rsaP = ReferenceSequenceCacheProvider(self.__cfgOb, maxChunkSize=50, numProc=2, expireDays=14)
+            refD = rsaP.getRefData()
+            matchD = rsaP.getMatchInfo()
+            #
+            lrsaP = ReferenceSequenceCacheProvider(self.__cfgOb, maxChunkSize=50, numProc=2, expireDays=14, lazyLoad=True, lazyCacheSize=10)
+            ok = lrsaP.testCache()
+            self.assertTrue(ok)
+            lRefD = lrsaP.getRefData()
+            lMatchD = lrsaP.getMatchInfo()
+            self.assertEqual(len(lRefD), len(refD))
+            self.assertEqual(len(lMatchD), len(matchD))
+            self.assertEqual(lRefD.getCounts()["fetched"], 0)
+            for unpId in list(refD.keys())[:20]:
+                self.assertTrue(unpId in lRefD)
+                self.assertEqual(lRefD[unpId], refD[unpId])
+                self.assertEqual(lMatchD.get(unpId), matchD.get(unpId))
+            self.assertFalse("NOT-AN-ACCESSION" in lRefD)
+            cD = lRefD.getCounts()
+            self.assertEqual(cD["fetched"], 20)
+            self.assertLessEqual(cD["size"], 10)
+            self.assertEqual(dict(lRefD.items()), refD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def referenceSequenceCacheProviderSuite():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(ReferenceSequenceCacheProviderTests("testCacheProvider"))
+    suiteSelect.addTest(ReferenceSequenceCacheProviderTests("testReferenceCacheProviderLazy"))
     return suiteSelect
 
 
@@ -0,0 +1,121 @@
+##
+# File:    SchemaValidatorCacheTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+# 16-Oct-2026 jdw add schema source and rebuild tests
+#
+##
+"""
+Tests for the cache of compiled JSON schema validators.
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.SchemaValidatorCache import SchemaValidatorCache
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class CountingSchemaProvider(object):
+    """Schema provider returning a small test schema and counting schema requests."""
+
+    def __init__(self):
+        self.count = 0
+
+    def makeSchemaDef(self, collectionGroupName, dataTyping="ANY", saveSchema=False):
+        return {}
+
+    def makeSchema(self, collectionGroupName, collectionName, encodingType="BSON", level="full", saveSchema=False):
+        return self.getJsonSchema(collectionGroupName, collectionName, encodingType=encodingType, level=level)
+
+    def getJsonSchema(self, collectionGroupName, collectionName, encodingType="BSON", level="full"):
+        self.count += 1
+        return {
+            "$schema": "http://json-schema.org/draft-04/schema#",
+            "type": "object",
+            "properties": {"rcsb_id": {"type": "string"}, "value": {"type": "integer"}},
+            "required": ["rcsb_id"],
+        }
+
+
+class SchemaValidatorCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testValidatorCache(self):
+        """ Test case - compiled validators are reused for the same database, collection, level and version
+        """
+        try:
+            schP = CountingSchemaProvider()
+            vC = SchemaValidatorCache(None, schemaProvider=schP)
+            vC.clear()
+            valInst = vC.getValidator("test_db", "test_collection", level="full", schemaVersion="1.0")
+            self.assertEqual(schP.count, 1)
+            self.assertEqual(list(valInst.iter_errors({"rcsb_id": "1ABC", "value": 1})), [])
+            self.assertEqual(len(list(valInst.iter_errors({"value": "x"}))), 2)
+            #
+            self.assertIs(SchemaValidatorCache(None, schemaProvider=schP).getValidator("test_db", "test_collection", level="full", schemaVersion="1.0"), valInst)
+            self.assertEqual(schP.count, 1)
+            self.assertIsNot(vC.getValidator("test_db", "test_collection", level="full", schemaVersion="1.1"), valInst)
+            self.assertIsNot(vC.getValidator("test_db", "test_collection", level="min", schemaVersion="1.0"), valInst)
+            self.assertEqual(schP.count, 3)
+            vC.clear()
+            vC.getValidator("test_db", "test_collection", level="full", schemaVersion="1.0")
+            self.assertEqual(schP.count, 4)
+            #
+            # Validators for other schema sources are not shared
+            self.assertIsNot(SchemaValidatorCache(None, cachePath="other", schemaProvider=schP).getValidator("test_db", "test_collection", schemaVersion="1.0"), valInst)
+            self.assertEqual(schP.count, 5)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testValidatorRebuild(self):
+        """ Test case - a rebuild request replaces the cached validator once for each instance
+        """
+        try:
+            schP = CountingSchemaProvider()
+            vC = SchemaValidatorCache(None, schemaProvider=schP)
+            vC.clear()
+            valInst = vC.getValidator("test_db", "test_collection", schemaVersion="1.0")
+            rebuildInst = vC.getValidator("test_db", "test_collection", schemaVersion="1.0", rebuildSchema=True)
+            self.assertIsNot(rebuildInst, valInst)
+            self.assertIs(vC.getValidator("test_db", "test_collection", schemaVersion="1.0", rebuildSchema=True), rebuildInst)
+            self.assertIs(vC.getValidator("test_db", "test_collection", schemaVersion="1.0"), rebuildInst)
+            self.assertEqual(schP.count, 2)
+            self.assertIsNot(SchemaValidatorCache(None, schemaProvider=schP).getValidator("test_db", "test_collection", schemaVersion="1.0", rebuildSchema=True), rebuildInst)
+            self.assertEqual(schP.count, 3)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def schemaValidatorCacheSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(SchemaValidatorCacheTests("testValidatorCache"))
+    suiteSelect.addTest(SchemaValidatorCacheTests("testValidatorRebuild"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = schemaValidatorCacheSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
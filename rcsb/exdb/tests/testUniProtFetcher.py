@@ -0,0 +1,216 @@
+##
+# File:    UniProtFetcherTests.py
+# Author:  J. Westbrook
+# Date:    16-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for concurrent UniProt reference entry fetching using a local stand-in service.
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from rcsb.exdb.seq.UniProtFetcher import UniProtFetcher
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+ENTRY_TEMPLATE = """<entry dataset="Swiss-Prot" created="2000-01-01" modified="2020-01-01" version="3">
+<accession>%(acc)s</accession><name>%(acc)s_HUMAN</name>
+<protein><recommendedName><fullName>Protein %(acc)s</fullName></recommendedName></protein>
+<gene><name type="primary">GENE%(acc)s</name></gene>
+<organism><name type="scientific">Homo sapiens</name><dbReference type="NCBI Taxonomy" id="9606"/></organism>
+<comment type="alternative products"><isoform><id>%(acc)s-2</id><name>2</name><sequence type="displayed"/></isoform></comment>
+<sequence length="10" mass="1000" checksum="0000000000000000" modified="2000-01-01" version="1">MKTAYIAKQR</sequence>
+</entry>"""
+
+
+class StandInUniProtService(object):
+    """Local stand-in for the UniProt accessions and entry services."""
+
+    def __init__(self, delaySeconds=0.1, failFirst=1, demergedD=None):
+        self.delaySeconds = delaySeconds
+        self.failFirst = failFirst
+        self.demergedD = demergedD if demergedD else {}
+        self.lock = threading.Lock()
+        self.inFlight = 0
+        self.maxInFlight = 0
+        self.requestCount = 0
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), self.__makeHandler())
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self.__server.server_address[1]
+
+    def start(self):
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def __makeHandler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                pass
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                with service.lock:
+                    service.requestCount += 1
+                    requestCount = service.requestCount
+                    service.inFlight += 1
+                    service.maxInFlight = max(service.maxInFlight, service.inFlight)
+                try:
+                    time.sleep(service.delaySeconds)
+                    self.__respond(requestCount)
+                finally:
+                    with service.lock:
+                        service.inFlight -= 1
+
+            def __respond(self, requestCount):
+                pU = urlparse(self.path)
+                if requestCount <= service.failFirst:
+                    self.__send(503 if requestCount % 2 else 429, b"", headers={"Retry-After": "0"})
+                elif pU.path == "/uniprotkb/accessions":
+                    accL = parse_qs(pU.query)["accessions"][0].split(",")
+                    if any([not acc.isalnum() for acc in accL]):
+                        self.__send(400, b"Invalid accession")
+                        return
+                    entryL = [ENTRY_TEMPLATE % {"acc": acc} for acc in accL if acc.startswith("P")]
+                    xmlText = '<?xml version="1.0"?><uniprot xmlns="http://uniprot.org/uniprot">%s</uniprot>' % "".join(entryL)
+                    self.__send(200, xmlText.encode("utf-8"), contentType="application/xml")
+                elif pU.path.startswith("/uniprotkb/"):
+                    acc = pU.path.split("/")[-1]
+                    jD = {"primaryAccession": acc, "entryType": "Inactive"}
+                    if acc in service.demergedD:
+                        jD["inactiveReason"] = {"inactiveReasonType": "DEMERGED", "mergeDemergeTo": service.demergedD[acc]}
+                    self.__send(200, json.dumps(jD).encode("utf-8"), contentType="application/json")
+                else:
+                    self.__send(404, b"")
+
+            def __send(self, statusCode, body, contentType="text/plain", headers=None):
+                self.send_response(statusCode)
+                self.send_header("Content-Type", contentType)
+                self.send_header("Content-Length", str(len(body)))
+                for ky, val in (headers or {}).items():
+                    self.send_header(ky, val)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+class UniProtFetcherTests(unittest.TestCase):
+    def setUp(self):
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)\n", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testConcurrentFetch(self):
+        """ Test case - concurrent chunked fetch with retries for transient failures
+        """
+        sS = StandInUniProtService(delaySeconds=0.2, failFirst=2).start()
+        try:
+            idList = ["P%05d" % ii for ii in range(40)] + ["P00003-2"]
+            with UniProtFetcher(urlPrimary=sS.url, maxInFlight=3, requestsPerSecond=None, backoffSeconds=0.01, retryAltApi=False) as uF:
+                chunkL = list(uF.iterFetch(idList, maxChunkSize=5))
+                cD = uF.getCounts()
+            self.assertEqual(len(chunkL), 9)
+            self.assertEqual(sorted([tId for tIdList, _, _ in chunkL for tId in tIdList]), sorted(idList))
+            refD = {}
+            matchD = {}
+            for _, tRefD, tMatchD in chunkL:
+                refD.update(tRefD)
+                matchD.update(tMatchD)
+            self.assertEqual(len(matchD), len(idList))
+            self.assertEqual(matchD["P00007"]["matched"], "primary")
+            self.assertTrue("P00003-2" in refD)
+            self.assertEqual(refD["P00011"]["gene"][0]["name"], "GENEP00011")
+            #
+            self.assertEqual(cD["retries"], 2)
+            self.assertEqual(cD["failures"], 0)
+            self.assertEqual(cD["requests"], 11)
+            self.assertGreater(sS.maxInFlight, 1)
+            self.assertLessEqual(sS.maxInFlight, 3)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+        finally:
+            sS.stop()
+
+    def testRateLimitAndRejectedAccessions(self):
+        """ Test case - rate limited fetch bisecting rejected requests and following demerged accessions
+        """
+        sS = StandInUniProtService(delaySeconds=0.0, failFirst=0, demergedD={"Q00002": ["P00020", "P00021"]}).start()
+        try:
+            idList = ["P00001", "P00002", "Q00002", "BAD_ID"]
+            with UniProtFetcher(urlPrimary=sS.url, maxInFlight=2, requestsPerSecond=20.0, backoffSeconds=0.01, retryAltApi=False) as uF:
+                startTime = time.time()
+                refD, matchD = uF.fetchList(idList)
+                elapsed = time.time() - startTime
+                cD = uF.getCounts()
+            self.assertEqual(sorted(refD), ["P00001", "P00002", "P00020", "P00021"])
+            self.assertEqual(matchD["P00002"]["matched"], "primary")
+            self.assertEqual(matchD["BAD_ID"]["matched"], "none")
+            # 3 rejected and 2 bisected accession requests + 2 missing entry lookups + 1 demerged accession request
+            self.assertEqual(cD["requests"], 8)
+            self.assertGreaterEqual(elapsed, (cD["requests"] - 1) / 20.0 * 0.9)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+        finally:
+            sS.stop()
+
+    def testRetryExhausted(self):
+        """ Test case - failure after exhausting retries
+        """
+        sS = StandInUniProtService(delaySeconds=0.0, failFirst=100).start()
+        try:
+            with UniProtFetcher(urlPrimary=sS.url, maxInFlight=1, requestsPerSecond=None, maxRetries=2, backoffSeconds=0.01, retryAltApi=False) as uF:
+                refD, matchD = uF.fetchList(["P00001"])
+                cD = uF.getCounts()
+            self.assertEqual(refD, {})
+            self.assertEqual(matchD, {})
+            self.assertEqual(cD, {"requests": 3, "retries": 2, "failures": 1})
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+        finally:
+            sS.stop()
+
+
+def uniProtFetcherSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(UniProtFetcherTests("testConcurrentFetch"))
+    suiteSelect.addTest(UniProtFetcherTests("testRateLimitAndRejectedAccessions"))
+    suiteSelect.addTest(UniProtFetcherTests("testRetryExhausted"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = uniProtFetcherSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
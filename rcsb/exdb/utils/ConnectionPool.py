@@ -0,0 +1,112 @@
+##
+# File: ConnectionPool.py
+# Date: 16-Oct-2026  jdw
+#
+# Process-wide pool of persistent document object server connections.
+#
+# Updates:
+# 16-Oct-2026  jdw leave pooled clients open on instance close() and raise on connection failure
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import atexit
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+from rcsb.db.mongo.Connection import Connection
+
+logger = logging.getLogger(__name__)
+
+# Shared connections for the current process {(id(cfgOb), resourceName): (cfgOb, Connection object, client), ...}
+_poolD = {}
+_poolPid = os.getpid()
+_poolLock = threading.Lock()
+
+
+def _resetPool():
+    """Discard connections inherited from a parent process (client objects are not fork-safe)."""
+    global _poolD, _poolPid, _poolLock  # pylint: disable=global-statement
+    _poolD = {}
+    _poolPid = os.getpid()
+    _poolLock = threading.Lock()
+
+
+def _closePool():
+    with _poolLock:
+        if _poolPid != os.getpid():
+            return
+        for ky in list(_poolD.keys()):
+            _, cObj, _ = _poolD.pop(ky)
+            try:
+                cObj.closeConnection()
+            except Exception as e:
+                logger.debug("Closing pooled connection failing with %s", str(e))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_resetPool)
+atexit.register(_closePool)
+
+
+class ConnectionPool(object):
+    """ Access to persistent document object server connections shared within the current process.
+
+        With usePool=True, a single client is opened for each configuration/resource on first use and is
+        reused by subsequent connection() requests in the same process.  Pooled clients are shared by all
+        instances and are closed at process exit or by closeAll(), not by instance close().  Clients
+        inherited across a fork (e.g. MultiProcUtil workers) are discarded and reopened in the child.
+        With usePool=False, connection() opens and closes a connection for each request.
+
+        Example:
+            with ConnectionPool(cfgOb, usePool=True) as cP:
+                with cP.connection() as client:
+                    ...
+    """
+
+    def __init__(self, cfgOb, resourceName="MONGO_DB", usePool=True):
+        self.__cfgOb = cfgOb
+        self.__resourceName = resourceName
+        self.__usePool = usePool
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @contextmanager
+    def connection(self):
+        """Context yielding a client connection (pooled or private to the context)."""
+        if not self.__usePool:
+            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+                yield client
+        else:
+            yield self.__getClient()
+
+    def __getClient(self):
+        if _poolPid != os.getpid():
+            _resetPool()
+        ky = (id(self.__cfgOb), self.__resourceName)
+        with _poolLock:
+            if ky not in _poolD:
+                cObj = Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName)
+                if not cObj.openConnection():
+                    raise IOError("Failing to open pooled connection to %s" % self.__resourceName)
+                # The configuration object reference is retained to keep the pool key valid
+                _poolD[ky] = (self.__cfgOb, cObj, cObj.getClientConnection())
+                logger.debug("Opened pooled connection for %s (pid %d)", self.__resourceName, os.getpid())
+            return _poolD[ky][2]
+
+    def close(self):
+        """Release this instance (pooled clients are shared within the process and remain open - see closeAll())."""
+
+    @staticmethod
+    def closeAll():
+        """Close all pooled connections opened in the current process."""
+        _closePool()
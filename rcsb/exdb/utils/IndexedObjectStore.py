@@ -0,0 +1,151 @@
+##
+# File: IndexedObjectStore.py
+# Date: 16-Oct-2026  jdw
+#
+# Indexed on-disk object store supporting random access to individual objects.
+#
+# Updates:
+# 16-Oct-2026  jdw add context manager support and streamed writes from (key, object) pairs
+# 16-Oct-2026  jdw add isOpen()
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+
+class IndexedObjectStore(Mapping):
+    """ Read-only dictionary-like access to objects in an indexed, length-prefixed record file.
+
+        File layout:
+
+            MAGIC | record | record | ... | index | index offset (8 bytes) | MAGIC
+
+        Each record is a length-prefixed (8 bytes) pickled and optionally compressed object.
+        The pickled index contains the record offset for each object key, the compression
+        flag and any additional (small) attributes stored with the objects.  The file is
+        memory-mapped so that a single object can be read without loading the remaining content.
+
+        Example:
+            with IndexedObjectStore(filePath) as oS:
+                obj = oS[ky]
+    """
+
+    MAGIC = b"RCSBIOS1"
+
+    def __init__(self, filePath):
+        self.__filePath = filePath
+        self.__fh = None
+        self.__mm = None
+        self.__indexD = {}
+        self.__attributeD = {}
+        self.__compress = False
+        self.__open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __open(self):
+        hLen = len(self.MAGIC)
+        self.__fh = open(self.__filePath, "rb")
+        self.__mm = mmap.mmap(self.__fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__mm[:hLen] != self.MAGIC or self.__mm[-hLen:] != self.MAGIC:
+            self.close()
+            raise ValueError("Unrecognized indexed object store format %s" % self.__filePath)
+        (offset,) = struct.unpack("<Q", self.__mm[-hLen - 8 : -hLen])
+        iD = pickle.loads(self.__mm[offset : len(self.__mm) - hLen - 8])
+        self.__indexD = iD["index"]
+        self.__attributeD = iD["attributes"]
+        self.__compress = iD["compress"]
+
+    def __getitem__(self, ky):
+        offset = self.__indexD[ky]
+        (length,) = struct.unpack("<Q", self.__mm[offset : offset + 8])
+        bV = self.__mm[offset + 8 : offset + 8 + length]
+        return pickle.loads(zlib.decompress(bV) if self.__compress else bV)
+
+    def __contains__(self, ky):
+        return ky in self.__indexD
+
+    def __iter__(self):
+        return iter(self.__indexD)
+
+    def __len__(self):
+        return len(self.__indexD)
+
+    def __getstate__(self):
+        return {"filePath": self.__filePath}
+
+    def __setstate__(self, state):
+        self.__init__(state["filePath"])
+
+    def getAttributes(self):
+        """Return the dictionary of additional attributes stored with the objects."""
+        return self.__attributeD
+
+    def isOpen(self):
+        """Return True if the store file is open for reading."""
+        return self.__mm is not None
+
+    def close(self):
+        if self.__mm is not None:
+            self.__mm.close()
+            self.__mm = None
+        if self.__fh is not None:
+            self.__fh.close()
+            self.__fh = None
+
+    @classmethod
+    def write(cls, filePath, objectD, attributeD=None, compress=True, compressLevel=1):
+        """Write the input object dictionary as an indexed object store.
+
+        Args:
+            filePath (str): output file path
+            objectD (dict or iterable): {key: object, ...} or an iterable of (key, object) pairs
+            attributeD (dict, optional): additional (small) attributes stored in the index (serialized after
+                                         all objects are written). Defaults to None.
+            compress (bool, optional): compress each record. Defaults to True.
+            compressLevel (int, optional): zlib compression level. Defaults to 1.
+
+        Returns:
+            bool: True for success or False otherwise
+        """
+        tmpPath = filePath + ".tmp"
+        try:
+            indexD = {}
+            with open(tmpPath, "wb") as ofh:
+                ofh.write(cls.MAGIC)
+                offset = len(cls.MAGIC)
+                for ky, obj in objectD.items() if isinstance(objectD, Mapping) else objectD:
+                    bV = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+                    if compress:
+                        bV = zlib.compress(bV, compressLevel)
+                    ofh.write(struct.pack("<Q", len(bV)))
+                    ofh.write(bV)
+                    indexD[ky] = offset
+                    offset += 8 + len(bV)
+                iD = {"index": indexD, "attributes": attributeD if attributeD else {}, "compress": compress}
+                ofh.write(pickle.dumps(iD, protocol=pickle.HIGHEST_PROTOCOL))
+                ofh.write(struct.pack("<Q", offset))
+                ofh.write(cls.MAGIC)
+            os.replace(tmpPath, filePath)
+            return True
+        except Exception as e:
+            logger.exception("Failing for %s with %s", filePath, str(e))
+            if os.access(tmpPath, os.W_OK):
+                os.remove(tmpPath)
+        return False
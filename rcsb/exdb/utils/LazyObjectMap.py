@@ -0,0 +1,213 @@
+##
+# File: LazyObjectMap.py
+# Date: 16-Oct-2026  jdw
+#
+# Dictionary-like access to collection objects loaded on demand and held in a bounded LRU cache.
+#
+# Updates:
+# 16-Oct-2026  jdw on a cache miss read ahead a batch of uncached keys following the requested key
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import bisect
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
+from rcsb.exdb.utils.ConnectionPool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+class LazyObjectMap(Mapping):
+    """ Read-only dictionary-like access to the objects in a document collection (or a local object store)
+        keyed by a unique attribute (e.g. rcsb_id).
+
+        Only the object keys are read on first use.  Objects are fetched on first access and held in a least
+        recently used cache of at most maxSize objects.  With readAhead=True, a cache miss fetches the requested
+        object together with the uncached objects for the following keys (in key order) in a single query of up to
+        batchSize objects.  Objects for a list of keys can be loaded with a batched query using prefetch(), and
+        items()/values() stream objects in batches of batchSize without filling the cache.
+
+        Example:
+            refD = LazyObjectMap(cfgOb, "uniprot_exdb", "reference_entry", maxSize=20000)
+            if unpId in refD:
+                uD = refD[unpId]
+    """
+
+    def __init__(
+        self, cfgOb, databaseName, collectionName, keyAttribute="rcsb_id", maxSize=10000, batchSize=500, readAhead=True, localStore=None, resourceName="MONGO_DB", usePool=True
+    ):
+        """
+        Args:
+            cfgOb (obj): configuration object
+            databaseName (str): source database name
+            collectionName (str): source collection name
+            keyAttribute (str, optional): unique key attribute. Defaults to "rcsb_id".
+            maxSize (int, optional): maximum number of cached objects. Defaults to 10000.
+            batchSize (int, optional): number of objects fetched in each query. Defaults to 500.
+            readAhead (bool, optional): on a cache miss also fetch the uncached objects for the following keys. Defaults to True.
+            localStore (obj, optional): dictionary-like object store (e.g. IndexedObjectStore()) used in place of the collection. Defaults to None.
+            resourceName (str, optional): document server resource name. Defaults to "MONGO_DB".
+            usePool (bool, optional): use a pooled server connection. Defaults to True.
+        """
+        self.__databaseName = databaseName
+        self.__collectionName = collectionName
+        self.__keyAttribute = keyAttribute
+        self.__maxSize = max(1, int(maxSize))
+        self.__batchSize = max(1, int(batchSize))
+        self.__readAhead = readAhead
+        self.__localStore = localStore
+        self.__cP = ConnectionPool(cfgOb, resourceName=resourceName, usePool=usePool)
+        #
+        self.__keyS = None
+        self.__keyL = None
+        self.__cacheD = OrderedDict()
+        self.__lock = threading.RLock()
+        self.__countD = {"hits": 0, "misses": 0, "fetches": 0, "fetched": 0}
+
+    def __getitem__(self, ky):
+        with self.__lock:
+            if ky in self.__cacheD:
+                self.__cacheD.move_to_end(ky)
+                self.__countD["hits"] += 1
+                return self.__cacheD[ky]
+            self.__countD["misses"] += 1
+            if ky not in self.__getKeySet():
+                raise KeyError(ky)
+            objD = self.__fetch(self.__getReadAheadKeys(ky) if self.__readAhead else [ky])
+            if ky not in objD:
+                raise KeyError(ky)
+            self.__cacheObjects(objD)
+            self.__cacheD.move_to_end(ky)
+            return objD[ky]
+
+    def __contains__(self, ky):
+        return ky in self.__getKeySet()
+
+    def __iter__(self):
+        return iter(list(self.__getKeySet()))
+
+    def __len__(self):
+        return len(self.__getKeySet())
+
+    def items(self):
+        """Iterate over (key, object) pairs fetching objects in batches (objects are not cached)."""
+        for objD in self.__iterBatches():
+            for ky, obj in objD.items():
+                yield ky, obj
+
+    def values(self):
+        """Iterate over objects fetching objects in batches (objects are not cached)."""
+        for objD in self.__iterBatches():
+            for obj in objD.values():
+                yield obj
+
+    def prefetch(self, keyList):
+        """Load and cache the objects for the input keys not currently cached using batched queries.
+
+        Args:
+            keyList (list): object keys
+
+        Returns:
+            int: number of objects loaded
+        """
+        with self.__lock:
+            keyS = self.__getKeySet()
+            missL = sorted(set([ky for ky in keyList if ky in keyS and ky not in self.__cacheD]))
+            # Only the most recent maxSize objects would be retained
+            missL = missL[-self.__maxSize :]
+            numLoad = 0
+            for ii in range(0, len(missL), self.__batchSize):
+                objD = self.__fetch(missL[ii : ii + self.__batchSize])
+                self.__cacheObjects(objD)
+                numLoad += len(objD)
+            return numLoad
+
+    def getCounts(self):
+        """Return cache statistics.
+
+        Returns:
+            dict: {"hits": <int>, "misses": <int>, "fetches": <queries>, "fetched": <objects fetched>, "size": <cached objects>}
+        """
+        with self.__lock:
+            rD = dict(self.__countD)
+            rD["size"] = len(self.__cacheD)
+            return rD
+
+    def clear(self):
+        """Discard cached objects and object keys."""
+        with self.__lock:
+            self.__cacheD.clear()
+            self.__keyS = None
+            self.__keyL = None
+
+    def __cacheObjects(self, objD):
+        for ky, obj in objD.items():
+            self.__cacheD[ky] = obj
+            self.__cacheD.move_to_end(ky)
+        while len(self.__cacheD) > self.__maxSize:
+            self.__cacheD.popitem(last=False)
+
+    def __getReadAheadKeys(self, ky):
+        """Return the input key followed by the next uncached keys in key order (at most min(batchSize, maxSize) keys)."""
+        if self.__keyL is None:
+            self.__keyL = sorted(self.__getKeySet())
+        numKeys = min(self.__batchSize, self.__maxSize)
+        keyL = [ky]
+        for tKy in self.__keyL[bisect.bisect_right(self.__keyL, ky) :]:
+            if len(keyL) >= numKeys:
+                break
+            if tKy not in self.__cacheD:
+                keyL.append(tKy)
+        return keyL
+
+    def __iterBatches(self):
+        keyL = sorted(self.__getKeySet())
+        for ii in range(0, len(keyL), self.__batchSize):
+            yield self.__fetch(keyL[ii : ii + self.__batchSize])
+
+    def __getKeySet(self):
+        if self.__keyS is None:
+            with self.__lock:
+                if self.__keyS is None:
+                    self.__keyS = self.__fetchKeys()
+                    logger.info("%s %s object key count %d", self.__databaseName, self.__collectionName, len(self.__keyS))
+        return self.__keyS
+
+    def __fetchKeys(self):
+        if self.__localStore is not None:
+            return set(self.__localStore.keys())
+        keyS = set()
+        try:
+            with self.__cP.connection() as client:
+                mg = MongoDbUtil(client)
+                if mg.collectionExists(self.__databaseName, self.__collectionName):
+                    dL = mg.fetch(self.__databaseName, self.__collectionName, [self.__keyAttribute], suppressId=True)
+                    keyS = set([dD[self.__keyAttribute] for dD in dL if self.__keyAttribute in dD])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return keyS
+
+    def __fetch(self, keyList):
+        objD = {}
+        self.__countD["fetches"] += 1
+        try:
+            if self.__localStore is not None:
+                objD = {ky: self.__localStore[ky] for ky in keyList if ky in self.__localStore}
+            else:
+                with self.__cP.connection() as client:
+                    mg = MongoDbUtil(client)
+                    dL = mg.fetch(self.__databaseName, self.__collectionName, None, queryD={self.__keyAttribute: {"$in": list(keyList)}}, suppressId=True)
+                    objD = {dD[self.__keyAttribute]: dD for dD in dL}
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        self.__countD["fetched"] += len(objD)
+        logger.debug("%s %s fetched %d of %d objects", self.__databaseName, self.__collectionName, len(objD), len(keyList))
+        return objD
@@ -0,0 +1,174 @@
+##
+# File: ObjectColumnarExporter.py
+# Date: 16-Oct-2026  jdw
+#
+# Utilities to export document object selections to columnar (Parquet/Arrow IPC) files.
+#
+# Updates:
+# 16-Oct-2026  jdw fail exports with values inconsistent with non-text column types rather than exporting nulls
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+
+from rcsb.exdb.utils.ObjectPathExtractor import ObjectPathExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectColumnarExporter(object):
+    """ Utilities to export document object selections to columnar (Parquet or Arrow IPC) files.
+
+        Each selected JSON path (e.g. "a.b[].c" as returned by ObjectExtractor.getPathList()) is
+        flattened into a column named by the path key (e.g. "a.b.c").  Multivalued paths are stored
+        as list columns.  Objects are streamed and written in bounded-size row groups/record batches.
+
+        Column types are fixed by the first row group (or typeD).  Later values that cannot be converted
+        to a non-text column type fail the export (set typeD to a wider or text type for such columns).
+
+        Requires the optional dependency pyarrow.
+    """
+
+    def __init__(self, stringPathList, keyColumnName="_key", typeD=None):
+        """
+        Args:
+            stringPathList (list): JSON path strings selected for export
+            keyColumnName (str, optional): name of the object key column. Defaults to "_key".
+            typeD (dict, optional): {column name: pyarrow data type} overriding the types inferred from the first row group. Defaults to None.
+        """
+        self.__pE = ObjectPathExtractor(stringPathList)
+        self.__keyColumnName = keyColumnName
+        self.__typeD = typeD if typeD else {}
+        self.__multiValuedD = {sP.replace("[]", ""): sP.find("[") != -1 for sP in stringPathList}
+
+    def export(self, filePath, objIterable, fmt="parquet", rowGroupSize=10000, compression="zstd"):
+        """Export the input (key, object) pairs to a columnar file.
+
+        Args:
+            filePath (str): output file path
+            objIterable (iterable): iterable of (key, object) pairs (e.g. ObjectExtractor.iterObjects())
+            fmt (str, optional): output format "parquet" or "arrow" (Arrow IPC file). Defaults to "parquet".
+            rowGroupSize (int, optional): maximum number of objects in each row group/record batch. Defaults to 10000.
+            compression (str, optional): Parquet compression codec. Defaults to "zstd".
+
+        Returns:
+            (bool, int): status and number of exported objects
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        sink = None
+        numRows = 0
+        tmpPath = filePath + ".tmp"
+        try:
+            pth, _ = os.path.split(filePath)
+            if pth and not os.path.isdir(pth):
+                os.makedirs(pth)
+            schema = None
+            for keyL, objL in self.__iterChunks(objIterable, rowGroupSize):
+                colD = self.__pE.getColumns(objL)
+                if schema is None:
+                    schema = self.__getSchema(pa, keyL, colD)
+                    if fmt == "parquet":
+                        writer = pq.ParquetWriter(tmpPath, schema, compression=compression)
+                    elif fmt == "arrow":
+                        sink = pa.OSFile(tmpPath, "wb")
+                        writer = pa.ipc.new_file(sink, schema)
+                    else:
+                        logger.error("Unsupported columnar format %r", fmt)
+                        return False, 0
+                batch = self.__getRecordBatch(pa, schema, keyL, colD)
+                if fmt == "parquet":
+                    writer.write_table(pa.Table.from_batches([batch]), row_group_size=rowGroupSize)
+                else:
+                    writer.write_batch(batch)
+                numRows += len(keyL)
+            if writer is None:
+                logger.warning("No objects to export to %s", filePath)
+                return False, 0
+            writer.close()
+            writer = None
+            if sink is not None:
+                sink.close()
+                sink = None
+            os.replace(tmpPath, filePath)
+            logger.info("Exported %d objects (%d columns) to %s", numRows, len(schema), filePath)
+            return True, numRows
+        except Exception as e:
+            logger.exception("Failing for %s with %s", filePath, str(e))
+        finally:
+            if writer is not None:
+                writer.close()
+            if sink is not None:
+                sink.close()
+            if os.access(tmpPath, os.W_OK):
+                os.remove(tmpPath)
+        return False, numRows
+
+    def __iterChunks(self, objIterable, chunkSize):
+        keyL = []
+        objL = []
+        for ky, obj in objIterable:
+            keyL.append(ky)
+            objL.append(obj)
+            if len(keyL) >= chunkSize:
+                yield keyL, objL
+                keyL = []
+                objL = []
+        if keyL:
+            yield keyL, objL
+
+    def __getSchema(self, pa, keyL, colD):
+        """ Fix the output schema from the input overrides or the types inferred from the first row group.
+        """
+        fL = [pa.field(self.__keyColumnName, pa.string())]
+        for ky, colL in colD.items():
+            if ky in self.__typeD:
+                fL.append(pa.field(ky, self.__typeD[ky]))
+                continue
+            try:
+                dT = pa.array(colL).type
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                dT = pa.list_(pa.string()) if self.__multiValuedD.get(ky, False) else pa.string()
+            if pa.types.is_null(dT) or (pa.types.is_list(dT) and pa.types.is_null(dT.value_type)):
+                dT = pa.list_(pa.string()) if self.__multiValuedD.get(ky, False) else pa.string()
+            fL.append(pa.field(ky, dT))
+        logger.debug("Columnar schema %r (from %d objects)", fL, len(keyL))
+        return pa.schema(fL)
+
+    def __getRecordBatch(self, pa, schema, keyL, colD):
+        aL = [pa.array(keyL, type=pa.string())]
+        for field in list(schema)[1:]:
+            colL = colD[field.name]
+            try:
+                # Infer and then (safely) cast to the fixed column type to avoid silent truncation
+                tA = pa.array(colL)
+                aL.append(tA if tA.type == field.type else tA.cast(field.type))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError) as e:
+                if self.__isText(pa, field.type):
+                    logger.warning("Column %s values not consistent with type %s (%s) - exporting as text", field.name, field.type, str(e))
+                    aL.append(pa.array(self.__toText(colL, field.type), type=field.type))
+                else:
+                    raise ValueError("Column %s values not consistent with type %s (%s) - set typeD to override" % (field.name, field.type, str(e))) from e
+        return pa.RecordBatch.from_arrays(aL, schema=schema)
+
+    def __isText(self, pa, dT):
+        return pa.types.is_string(dT) or (pa.types.is_list(dT) and pa.types.is_string(dT.value_type))
+
+    def __toText(self, colL, dT):
+        rL = []
+        isList = dT.num_fields > 0
+        for val in colL:
+            if val is None:
+                rL.append(None)
+            elif isList:
+                rL.append([str(tV) if tV is not None else None for tV in (val if isinstance(val, list) else [val])])
+            else:
+                rL.append(str(val))
+        return rL
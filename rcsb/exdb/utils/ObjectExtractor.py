@@ -6,6 +6,20 @@
 #
 # Updates:
 # 27-Jun-2019  jdw add JSON path tracking utilities.
+# 16-Oct-2026  jdw resolve selected object identifiers in batches (fetchBatchSize)
+# 16-Oct-2026  jdw add streaming iterObjects() and defer materializing the selection until requested
+# 16-Oct-2026  jdw add range-partitioned multiprocess extraction (numProc/numPartitions)
+# 16-Oct-2026  jdw add incremental cache maintenance using a stored high-water mark (incrementalCache)
+# 16-Oct-2026  jdw add random-access indexed cache format (cacheKwargs={"fmt": "indexed"})
+# 16-Oct-2026  jdw replace the recursive copying __walk() with an iterative read-only path walker
+# 16-Oct-2026  jdw use a prefix tree to filter leaf paths in getPathList() and add getPathCounts()
+# 16-Oct-2026  jdw add compilePathList() returning a compiled ObjectPathExtractor() with columnar output
+# 16-Oct-2026  jdw add exportColumnar() streaming selections to Parquet/Arrow files
+# 16-Oct-2026  jdw add server-side aggregation iterAggregate() and getDistinctValues()
+# 16-Oct-2026  jdw add opt-in persistent connection pool (usePool=True) with close() and context manager methods
+# 16-Oct-2026  jdw default compilePathList() and exportColumnar() to the leaf paths from genPathList() unless set by setPathList()
+# 16-Oct-2026  jdw close the indexed cache object store in close()
+# 16-Oct-2026  jdw propagate server failures from getDistinctValues() rather than returning an empty list
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -14,17 +28,76 @@ __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
 import copy
+import datetime
 import logging
+import math
 import os
+import re
 
-from rcsb.db.mongo.Connection import Connection
+from bson.objectid import ObjectId
 from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
+from rcsb.exdb.utils.ConnectionPool import ConnectionPool
+from rcsb.exdb.utils.IndexedObjectStore import IndexedObjectStore
+from rcsb.exdb.utils.ObjectColumnarExporter import ObjectColumnarExporter
+from rcsb.exdb.utils.ObjectPathExtractor import ObjectPathExtractor
 from rcsb.utils.io.MarshalUtil import MarshalUtil
+from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
 
 
 logger = logging.getLogger(__name__)
 
 
+class ObjectExtractorWorker(object):
+    """  A skeleton class that implements the interface expected by the multiprocessing
+         for extracting objects within disjoint ranges of object identifiers --
+    """
+
+    def __init__(self, cfgOb, **kwargs):
+        self.__cfgOb = cfgOb
+        self.__resourceName = "MONGO_DB"
+        _ = kwargs
+
+    def extractList(self, dataList, procName, optionsD, workingDir):
+        """  Extract the objects within the input list of identifier ranges [(partitionIndex, firstId, lastId), ...]
+             and return the list of extracted (partitionIndex, key, object) tuples.
+        """
+        _ = workingDir
+        databaseName = optionsD.get("databaseName", "pdbx_core")
+        collectionName = optionsD.get("collectionName", "pdbx_core_entry")
+        selectionQueryD = optionsD.get("selectionQuery", {})
+        uniqueAttributes = optionsD.get("uniqueAttributes", ["rcsb_id"])
+        selectL = optionsD.get("selectionList", [])
+        stripObjectId = optionsD.get("stripObjectId", False)
+        fetchBatchSize = optionsD.get("fetchBatchSize", 200)
+        successList = []
+        retList = []
+        diagList = []
+        #
+        try:
+            sD = {k: 1 for k in selectL} if selectL else None
+            if selectL:
+                sD["_id"] = 0
+            with ConnectionPool(self.__cfgOb, resourceName=self.__resourceName, usePool=optionsD.get("usePool", False)).connection() as client:
+                clt = client[databaseName].get_collection(collectionName)
+                for pIdx, firstId, lastId in dataList:
+                    rangeD = {"_id": {"$gte": firstId, "$lte": lastId}}
+                    qD = {"$and": [selectionQueryD, rangeD]} if selectionQueryD else rangeD
+                    for rObj in clt.find(filter=qD, projection=sD, batch_size=fetchBatchSize).sort("_id", 1):
+                        if "_id" in rObj:
+                            if stripObjectId:
+                                rObj.pop("_id")
+                            else:
+                                rObj["_id"] = str(rObj["_id"])
+                        stKey = ".".join([rObj[ky] for ky in uniqueAttributes])
+                        retList.append((pIdx, stKey, rObj))
+                    successList.append((pIdx, firstId, lastId))
+        except Exception as e:
+            logger.exception("Failing %s for %d data items %s", procName, len(dataList), str(e))
+        logger.info("%s partition count %d success count %d extracted objects %d", procName, len(dataList), len(successList), len(retList))
+        #
+        return successList, retList, diagList
+
+
 class ObjectExtractor(object):
     """ Utilities to extract document features from the document object server.
 
@@ -35,71 +108,375 @@ class ObjectExtractor(object):
         self.__resourceName = "MONGO_DB"
         self.__mU = MarshalUtil()
         #
-        self.__objectD = self.__rebuildCache(**kwargs)
+        self.__kwargs = kwargs
+        self.__cP = ConnectionPool(cfgOb, resourceName=self.__resourceName, usePool=kwargs.get("usePool", False))
+        self.__objectD = None
         self.__objPathD = {}
+        self.__isPathListSet = False
         self.__stringPathList = []
         self.__objValD = {}
+        self.__pathTokenPattern = re.compile(r"\[\]|[^.\[]+")
         #
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release any pooled connection (usePool=True) and the memory-mapped indexed cache (if any)."""
+        self.__cP.close()
+        if isinstance(self.__objectD, IndexedObjectStore):
+            self.__objectD.close()
+            self.__objectD = None
+
     def getObjects(self):
-        return self.__objectD
+        return self.__getObjectD()
+
+    def iterObjects(self):
+        """Iterate over the objects satisfying the selection conditions without materializing the selection.
+
+        Objects are streamed from a server-side cursor unless the selection has already been
+        materialized or a reusable cache file is available.
+
+        Yields:
+            (str, dict): object key (uniqueAttributes joined with '.') and object/document
+        """
+        cacheFilePath = self.__kwargs.get("cacheFilePath", None)
+        useCache = self.__kwargs.get("useCache", True)
+        if self.__objectD is not None or (useCache and cacheFilePath and os.access(cacheFilePath, os.R_OK)):
+            for ky, obj in self.__getObjectD().items():
+                yield ky, obj
+        else:
+            for ky, obj in self.__iterSelect(**self.__kwargs):
+                yield ky, obj
 
     def getPathList(self, filterList=True):
-        kL = []
+        """Return the sorted list of JSON paths accumulated by genPathList().
+
+        Args:
+            filterList (bool, optional): return only leaf paths (i.e. paths that do not prefix any other path). Defaults to True.
+
+        Returns:
+            (list): JSON path strings (e.g. "a.b[].c")
+        """
         if filterList:
-            tL = []
-            for ky in self.__objPathD:
-                if ky and (ky.find(".") != -1 or ky.startswith("_")) and ky not in ["_id"] and not ky.endswith("[]"):
-                    tL.append(ky)
-            for ky in tL:
-                for tky in tL:
-                    ok = True
-                    if ky in tky and ky != tky:
-                        ok = False
-                        break
-                if ok:
-                    kL.append(ky)
-        else:
-            kL = list(self.__objPathD.keys())
-        #
-        return sorted(kL)
+            return sorted(self.__getLeafPathList())
+        return sorted(self.__objPathD.keys())
+
+    def getPathCounts(self, filterList=True):
+        """Return the occurrence counts of the JSON paths accumulated by genPathList().
+
+        Args:
+            filterList (bool, optional): return only counts for leaf paths. Defaults to True.
+
+        Returns:
+            (dict): {JSON path string: occurrence count, ...}
+        """
+        return {ky: self.__objPathD[ky] for ky in self.getPathList(filterList=filterList)}
+
+    def __getLeafPathList(self):
+        """Return the candidate paths that are not a path prefix of any other candidate path
+        using a prefix tree over the path components.
+        """
+        tL = [ky for ky in self.__objPathD if ky and (ky.find(".") != -1 or ky.startswith("_")) and ky not in ["_id"] and not ky.endswith("[]")]
+        rootD = {}
+        nodeL = []
+        for ky in tL:
+            nodeD = rootD
+            for tok in self.__pathTokenPattern.findall(ky):
+                nodeD = nodeD.setdefault(tok, {})
+            nodeL.append(nodeD)
+        return [ky for ky, nodeD in zip(tL, nodeL) if not nodeD]
 
     def getValues(self):
         return self.__objValD
 
     def setPathList(self, stringPathList):
         self.__objPathD = {k: True for k in stringPathList}
+        self.__isPathListSet = True
         return True
 
+    def __getCurrentPathList(self):
+        """Return the path list set by setPathList() or otherwise the leaf paths accumulated by genPathList()."""
+        return list(self.__objPathD.keys()) if self.__isPathListSet else self.getPathList()
+
+    def compilePathList(self, stringPathList=None):
+        """Compile the input (or current setPathList()) paths into an accessor visiting only the selected
+        branches of each object.
+
+        Example:
+            pE = obEx.compilePathList(obEx.getPathList())
+            colD = pE.getColumns((obj for _, obj in obEx.iterObjects()), useNumpy=True)
+
+        Args:
+            stringPathList (list, optional): JSON path strings (e.g. "a.b[].c"). Defaults to the setPathList() paths or
+                                             the leaf paths accumulated by genPathList() (getPathList()).
+
+        Returns:
+            (ObjectPathExtractor): compiled path accessor with getValues(obj) and getColumns(objIterable) methods
+        """
+        return ObjectPathExtractor(stringPathList if stringPathList is not None else self.__getCurrentPathList())
+
+    def exportColumnar(self, filePath, stringPathList=None, fmt="parquet", rowGroupSize=10000, **kwargs):
+        """Stream the selected objects to a columnar (Parquet or Arrow IPC) file with one column per JSON path.
+
+        Args:
+            filePath (str): output file path
+            stringPathList (list, optional): JSON path strings (e.g. "a.b[].c"). Defaults to the setPathList() paths or
+                                             the leaf paths accumulated by genPathList() (getPathList()).
+            fmt (str, optional): output format "parquet" or "arrow". Defaults to "parquet".
+            rowGroupSize (int, optional): maximum number of objects held in memory and written per row group. Defaults to 10000.
+            kwargs: additional ObjectColumnarExporter() options (e.g. keyColumnName, typeD) and compression
+
+        Returns:
+            (bool, int): status and number of exported objects
+        """
+        pL = stringPathList if stringPathList is not None else self.__getCurrentPathList()
+        compression = kwargs.pop("compression", "zstd")
+        ocE = ObjectColumnarExporter(pL, **kwargs)
+        return ocE.export(filePath, self.iterObjects(), fmt=fmt, rowGroupSize=rowGroupSize, compression=compression)
+
+    def iterAggregate(self, pipeline=None):
+        """Iterate over the results of an aggregation pipeline evaluated on the server over the selection
+        collection (e.g. $match/$unwind/$group stages) without transferring the source documents.
+
+        Args:
+            pipeline (list, optional): aggregation pipeline stages. Defaults to the "aggregationPipeline" option.
+
+        Yields:
+            (dict): aggregation result documents
+        """
+        databaseName = self.__kwargs.get("databaseName", "pdbx_core")
+        collectionName = self.__kwargs.get("collectionName", "pdbx_core_entry")
+        fetchBatchSize = max(1, int(self.__kwargs.get("fetchBatchSize", 200)))
+        pipeline = pipeline if pipeline is not None else self.__kwargs.get("aggregationPipeline", [])
+        #
+        with self.__cP.connection() as client:
+            mg = MongoDbUtil(client)
+            if not mg.collectionExists(databaseName, collectionName):
+                logger.warning("Missing collection %s %s", databaseName, collectionName)
+                return
+            logger.debug("Aggregation pipeline %r", pipeline)
+            cursor = client[databaseName].get_collection(collectionName).aggregate(pipeline, allowDiskUse=True, batchSize=fetchBatchSize)
+            try:
+                for rObj in cursor:
+                    yield rObj
+            finally:
+                cursor.close()
+
+    def getDistinctValues(self, valuePath, elementQuery=None):
+        """Return the unique values of the input JSON path computed on the server for the objects satisfying the
+        selection query.  Each array level in the path (marked "[]") is unwound so that the optional element
+        query (e.g. {"rcsb_polymer_entity_annotation.type": "GO"}) is applied to individual array elements.
+
+        Example:
+            obEx.getDistinctValues("rcsb_polymer_entity_annotation[].annotation_id", elementQuery={"rcsb_polymer_entity_annotation.type": "GO"})
+
+        Args:
+            valuePath (str): JSON path string (e.g. "a.b[].c")
+            elementQuery (dict, optional): query applied to the unwound array elements. Defaults to None.
+
+        Returns:
+            (list): unique values (excluding null)
+
+        Raises:
+            Exception: server or aggregation failures are raised so that these are not taken as an empty result
+        """
+        pipeline = self.__getDistinctPipeline(valuePath, self.__kwargs.get("selectionQuery", None), elementQuery)
+        vL = [rObj["_id"] for rObj in self.iterAggregate(pipeline) if rObj["_id"] is not None]
+        logger.info("Distinct values for %s (%r) count %d", valuePath, elementQuery, len(vL))
+        return vL
+
+    def __getDistinctPipeline(self, valuePath, selectionQueryD, elementQueryD):
+        """Return the aggregation pipeline computing the unique values of the input JSON path.
+
+           The selection is restricted to documents containing the path and projected to the path and
+           element query attributes before unwinding each array level and grouping on the path value.
+        """
+        dotPath = valuePath.replace("[]", "")
+        unwindL = []
+        for ii, tok in enumerate(valuePath.split("[]")[:-1]):
+            unwindL.append((unwindL[ii - 1] if ii else "") + tok)
+        #
+        matchL = [selectionQueryD] if selectionQueryD else []
+        matchL.append({dotPath: {"$exists": True}})
+        pipeline = [{"$match": {"$and": matchL} if len(matchL) > 1 else matchL[0]}]
+        if not elementQueryD or not any([ky.startswith("$") for ky in elementQueryD]):
+            prjD = {ky: 1 for ky in [dotPath] + list(elementQueryD.keys() if elementQueryD else [])}
+            prjD["_id"] = 0
+            pipeline.append({"$project": prjD})
+        pipeline.extend([{"$unwind": "$" + uP} for uP in unwindL])
+        if elementQueryD:
+            pipeline.append({"$match": elementQueryD})
+        pipeline.append({"$group": {"_id": "$" + dotPath}})
+        return pipeline
+
     def getCount(self):
-        return len(self.__objectD)
+        return len(self.__getObjectD())
+
+    def __getObjectD(self):
+        if self.__objectD is None:
+            self.__objectD = self.__rebuildCache(**self.__kwargs)
+        return self.__objectD
 
     def __rebuildCache(self, **kwargs):
+        """  Return the dictionary of selected objects reusing/updating or rebuilding the optional cache file.
+
+             In incremental mode (incrementalCache=True), a high-water mark for the value of the attribute
+             incrementalMarkAttribute (default: "_id", i.e. the object insertion time) is stored with the cache.
+             On reuse, only objects with marks at or after the stored mark are extracted, objects no longer in the selection are
+             removed, and the cache file is rewritten.  Use an update timestamp attribute (e.g. rcsb_latest_update)
+             for collections updated in place.
+
+             The cache format is selected with cacheKwargs (e.g. {"fmt": "pickle"}).  The "indexed" format
+             (IndexedObjectStore) provides random access to individual cached objects without loading
+             the remaining cache content.
+        """
         cacheFilePath = kwargs.get("cacheFilePath", None)
         cacheKwargs = kwargs.get("cacheKwargs", {"fmt": "pickle"})
         useCache = kwargs.get("useCache", True)
         keyAttribute = kwargs.get("keyAttribute", "entry")
-        selectL = kwargs.get("selectionList", [])
+        incremental = kwargs.get("incrementalCache", False) and kwargs.get("objectLimit", None) is None
+        markAttribute = kwargs.get("incrementalMarkAttribute", "_id")
         #
         cD = {keyAttribute: {}}
         try:
             if useCache and cacheFilePath and os.access(cacheFilePath, os.R_OK):
-                cD = self.__mU.doImport(cacheFilePath, **cacheKwargs)
+                cD = self.__importCache(cacheFilePath, keyAttribute, **cacheKwargs)
+                if incremental:
+                    oS = cD[keyAttribute]
+                    cD, updated = self.__updateCache(cD, markAttribute, **kwargs)
+                    if isinstance(oS, IndexedObjectStore) and oS is not cD[keyAttribute]:
+                        oS.close()
+                    if updated:
+                        ok = self.__exportCache(cacheFilePath, cD, keyAttribute, **cacheKwargs)
+                        logger.info("Saved updated object results (%d) status %r in %s", len(cD[keyAttribute]), ok, cacheFilePath)
             else:
-                if selectL:
-                    objectD = self.__select(**kwargs)
-                else:
-                    objectD = self.__selectObjects(**kwargs)
+                markD = self.__getHighWaterMark(markAttribute, **kwargs) if incremental else None
+                objectD = self.__extract(**kwargs)
                 cD[keyAttribute] = objectD
+                if markD:
+                    cD["incrementalMark"] = markD
                 if cacheFilePath:
                     pth, _ = os.path.split(cacheFilePath)
                     ok = self.__mU.mkdir(pth)
-                    ok = self.__mU.doExport(cacheFilePath, cD, **cacheKwargs)
+                    ok = self.__exportCache(cacheFilePath, cD, keyAttribute, **cacheKwargs)
                     logger.info("Saved object results (%d) status %r in %s", len(objectD), ok, cacheFilePath)
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return cD[keyAttribute]
 
+    def __importCache(self, cacheFilePath, keyAttribute, **cacheKwargs):
+        if cacheKwargs.get("fmt", None) == "indexed":
+            objectD = IndexedObjectStore(cacheFilePath)
+            cD = dict(objectD.getAttributes())
+            cD[keyAttribute] = objectD
+            return cD
+        return self.__mU.doImport(cacheFilePath, **cacheKwargs)
+
+    def __exportCache(self, cacheFilePath, cD, keyAttribute, **cacheKwargs):
+        if cacheKwargs.get("fmt", None) == "indexed":
+            attributeD = {ky: val for ky, val in cD.items() if ky != keyAttribute}
+            return IndexedObjectStore.write(cacheFilePath, cD[keyAttribute], attributeD=attributeD, compress=cacheKwargs.get("compress", True))
+        return self.__mU.doExport(cacheFilePath, cD, **cacheKwargs)
+
+    def __extract(self, **kwargs):
+        selectL = kwargs.get("selectionList", [])
+        if int(kwargs.get("numProc", 1) or 1) > 1:
+            return self.__selectPartitioned(**kwargs)
+        elif selectL:
+            return self.__select(**kwargs)
+        return self.__selectObjects(**kwargs)
+
+    def __updateCache(self, cD, markAttribute, **kwargs):
+        """  Update the input cache dictionary with objects changed since the stored high-water mark and
+             remove objects no longer in the selection.
+
+        Returns:
+            (dict, bool): updated cache dictionary and flag indicating a change in the cache content
+        """
+        keyAttribute = kwargs.get("keyAttribute", "entry")
+        selectionQueryD = kwargs.get("selectionQuery", {})
+        markD = cD.get("incrementalMark", None)
+        if not markD or markD.get("attribute", None) != markAttribute:
+            logger.info("No reusable high-water mark for %r in cache - rebuilding", markAttribute)
+            markD = self.__getHighWaterMark(markAttribute, **kwargs)
+            objectD = self.__extract(**kwargs)
+            return {keyAttribute: objectD, "incrementalMark": markD}, True
+        #
+        newMarkD = self.__getHighWaterMark(markAttribute, **kwargs)
+        objectD = cD[keyAttribute] if isinstance(cD[keyAttribute], dict) else dict(cD[keyAttribute].items())
+        #
+        # Objects tied with the stored mark may have been added after the prior extraction so these are re-extracted
+        deltaD = {markAttribute: {"$gte": self.__fromMark(markD)}}
+        tKwargs = copy.copy(kwargs)
+        tKwargs["selectionQuery"] = {"$and": [selectionQueryD, deltaD]} if selectionQueryD else deltaD
+        deltaObjD = {ky: obj for ky, obj in self.__extract(**tKwargs).items() if ky not in objectD or objectD[ky] != obj}
+        objectD.update(deltaObjD)
+        #
+        keyS = self.__getSelectionKeys(**kwargs)
+        obsL = [ky for ky in objectD if ky not in keyS] if keyS is not None else []
+        for ky in obsL:
+            del objectD[ky]
+        logger.info("Incremental cache update (%r >= %r) changed objects %d obsolete objects %d", markAttribute, markD["value"], len(deltaObjD), len(obsL))
+        cD[keyAttribute] = objectD
+        cD["incrementalMark"] = newMarkD if newMarkD else markD
+        return cD, bool(deltaObjD or obsL or newMarkD != markD)
+
+    def __getSelectionKeys(self, **kwargs):
+        """  Return the set of object keys for the current selection (or None on failure).
+        """
+        databaseName = kwargs.get("databaseName", "pdbx_core")
+        collectionName = kwargs.get("collectionName", "pdbx_core_entry")
+        selectionQueryD = kwargs.get("selectionQuery", {})
+        uniqueAttributes = kwargs.get("uniqueAttributes", ["rcsb_id"])
+        try:
+            with self.__cP.connection() as client:
+                mg = MongoDbUtil(client)
+                qD = {}
+                if selectionQueryD:
+                    qD.update(selectionQueryD)
+                dL = mg.fetch(databaseName, collectionName, uniqueAttributes, queryD=qD, suppressId=True)
+                if dL is not None:
+                    return {".".join([dD[ky] for ky in uniqueAttributes]) for dD in dL}
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return None
+
+    def __getHighWaterMark(self, markAttribute, **kwargs):
+        """  Return the serializable maximum value of the input attribute within the current selection.
+        """
+        databaseName = kwargs.get("databaseName", "pdbx_core")
+        collectionName = kwargs.get("collectionName", "pdbx_core_entry")
+        selectionQueryD = kwargs.get("selectionQuery", {})
+        try:
+            with self.__cP.connection() as client:
+                qD = {markAttribute: {"$exists": True}}
+                if selectionQueryD:
+                    qD = {"$and": [selectionQueryD, qD]}
+                clt = client[databaseName].get_collection(collectionName)
+                for dD in clt.find(filter=qD, projection={markAttribute: 1}).sort(markAttribute, -1).limit(1):
+                    return self.__toMark(markAttribute, self.__getKeyValue(dD, markAttribute))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return None
+
+    def __toMark(self, markAttribute, value):
+        if isinstance(value, ObjectId):
+            return {"attribute": markAttribute, "type": "objectid", "value": str(value)}
+        elif isinstance(value, datetime.datetime):
+            return {"attribute": markAttribute, "type": "datetime", "value": value.isoformat()}
+        return {"attribute": markAttribute, "type": "value", "value": value}
+
+    def __fromMark(self, markD):
+        if markD["type"] == "objectid":
+            return ObjectId(markD["value"])
+        elif markD["type"] == "datetime":
+            return datetime.datetime.fromisoformat(markD["value"])
+        return markD["value"]
+
     def __selectObjects(self, **kwargs):
         """  Return a dictionary of objects satifying the input conditions (e.g. method, resolution limit)
         """
@@ -113,10 +490,11 @@ class ObjectExtractor(object):
         objLimit = int(tV) if tV is not None else None
         stripObjectId = kwargs.get("stripObjectId", False)
         logIncrement = kwargs.get("logIncrement", 1000)
+        fetchBatchSize = max(1, int(kwargs.get("fetchBatchSize", 200)))
         #
         objectD = {}
         try:
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            with self.__cP.connection() as client:
                 mg = MongoDbUtil(client)
                 if mg.collectionExists(databaseName, collectionName):
                     logger.info("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
@@ -128,22 +506,30 @@ class ObjectExtractor(object):
                     numDoc = len(dL) if dL else 0
                     logger.info("Selection %r fetch result count %d", selectL, numDoc)
                     #
-                    for ii, dD in enumerate(dL, 1):
-                        if "_id" not in dD:
-                            continue
-                        rObj = mg.fetchOne(databaseName, collectionName, "_id", dD["_id"])
-                        if stripObjectId and rObj and "_id" in rObj:
-                            rObj.pop("_id")
-                        else:
-                            rObj["_id"] = str(rObj["_id"])
-                        #
-                        stKey = ".".join([rObj[ky] for ky in uniqueAttributes])
-                        objectD[stKey] = copy.copy(rObj)
-                        if objLimit and ii >= objLimit:
-                            break
-                        logger.debug("Saving %d %s", ii, stKey)
-                        if ii % logIncrement == 0 or ii == numDoc:
-                            logger.info("Extracting object (%d of %d)", ii, numDoc)
+                    idL = [dD["_id"] for dD in dL if "_id" in dD] if dL else []
+                    idL = idL[:objLimit] if objLimit else idL
+                    ii = 0
+                    for jj in range(0, len(idL), fetchBatchSize):
+                        # Resolve a batch of identifiers in a single query and restore the selection order
+                        tIdL = idL[jj : jj + fetchBatchSize]
+                        tL = mg.fetch(databaseName, collectionName, [], queryD={"_id": {"$in": tIdL}})
+                        tD = {tObj["_id"]: tObj for tObj in tL} if tL else {}
+                        for tId in tIdL:
+                            ii += 1
+                            rObj = tD.get(tId, None)
+                            if not rObj:
+                                logger.debug("Missing object for %r", tId)
+                                continue
+                            if stripObjectId and "_id" in rObj:
+                                rObj.pop("_id")
+                            else:
+                                rObj["_id"] = str(rObj["_id"])
+                            #
+                            stKey = ".".join([rObj[ky] for ky in uniqueAttributes])
+                            objectD[stKey] = rObj
+                            logger.debug("Saving %d %s", ii, stKey)
+                            if ii % logIncrement == 0 or ii == numDoc:
+                                logger.info("Extracting object (%d of %d)", ii, numDoc)
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return objectD
@@ -165,7 +551,7 @@ class ObjectExtractor(object):
         #
         objectD = {}
         try:
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            with self.__cP.connection() as client:
                 mg = MongoDbUtil(client)
                 if mg.collectionExists(databaseName, collectionName):
                     logger.info("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
@@ -190,6 +576,106 @@ class ObjectExtractor(object):
         return objectD
         #
 
+    def __selectPartitioned(self, **kwargs):
+        """  Return a dictionary of objects or object content satisfying the input conditions and selection
+             options extracted in parallel over disjoint ranges of object identifiers (numProc/numPartitions).
+
+             In this mode, objectLimit applies to the selection ordered by object identifier.
+        """
+        databaseName = kwargs.get("databaseName", "pdbx_core")
+        collectionName = kwargs.get("collectionName", "pdbx_core_entry")
+        selectionQueryD = kwargs.get("selectionQuery", {})
+        numProc = int(kwargs.get("numProc", 1) or 1)
+        numPartitions = int(kwargs.get("numPartitions", None) or numProc)
+        #
+        tV = kwargs.get("objectLimit", None)
+        objLimit = int(tV) if tV is not None else None
+        #
+        objectD = {}
+        try:
+            idL = []
+            with self.__cP.connection() as client:
+                mg = MongoDbUtil(client)
+                if mg.collectionExists(databaseName, collectionName):
+                    logger.info("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
+                    qD = {}
+                    if selectionQueryD:
+                        qD.update(selectionQueryD)
+                    dL = mg.fetch(databaseName, collectionName, ["_id"], queryD=qD)
+                    idL = sorted([dD["_id"] for dD in dL if "_id" in dD]) if dL else []
+                    logger.info("Selection fetch result count %d", len(idL))
+            idL = idL[:objLimit] if objLimit else idL
+            if not idL:
+                return objectD
+            #
+            numPartitions = max(1, min(numPartitions, len(idL)))
+            pSize = int(math.ceil(float(len(idL)) / float(numPartitions)))
+            partL = [(ii, idL[jj], idL[min(jj + pSize, len(idL)) - 1]) for ii, jj in enumerate(range(0, len(idL), pSize))]
+            logger.info("Extracting %d objects in %d partitions with numProc %d", len(idL), len(partL), numProc)
+            #
+            optD = {
+                ky: kwargs[ky]
+                for ky in ["databaseName", "collectionName", "selectionQuery", "uniqueAttributes", "selectionList", "stripObjectId", "fetchBatchSize", "usePool"]
+                if ky in kwargs and kwargs[ky] is not None
+            }
+            exWorker = ObjectExtractorWorker(self.__cfgOb)
+            mpu = MultiProcUtil(verbose=True)
+            mpu.setOptions(optD)
+            mpu.set(workerObj=exWorker, workerMethod="extractList")
+            ok, failList, resultList, _ = mpu.runMulti(dataList=partL, numProc=numProc, numResults=1, chunkSize=1)
+            if not ok:
+                logger.error("Extraction failing for %d of %d partitions", len(failList), len(partL))
+            # Merge the partition results in identifier order
+            for _, stKey, rObj in sorted(resultList[0], key=lambda tup: tup[0]):
+                objectD[stKey] = rObj
+            logger.info("Merged partitioned extraction result count %d", len(objectD))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return objectD
+        #
+
+    def __iterSelect(self, **kwargs):
+        """  Yield (key, object) pairs satisfying the input conditions (e.g. method, resolution limit)
+             and selection options streamed from a server-side cursor.
+        """
+        databaseName = kwargs.get("databaseName", "pdbx_core")
+        collectionName = kwargs.get("collectionName", "pdbx_core_entry")
+        selectionQueryD = kwargs.get("selectionQuery", {})
+        uniqueAttributes = kwargs.get("uniqueAttributes", ["rcsb_id"])
+        selectL = kwargs.get("selectionList", [])
+        stripObjectId = kwargs.get("stripObjectId", False)
+        fetchBatchSize = max(1, int(kwargs.get("fetchBatchSize", 200)))
+        #
+        tV = kwargs.get("objectLimit", None)
+        objLimit = int(tV) if tV is not None else None
+        #
+        with self.__cP.connection() as client:
+            mg = MongoDbUtil(client)
+            if not mg.collectionExists(databaseName, collectionName):
+                logger.warning("Missing collection %s %s", databaseName, collectionName)
+                return
+            qD = {}
+            if selectionQueryD:
+                qD.update(selectionQueryD)
+            sD = {k: 1 for k in selectL} if selectL else None
+            if selectL:
+                sD["_id"] = 0
+            clt = client[databaseName].get_collection(collectionName)
+            cursor = clt.find(filter=qD, projection=sD, batch_size=fetchBatchSize)
+            if objLimit:
+                cursor = cursor.limit(objLimit)
+            try:
+                for rObj in cursor:
+                    if "_id" in rObj:
+                        if stripObjectId:
+                            rObj.pop("_id")
+                        else:
+                            rObj["_id"] = str(rObj["_id"])
+                    stKey = ".".join([rObj[ky] for ky in uniqueAttributes])
+                    yield stKey, rObj
+            finally:
+                cursor.close()
+
     def __getKeyValues(self, dct, keyNames):
         """Return the tuple of values of corresponding to the input dictionary key names expressed in dot notation.
 
@@ -232,13 +718,11 @@ class ObjectExtractor(object):
         sp = sp.replace(".[", "[")
         return sp
 
-    def __pathCallBack(self, path, value):
-        sp = self.__toJsonPathString(path)
-        self.__objPathD[sp] = self.__objPathD[sp] + 1 if sp in self.__objPathD else 1
-        return value
+    def __pathCallBack(self, sP, value):
+        _ = value
+        self.__objPathD[sP] = self.__objPathD.get(sP, 0) + 1
 
-    def __saveCallBack(self, path, value):
-        sP = self.__toJsonPathString(path)
+    def __saveCallBack(self, sP, value):
         if sP in self.__objPathD:
             ky = sP.replace("[]", "")
             if sP.find("[") != -1:  # multivalued
@@ -248,33 +732,56 @@ class ObjectExtractor(object):
                     self.__objValD.setdefault(ky, []).append(value)
             else:
                 self.__objValD[ky] = value
-        return value
 
     def genPathList(self, dObj, path=None):
-        return self.__walk(dObj, jsonPath=path, funct=self.__pathCallBack)
+        """Accumulate the JSON path strings (and occurrence counts) for each element of the input object.
+
+        Args:
+            dObj (dict): input object
+            path (list|str, optional): path of the input object within its parent object. Defaults to None.
+
+        Returns:
+            (dict): the input object (unmodified)
+        """
+        self.__isPathListSet = False
+        self.__walk(dObj, jsonPath=path, funct=self.__pathCallBack)
+        return dObj
 
     def genValueList(self, dObj, path=None, clear=True):
+        """Accumulate the values for the current path list (setPathList()) in the input object (getValues()).
+
+        Args:
+            dObj (dict): input object
+            path (list|str, optional): path of the input object within its parent object. Defaults to None.
+            clear (bool, optional): clear any previously accumulated values. Defaults to True.
+
+        Returns:
+            (dict): the input object (unmodified)
+        """
         self.__objValD = {} if clear else self.__objValD
-        return self.__walk(dObj, jsonPath=path, funct=self.__saveCallBack)
+        self.__walk(dObj, jsonPath=path, funct=self.__saveCallBack)
+        return dObj
 
     def __walk(self, jsonObj, jsonPath=None, funct=None):
-        """ Walk JSON data types. An optional funct() is called to mutate
-        the value of each element. The jsonPath is updated at each element.
+        """ Walk JSON data types without copying or recursion.  The optional funct(pathString, value)
+        is called for each element (read-only) after its children (i.e. in the order of the original
+        recursive traversal).  Path strings are built incrementally from the parent path (e.g. "a.b[].c").
         """
-        if jsonPath is None:
-            jsonPath = []
-
-        if isinstance(jsonObj, dict):
-            value = {k: self.__walk(v, jsonPath + [k], funct) for k, v in jsonObj.items()}
-        elif isinstance(jsonObj, list):
-            value = [self.__walk(elem, jsonPath + [[]], funct) for elem in jsonObj]
-        else:
-            value = jsonObj
-
-        if funct is None:
-            return value
-        else:
-            return funct(jsonPath, value)
+        if isinstance(jsonPath, list):
+            jsonPath = self.__toJsonPathString(jsonPath)
+        stack = [(jsonPath if jsonPath else "", jsonObj, False)]
+        while stack:
+            sP, value, expanded = stack.pop()
+            if not expanded and isinstance(value, dict):
+                stack.append((sP, value, True))
+                pfx = sP + "." if sP else ""
+                stack.extend([(pfx + k, v, False) for k, v in reversed(list(value.items()))])
+            elif not expanded and isinstance(value, list):
+                stack.append((sP, value, True))
+                tP = sP + "[]"
+                stack.extend([(tP, v, False) for v in reversed(value)])
+            elif funct is not None:
+                funct(sP, value)
 
     def __toPath(self, path):
         """ Convert path strings into path lists.
@@ -0,0 +1,107 @@
+##
+# File: ObjectPathExtractor.py
+# Date: 16-Oct-2026  jdw
+#
+# Compiled accessor for selected JSON path values in document objects.
+#
+# Updates:
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectPathExtractor(object):
+    """ Compiled accessor for selected JSON path values in document objects.
+
+        The input paths (e.g. "a.b[].c" as returned by ObjectExtractor.getPathList()) are compiled
+        into a prefix tree so that only the branches of each document containing selected paths
+        are visited.  Values are keyed and accumulated as in ObjectExtractor.genValueList()
+        (i.e. key "a.b.c", with multivalued paths returning lists).
+    """
+
+    def __init__(self, stringPathList):
+        self.__tokenPattern = re.compile(r"\[\]|[^.\[]+")
+        self.__keyList = []
+        self.__rootD = self.__compile(stringPathList)
+
+    def __compile(self, stringPathList):
+        """ Compile the input paths into a tree of nodes [childD, terminal list of (key, multivalued flag)].
+        """
+        rootD = [{}, []]
+        for sP in stringPathList:
+            nodeD = rootD
+            for tok in self.__tokenPattern.findall(sP):
+                nodeD = nodeD[0].setdefault(tok, [{}, []])
+            ky = sP.replace("[]", "")
+            nodeD[1].append((ky, sP.find("[") != -1))
+            if ky not in self.__keyList:
+                self.__keyList.append(ky)
+        return rootD
+
+    def getKeys(self):
+        """Return the list of value keys for the compiled paths."""
+        return list(self.__keyList)
+
+    def getValues(self, obj):
+        """Return the values of the compiled paths in the input object.
+
+        Args:
+            obj (dict): input object
+
+        Returns:
+            (dict): {key: value or list of values (multivalued paths), ...} for paths present in the input object
+        """
+        valD = {}
+        stack = [(self.__rootD, obj, False)]
+        while stack:
+            nodeD, value, expanded = stack.pop()
+            childD = nodeD[0]
+            if not expanded and childD:
+                # Visit the selected children before the parent (as in ObjectExtractor.genValueList())
+                stack.append((nodeD, value, True))
+                if isinstance(value, dict):
+                    stack.extend([(childD[tok], value[tok], False) for tok in reversed(list(childD)) if tok != "[]" and tok in value])
+                elif isinstance(value, list) and "[]" in childD:
+                    stack.extend([(childD["[]"], v, False) for v in reversed(value)])
+                continue
+            for ky, multiValued in nodeD[1]:
+                if multiValued:
+                    if isinstance(value, list):
+                        valD.setdefault(ky, []).extend(value)
+                    else:
+                        valD.setdefault(ky, []).append(value)
+                else:
+                    valD[ky] = value
+        return valD
+
+    def getColumns(self, objIterable, useNumpy=False):
+        """Return the values of the compiled paths for each object in the input iterable as columns.
+
+        Args:
+            objIterable (iterable): iterable of input objects
+            useNumpy (bool, optional): return columns as NumPy object arrays. Defaults to False.
+
+        Returns:
+            (dict): {key: [value for object 1, value for object 2, ...], ...} (missing values are None)
+        """
+        colD = {ky: [] for ky in self.__keyList}
+        for obj in objIterable:
+            valD = self.getValues(obj)
+            for ky, colL in colD.items():
+                colL.append(valD.get(ky, None))
+        if useNumpy:
+            import numpy as np
+
+            for ky, colL in colD.items():
+                tA = np.empty(len(colL), dtype=object)
+                tA[:] = colL
+                colD[ky] = tA
+        return colD
@@ -5,6 +5,9 @@
 # Utilities to extract and update object from the document object server.
 #
 # Updates:
+# 16-Oct-2026  jdw add parallel pipelined transform mode (numProc > 1) with batched reads and bulk replacements
+# 16-Oct-2026  jdw add checkpoint records of committed object identifiers per updateId and resume option
+# 16-Oct-2026  jdw skip replacing objects unchanged by the object adapter (canonical content hash comparison)
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -12,16 +15,181 @@ __author__ = "John Westbrook"
 __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
+import datetime
+import hashlib
+import json
 import logging
+import queue
+import threading
+
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
 
 from rcsb.db.mongo.Connection import Connection
 from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
 from rcsb.db.processors.DataExchangeStatus import DataExchangeStatus
 from rcsb.db.utils.TimeUtil import TimeUtil
+from rcsb.exdb.utils.ConnectionPool import ConnectionPool
+from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
 
 logger = logging.getLogger(__name__)
 
 
+def _getObjectHash(obj):
+    """Return a canonical (key order independent) content hash for the input object."""
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")).hexdigest()
+
+
+class ObjectTransformerCheckpoint(object):
+    """ Checkpoint records of the object identifiers committed by a transform for an update identifier.
+
+        Each record holds a committed batch of object identifiers:
+            {"update_id": ..., "database_name": ..., "object_name": ..., "object_ids": [...], "checkpoint_timestamp": ...}
+    """
+
+    def __init__(self, checkpointDatabaseName, checkpointCollectionName, updateId, databaseName, collectionName):
+        self.__ckDatabaseName = checkpointDatabaseName
+        self.__ckCollectionName = checkpointCollectionName
+        self.__updateId = updateId
+        self.__databaseName = databaseName
+        self.__collectionName = collectionName
+
+    def getIds(self, client):
+        """Return the set of object identifiers committed for the current update identifier."""
+        idS = set()
+        mg = MongoDbUtil(client)
+        if mg.collectionExists(self.__ckDatabaseName, self.__ckCollectionName):
+            qD = {"update_id": self.__updateId, "database_name": self.__databaseName, "object_name": self.__collectionName}
+            for dD in mg.fetch(self.__ckDatabaseName, self.__ckCollectionName, ["object_ids"], queryD=qD, suppressId=True):
+                idS.update(dD.get("object_ids", []))
+        return idS
+
+    def clear(self, client):
+        """Remove the checkpoint records for the target collection (all update identifiers)."""
+        mg = MongoDbUtil(client)
+        if not mg.collectionExists(self.__ckDatabaseName, self.__ckCollectionName):
+            mg.createCollection(self.__ckDatabaseName, self.__ckCollectionName)
+            mg.createIndex(self.__ckDatabaseName, self.__ckCollectionName, ["update_id", "database_name", "object_name"], indexName="primary", indexType="DESCENDING")
+            return 0
+        return mg.delete(self.__ckDatabaseName, self.__ckCollectionName, {"database_name": self.__databaseName, "object_name": self.__collectionName})
+
+    def add(self, client, idL):
+        """Record a batch of committed object identifiers."""
+        if not idL:
+            return True
+        mg = MongoDbUtil(client)
+        dD = {
+            "update_id": self.__updateId,
+            "database_name": self.__databaseName,
+            "object_name": self.__collectionName,
+            "object_ids": list(idL),
+            "checkpoint_timestamp": datetime.datetime.now(datetime.timezone.utc),
+        }
+        return mg.insert(self.__ckDatabaseName, self.__ckCollectionName, dD) is not None
+
+
+class ObjectTransformerWorker(object):
+    """  A skeleton class that implements the interface expected by the multiprocessing
+         for transforming the objects for lists of object identifiers --
+
+         The object adapter is held by the worker instance and is inherited by the forked
+         worker processes (copy-on-write) rather than pickled with each task.
+    """
+
+    def __init__(self, cfgOb, objectAdapter=None, **kwargs):
+        self.__cfgOb = cfgOb
+        self.__oAdapt = objectAdapter
+        self.__resourceName = "MONGO_DB"
+        _ = kwargs
+
+    def transformList(self, dataList, procName, optionsD, workingDir):
+        """  Transform and replace the objects for the input list of object identifiers.
+
+             Objects are read in batches (fetchBatchSize), filtered by the object adapter and
+             replaced in unordered bulk batches (writeBatchSize) by a writer thread overlapping
+             the next read and filter stages.  The identifiers in each committed batch are recorded
+             in the optional transform checkpoint (ObjectTransformerCheckpoint()).  With skipUnchanged,
+             objects with content unchanged by the object adapter are not replaced.
+        """
+        _ = workingDir
+        databaseName = optionsD.get("databaseName", "pdbx_core")
+        collectionName = optionsD.get("collectionName", "pdbx_core_entry")
+        fetchBatchSize = optionsD.get("fetchBatchSize", 100)
+        writeBatchSize = optionsD.get("writeBatchSize", 100)
+        ckObj = optionsD.get("checkpoint", None)
+        skipUnchanged = optionsD.get("skipUnchanged", True)
+        successList = []
+        diagList = []
+        #
+        wQ = queue.Queue(maxsize=2)
+        wD = {"replaced": 0, "skipped": 0, "failed": []}
+        wT = None
+        try:
+            with ConnectionPool(self.__cfgOb, resourceName=self.__resourceName, usePool=True).connection() as client:
+                clt = client[databaseName].get_collection(collectionName)
+                wT = threading.Thread(target=self.__writeBatches, args=(client, clt, wQ, wD, ckObj), name="%s-writer" % procName, daemon=True)
+                wT.start()
+                opL = []
+                for ii in range(0, len(dataList), fetchBatchSize):
+                    for rObj in clt.find({"_id": {"$in": dataList[ii : ii + fetchBatchSize]}}, batch_size=fetchBatchSize):
+                        objId = rObj.pop("_id")
+                        hashIn = _getObjectHash(rObj) if skipUnchanged else None
+                        fOk = True
+                        if self.__oAdapt:
+                            fOk, rObj = self.__oAdapt.filter(rObj)
+                        if fOk and skipUnchanged and _getObjectHash(rObj) == hashIn:
+                            # Unchanged objects are only recorded in the checkpoint
+                            wD["skipped"] += 1
+                            opL.append((objId, None))
+                        elif fOk:
+                            opL.append((objId, ReplaceOne({"_id": objId}, rObj, upsert=True)))
+                        if len(opL) >= writeBatchSize:
+                            wQ.put(opL)
+                            opL = []
+                if opL:
+                    wQ.put(opL)
+                wQ.put(None)
+                wT.join()
+                wT = None
+                failedS = set(wD["failed"])
+                successList = [objId for objId in dataList if objId not in failedS]
+        except Exception as e:
+            logger.exception("Failing %s for %d data items %s", procName, len(dataList), str(e))
+        finally:
+            if wT is not None:
+                wQ.put(None)
+                wT.join()
+        logger.info("%s object count %d replaced %d skipped %d success count %d", procName, len(dataList), wD["replaced"], wD["skipped"], len(successList))
+        #
+        return successList, [(wD["replaced"], wD["skipped"])], diagList
+
+    def __writeBatches(self, client, clt, wQ, wD, ckObj):
+        while True:
+            opL = wQ.get()
+            if opL is None:
+                break
+            wrOpL = [(objId, op) for objId, op in opL if op is not None]
+            errIdS = set()
+            try:
+                if wrOpL:
+                    rV = clt.bulk_write([op for _, op in wrOpL], ordered=False)
+                    wD["replaced"] += rV.matched_count + len(rV.upserted_ids)
+            except BulkWriteError as e:
+                errIdS = {wrOpL[err["index"]][0] for err in e.details.get("writeErrors", [])}
+                wD["failed"].extend(errIdS)
+                wD["replaced"] += len(wrOpL) - len(errIdS)
+                logger.error("Bulk replace failing for %d of %d objects", len(errIdS), len(wrOpL))
+            except Exception as e:
+                wD["failed"].extend([objId for objId, _ in wrOpL])
+                logger.exception("Failing with %s", str(e))
+                continue
+            if ckObj:
+                try:
+                    ckObj.add(client, [objId for objId, _ in opL if objId not in errIdS])
+                except Exception as e:
+                    logger.exception("Failing with %s", str(e))
+
+
 class ObjectTransformer(object):
     """ Utilities to extract and update object from the document object server.
     """
@@ -32,8 +200,24 @@ class ObjectTransformer(object):
         self.__resourceName = "MONGO_DB"
         _ = kwargs
         self.__statusList = []
+        self.__skipCount = 0
 
     def doTransform(self, **kwargs):
+        """  Transform and replace the selected objects with the object adapter filter.
+
+             With numProc > 1, objects are transformed by numProc worker processes, each reading
+             objects in batches (fetchBatchSize) and replacing them in bulk (writeBatchSize).
+             Object identifiers are distributed to the workers in chunks of chunkSize.
+
+             With checkpoint=True (and an updateId), the identifiers of committed objects are recorded
+             in checkpoint records (ObjectTransformerCheckpoint()) for the updateId.  With resume=True,
+             objects already committed for the same updateId are skipped; otherwise any prior checkpoint
+             records for the target collection are cleared at the start of the run.
+
+             With skipUnchanged=True (default), objects whose content is unchanged by the object adapter
+             (compared by canonical content hash) are not replaced.  The skipped object count is included
+             in the status record (update_skipped_count).
+        """
         desp = DataExchangeStatus()
         statusStartTimestamp = desp.setStartTime()
         #
@@ -41,17 +225,77 @@ class ObjectTransformer(object):
         collectionName = kwargs.get("collectionName", "pdbx_core_entry")
         selectionQueryD = kwargs.get("selectionQuery", {})
         fetchLimit = kwargs.get("fetchLimit", None)
+        numProc = int(kwargs.get("numProc", 1) or 1)
         tU = TimeUtil()
         updateId = kwargs.get("updateId", tU.getCurrentWeekSignature())
+        resume = kwargs.get("resume", False)
+        skipUnchanged = kwargs.get("skipUnchanged", True)
+        self.__skipCount = 0
+        ckObj = None
+        if kwargs.get("checkpoint", False) or resume:
+            ckObj = self.__getCheckpoint(
+                databaseName,
+                collectionName,
+                updateId,
+                resume=resume,
+                checkpointDatabaseName=kwargs.get("checkpointDatabaseName", None),
+                checkpointCollectionName=kwargs.get("checkpointCollectionName", "rcsb_data_exchange_checkpoint"),
+            )
         #
         docSelectList = self.__selectObjectIds(databaseName, collectionName, selectionQueryD)
         docSelectList = docSelectList[:fetchLimit] if fetchLimit else docSelectList
-        ok = self.__transform(databaseName, collectionName, docSelectList)
+        if ckObj and resume:
+            docSelectList = self.__filterCommitted(ckObj, docSelectList)
+        if numProc > 1:
+            ok = self.__transformMulti(
+                databaseName,
+                collectionName,
+                docSelectList,
+                numProc,
+                chunkSize=kwargs.get("chunkSize", None),
+                fetchBatchSize=kwargs.get("fetchBatchSize", 100),
+                writeBatchSize=kwargs.get("writeBatchSize", 100),
+                checkpoint=ckObj,
+                skipUnchanged=skipUnchanged,
+            )
+        else:
+            ok = self.__transform(databaseName, collectionName, docSelectList, checkpoint=ckObj, skipUnchanged=skipUnchanged)
         #
         if updateId:
             okS = self.__updateStatus(updateId, databaseName, collectionName, ok, statusStartTimestamp)
         return ok and okS
 
+    def __getCheckpoint(self, databaseName, collectionName, updateId, resume=False, checkpointDatabaseName=None, checkpointCollectionName="rcsb_data_exchange_checkpoint"):
+        """  Return the transform checkpoint for the input update identifier (clearing prior records unless resuming).
+        """
+        if not updateId:
+            logger.warning("Transform checkpoint requires an update identifier - checkpoint disabled")
+            return None
+        try:
+            ckDatabaseName = checkpointDatabaseName if checkpointDatabaseName else self.__cfgOb.get("DATABASE_NAME", sectionName="data_exchange_configuration")
+            ckObj = ObjectTransformerCheckpoint(ckDatabaseName, checkpointCollectionName, updateId, databaseName, collectionName)
+            if not resume:
+                with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+                    numDel = ckObj.clear(client)
+                    logger.info("Cleared %r checkpoint records for %s %s", numDel, databaseName, collectionName)
+            return ckObj
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return None
+
+    def __filterCommitted(self, ckObj, docSelectList):
+        """  Return the input selection less the objects committed in the checkpoint records.
+        """
+        try:
+            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+                idS = ckObj.getIds(client)
+            rL = [dD for dD in docSelectList if dD.get("_id", None) not in idS]
+            logger.info("Resuming transform with %d of %d objects (%d committed)", len(rL), len(docSelectList), len(docSelectList) - len(rL))
+            return rL
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return docSelectList
+
     def __selectObjectIds(self, databaseName, collectionName, selectionQueryD):
         """  Return a list of object identifiers for the input selection query.
         """
@@ -72,11 +316,12 @@ class ObjectTransformer(object):
         return dL
         #
 
-    def __transform(self, databaseName, collectionName, docSelectList, logIncrement=100):
+    def __transform(self, databaseName, collectionName, docSelectList, logIncrement=100, checkpoint=None, skipUnchanged=True):
         """  Return a list of object identifiers for the input selection query.
         """
         #
         ok = True
+        ckIdL = []
         try:
             with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
                 mg = MongoDbUtil(client)
@@ -87,11 +332,16 @@ class ObjectTransformer(object):
                             continue
                         rObj = mg.fetchOne(databaseName, collectionName, "_id", dD["_id"])
                         del rObj["_id"]
+                        hashIn = _getObjectHash(rObj) if skipUnchanged else None
                         #
                         fOk = True
                         if self.__oAdapt:
                             fOk, rObj = self.__oAdapt.filter(rObj)
-                        if fOk:
+                        if fOk and skipUnchanged and _getObjectHash(rObj) == hashIn:
+                            self.__skipCount += 1
+                            if checkpoint:
+                                ckIdL.append(dD["_id"])
+                        elif fOk:
                             rOk = mg.replace(databaseName, collectionName, rObj, dD)
                             if rOk is None:
                                 tId = rObj["rcsb_id"] if "rcsb_id" in rObj else "anonymous"
@@ -99,11 +349,58 @@ class ObjectTransformer(object):
                                 logger.debug("rObj.keys() %r", list(rObj.keys()))
                                 logger.debug("rObj.items() %s", rObj.items())
                                 rOk = False
+                            elif checkpoint:
+                                ckIdL.append(dD["_id"])
                             ok = ok and rOk
                         #
                         if ii % logIncrement == 0 or ii == numDoc:
-                            logger.info("Replace status %r object (%d of %d)", ok, ii, numDoc)
+                            logger.info("Replace status %r object (%d of %d) skipped unchanged %d", ok, ii, numDoc, self.__skipCount)
+                            if checkpoint and ckIdL:
+                                checkpoint.add(client, ckIdL)
+                                ckIdL = []
                         #
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            ok = False
+        if checkpoint and ckIdL:
+            # Record the objects committed before the failure
+            try:
+                with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+                    checkpoint.add(client, ckIdL)
+            except Exception as e:
+                logger.exception("Failing with %s", str(e))
+        return ok
+
+    def __transformMulti(self, databaseName, collectionName, docSelectList, numProc, chunkSize=None, fetchBatchSize=100, writeBatchSize=100, checkpoint=None, skipUnchanged=True):
+        """  Transform the input objects in parallel with numProc worker processes.
+        """
+        ok = False
+        try:
+            idL = [dD["_id"] for dD in docSelectList if "_id" in dD]
+            if not idL:
+                return True
+            # Default to ~4 tasks per worker process to balance the load
+            chunkSize = int(chunkSize) if chunkSize else max(1, min(1000, len(idL) // (numProc * 4)))
+            optD = {
+                "databaseName": databaseName,
+                "collectionName": collectionName,
+                "fetchBatchSize": int(fetchBatchSize),
+                "writeBatchSize": int(writeBatchSize),
+                "checkpoint": checkpoint,
+                "skipUnchanged": skipUnchanged,
+            }
+            logger.info("Transforming %d objects with numProc %d chunkSize %d", len(idL), numProc, chunkSize)
+            #
+            trWorker = ObjectTransformerWorker(self.__cfgOb, objectAdapter=self.__oAdapt)
+            mpu = MultiProcUtil(verbose=True)
+            mpu.setOptions(optD)
+            mpu.set(workerObj=trWorker, workerMethod="transformList")
+            ok, failList, resultList, _ = mpu.runMulti(dataList=idL, numProc=numProc, numResults=1, chunkSize=chunkSize)
+            self.__skipCount = sum([tup[1] for tup in resultList[0]])
+            logger.info("%r %r replaced object count %d skipped unchanged %d", databaseName, collectionName, sum([tup[0] for tup in resultList[0]]), self.__skipCount)
+            if failList:
+                logger.error("%r %r transform failing for %d of %d objects", databaseName, collectionName, len(failList), len(idL))
+                ok = False
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return ok
@@ -119,7 +416,9 @@ class ObjectTransformer(object):
             desp.setObject(databaseName, collectionName)
             desp.setStatus(updateId=updateId, successFlag=sFlag)
             desp.setEndTime()
-            self.__statusList.append(desp.getStatus())
+            sD = desp.getStatus()
+            sD["update_skipped_count"] = self.__skipCount
+            self.__statusList.append(sD)
             return True
         except Exception as e:
             logger.exception("Failing with %s", str(e))
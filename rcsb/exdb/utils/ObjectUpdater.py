@@ -5,7 +5,10 @@
 # Utilities to update document features from the document object server.
 #
 # Updates:
-#
+# 16-Oct-2026  jdw add unordered bulk upsert mode bulkUpdate()/update(..., bulk=True)
+# 16-Oct-2026  jdw add change-only update mode writing $set/$unset differences (changeOnly=True)
+# 16-Oct-2026  jdw add opt-in persistent connection pool (usePool=True) with close() and context manager methods
+# 16-Oct-2026  jdw add chunked $in deletion of identifier collections with a size guard (maxFraction) to delete()
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -13,10 +16,13 @@ __author__ = "John Westbrook"
 __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
+import datetime
 import logging
 
-from rcsb.db.mongo.Connection import Connection
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
+from rcsb.exdb.utils.ConnectionPool import ConnectionPool
 
 
 logger = logging.getLogger(__name__)
@@ -28,12 +34,27 @@ class ObjectUpdater(object):
     """
 
     def __init__(self, cfgOb, **kwargs):
+        """
+        Args:
+            cfgOb (obj): configuration object
+            usePool (bool, optional): reuse a persistent connection shared within the current process (release with close()). Defaults to False.
+        """
         self.__cfgOb = cfgOb
         self.__resourceName = "MONGO_DB"
-        _ = kwargs
+        self.__cP = ConnectionPool(cfgOb, resourceName=self.__resourceName, usePool=kwargs.get("usePool", False))
         #
 
-    def update(self, databaseName, collectionName, updateDL):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release any pooled connection (usePool=True)."""
+        self.__cP.close()
+
+    def update(self, databaseName, collectionName, updateDL, bulk=False, batchSize=500, changeOnly=False):
         """Update documents satisfying the selection details with the content of updateDL.
 
         Args:
@@ -42,11 +63,19 @@ class ObjectUpdater(object):
             updateDL = [{selectD: ..., updateD: ... }, ....]
                 selectD    = {'ky1': 'val1', 'ky2': 'val2',  ...}
                 updateD = {'key1.subkey1...': 'val1', 'key2.subkey2..': 'val2', ...}
+            bulk (bool, optional): submit the updates as unordered bulk upserts (see bulkUpdate()). Defaults to False.
+            batchSize (int, optional): maximum number of updates in each bulk request. Defaults to 500.
+            changeOnly (bool, optional): bulk mode writing only changed content (see bulkUpdate()). Defaults to False.
 
+        Returns:
+            int: modified document count (bulk mode: modified and upserted document count)
         """
+        if bulk or changeOnly:
+            cD = self.bulkUpdate(databaseName, collectionName, updateDL, batchSize=batchSize, changeOnly=changeOnly)
+            return cD["modified"] + cD["upserted"]
         try:
             numUpdated = 0
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            with self.__cP.connection() as client:
                 mg = MongoDbUtil(client)
                 if mg.collectionExists(databaseName, collectionName):
                     logger.debug("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
@@ -58,10 +87,147 @@ class ObjectUpdater(object):
             logger.exception("Failing with %s", str(e))
         return numUpdated
 
+    def bulkUpdate(self, databaseName, collectionName, updateDL, batchSize=500, changeOnly=False, ignoreAttributes=None):
+        """Upsert the content of updateDL in batches of unordered bulk requests.  Each item updates ($set)
+        the first document satisfying its selection or inserts a new document.
+
+        In changeOnly mode, the stored values of the updated attributes are compared with the input content
+        and only the changed paths are written ($set/$unset). Items with changes limited to ignoreAttributes
+        (e.g. a refreshed timestamp) are skipped.  The result is identical to the full update.
+
+        Args:
+            databaseName (str): Target database name
+            collectionName (str): Target collection name
+            updateDL = [{selectD: ..., updateD: ... }, ....] (as in update())
+            batchSize (int, optional): maximum number of updates in each bulk request. Defaults to 500.
+            changeOnly (bool, optional): write only changed content. Defaults to False.
+            ignoreAttributes (list, optional): attributes whose changes alone do not require an update. Defaults to ["rcsb_last_update"].
+
+        Returns:
+            dict: {"matched": count, "modified": count, "upserted": count, "skipped": count, "errors": count}
+        """
+        cD = {"matched": 0, "modified": 0, "upserted": 0, "skipped": 0, "errors": 0}
+        batchSize = max(1, int(batchSize))
+        ignoreAttributes = ignoreAttributes if ignoreAttributes is not None else ["rcsb_last_update"]
+        try:
+            with self.__cP.connection() as client:
+                mg = MongoDbUtil(client)
+                if mg.collectionExists(databaseName, collectionName):
+                    clt = client[databaseName].get_collection(collectionName)
+                    for ii in range(0, len(updateDL), batchSize):
+                        tDL = updateDL[ii : ii + batchSize]
+                        if changeOnly:
+                            opL = self.__getChangeOperations(clt, tDL, ignoreAttributes)
+                            cD["skipped"] += len(tDL) - len(opL)
+                        else:
+                            opL = [UpdateOne(updateD["selectD"], {"$set": updateD["updateD"]}, upsert=True) for updateD in tDL]
+                        if not opL:
+                            continue
+                        try:
+                            rV = clt.bulk_write(opL, ordered=False)
+                            cD["matched"] += rV.matched_count
+                            cD["modified"] += rV.modified_count
+                            cD["upserted"] += rV.upserted_count
+                        except BulkWriteError as e:
+                            # Unordered requests continue past failing items
+                            rD = e.details
+                            cD["matched"] += rD.get("nMatched", 0)
+                            cD["modified"] += rD.get("nModified", 0)
+                            cD["upserted"] += rD.get("nUpserted", 0)
+                            cD["errors"] += len(rD.get("writeErrors", []))
+                            logger.error("Bulk update %s %s failing for %d of %d items", databaseName, collectionName, len(rD.get("writeErrors", [])), len(opL))
+                    logger.debug("%s %s bulk update counts %r", databaseName, collectionName, cD)
+                else:
+                    logger.error("Missing collection %s %s", databaseName, collectionName)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return cD
+
+    def __getChangeOperations(self, clt, updateDL, ignoreAttributes):
+        """Return the update operations for the changed content in the input update list compared with the
+        stored documents (fetched in a single query projected on the selection and updated attributes).
+        """
+        opL = []
+        selectKeyS = set()
+        prjS = set()
+        for updateD in updateDL:
+            selectKeyS.update(updateD["selectD"].keys())
+            prjS.update([ky.split(".")[0] for ky in updateD["updateD"]])
+        prjD = {ky: 1 for ky in selectKeyS | prjS}
+        storedD = {}
+        for dObj in clt.find({"$or": [updateD["selectD"] for updateD in updateDL]}, projection=prjD):
+            storedD.setdefault(self.__getSelectKey(dObj, selectKeyS), dObj)
+        #
+        for updateD in updateDL:
+            selectD = updateD["selectD"]
+            dObj = storedD.get(self.__getSelectKey(selectD, selectKeyS), None)
+            if dObj is None:
+                opL.append(UpdateOne(selectD, {"$set": updateD["updateD"]}, upsert=True))
+                continue
+            setD = {}
+            unsetD = {}
+            for ky, val in updateD["updateD"].items():
+                found, sVal = self.__getPathValue(dObj, ky)
+                if not found:
+                    setD[ky] = val
+                else:
+                    self.__diff(ky, sVal, val, setD, unsetD)
+            if all([ky.split(".")[0] in ignoreAttributes for ky in list(setD.keys()) + list(unsetD.keys())]):
+                continue
+            opD = {"$set": setD} if setD else {}
+            if unsetD:
+                opD["$unset"] = unsetD
+            opL.append(UpdateOne(selectD, opD, upsert=True))
+        return opL
+
+    def __getSelectKey(self, dObj, selectKeyS):
+        """Return a hashable key for the selection attribute values in the input document or selection."""
+        tL = []
+        for ky in sorted(selectKeyS):
+            found, val = (True, dObj[ky]) if ky in dObj else self.__getPathValue(dObj, ky)
+            tL.append(repr(self.__normalize(val)) if found else None)
+        return tuple(tL)
+
+    def __getPathValue(self, dObj, dotPath):
+        val = dObj
+        for tok in dotPath.split("."):
+            if not isinstance(val, dict) or tok not in val:
+                return False, None
+            val = val[tok]
+        return True, val
+
+    def __diff(self, path, sVal, val, setD, unsetD):
+        """Accumulate the $set/$unset paths transforming the stored value sVal into the input value val."""
+        if isinstance(sVal, dict) and isinstance(val, dict) and val:
+            for ky, tV in val.items():
+                if ky in sVal:
+                    self.__diff(path + "." + ky, sVal[ky], tV, setD, unsetD)
+                else:
+                    setD[path + "." + ky] = tV
+            for ky in sVal:
+                if ky not in val:
+                    unsetD[path + "." + ky] = ""
+        elif self.__normalize(sVal) != self.__normalize(val):
+            setD[path] = val
+
+    def __normalize(self, val):
+        """Return the input value as stored and returned by the server (i.e. tuples as lists and datetimes
+        as naive UTC values with millisecond precision).
+        """
+        if isinstance(val, (list, tuple)):
+            return [self.__normalize(tV) for tV in val]
+        if isinstance(val, dict):
+            return {ky: self.__normalize(tV) for ky, tV in val.items()}
+        if isinstance(val, datetime.datetime):
+            if val.tzinfo is not None:
+                val = val.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+            return val.replace(microsecond=(val.microsecond // 1000) * 1000)
+        return val
+
     def count(self, databaseName, collectionName):
         try:
             numTotal = 0
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            with self.__cP.connection() as client:
                 mg = MongoDbUtil(client)
                 if mg.collectionExists(databaseName, collectionName):
                     numTotal = mg.count(databaseName, collectionName)
@@ -84,7 +250,7 @@ class ObjectUpdater(object):
         """
         try:
             logger.debug("Create database %s collection %s", databaseName, collectionName)
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            with self.__cP.connection() as client:
                 mg = MongoDbUtil(client)
                 if checkExists and mg.databaseExists(databaseName) and mg.collectionExists(databaseName, collectionName):
                     ok1 = True
@@ -102,22 +268,53 @@ class ObjectUpdater(object):
             logger.exception("Failing with %s", str(e))
         return False
 
-    def delete(self, databaseName, collectionName, selectD):
+    def delete(self, databaseName, collectionName, selectD, chunkSize=1000, maxFraction=None):
         """Remove documents satisfying the input selection details.
 
+        A selection attribute with a collection (list/tuple/set) of values is translated into a sequence
+        of chunked {attribute: {"$in": [...]}} deletions (e.g. selectD = {"rcsb_id": [id1, id2, ...]}).
+
         Args:
             databaseName (str): Target database name
             collectionName (str): Target collection name
-            selectD    = {'ky1': 'val1', 'ky2': 'val2',  ...}
+            selectD    = {'ky1': 'val1', 'ky2': 'val2',  ...} or {'ky1': [val1, val2, ...], 'ky2': 'val2', ...}
+            chunkSize (int, optional): maximum number of values in each chunked deletion. Defaults to 1000.
+            maxFraction (float, optional): maximum fraction of the collection removed by an identifier collection deletion. Defaults to None (no limit).
 
+        Returns:
+            (int): deletion count
         """
+        numDeleted = 0
         try:
-            numDeleted = 0
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            setKeyL = [ky for ky, val in selectD.items() if isinstance(val, (list, tuple, set, frozenset))]
+            if len(setKeyL) > 1:
+                logger.error("Unsupported selection with multiple identifier collections %r", setKeyL)
+                return numDeleted
+            with self.__cP.connection() as client:
                 mg = MongoDbUtil(client)
-                if mg.collectionExists(databaseName, collectionName):
-                    logger.info("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
-                    numDeleted = mg.delete(databaseName, collectionName, selectD)
+                if not mg.collectionExists(databaseName, collectionName):
+                    return numDeleted
+                numTotal = mg.count(databaseName, collectionName)
+                logger.info("%s %s document count is %d", databaseName, collectionName, numTotal)
+                if not setKeyL:
+                    return mg.delete(databaseName, collectionName, selectD)
+                #
+                setKey = setKeyL[0]
+                idL = sorted(set(selectD[setKey]), key=str)
+                maxDelete = int(maxFraction * numTotal) if maxFraction is not None else None
+                if maxDelete is not None and len(idL) > maxDelete:
+                    logger.error("%s %s deletion of %d of %d documents exceeds limit fraction %.3f - skipping", databaseName, collectionName, len(idL), numTotal, maxFraction)
+                    return numDeleted
+                chunkSize = max(1, int(chunkSize))
+                for ii in range(0, len(idL), chunkSize):
+                    qD = {ky: val for ky, val in selectD.items() if ky != setKey}
+                    qD[setKey] = {"$in": idL[ii : ii + chunkSize]}
+                    num = mg.delete(databaseName, collectionName, qD)
+                    numDeleted += num
+                    logger.info("%s %s chunk %d deleted %d of %d (total %d)", databaseName, collectionName, ii // chunkSize + 1, num, len(qD[setKey]["$in"]), numDeleted)
+                    if maxDelete is not None and numDeleted >= maxDelete and ii + chunkSize < len(idL):
+                        logger.error("%s %s deletion count %d reached limit fraction %.3f - stopping", databaseName, collectionName, numDeleted, maxFraction)
+                        break
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return numDeleted
@@ -0,0 +1,135 @@
+##
+# File: ObjectUpdaterQueue.py
+# Date: 16-Oct-2026  jdw
+#
+# Write-behind queue for saving document chunks with ObjectUpdater() in a background thread.
+#
+# Updates:
+# 16-Oct-2026  jdw count chunks with unsaved items as errors, report failed chunk tags and close the updater on exit
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import queue
+import threading
+import time
+
+from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectUpdaterQueue(object):
+    """ Write-behind queue for saving document chunks with ObjectUpdater() in a background thread.
+
+        Chunks submitted with put() are saved in submission order while the caller continues
+        with other work (e.g. fetching the next chunk).  The queue is bounded so that put()
+        blocks when maxQueueSize chunks are pending (backpressure).  Pending chunks are saved
+        by flush(), close() or on exiting the context manager.
+
+        Chunks are saved as unordered bulk upserts (ObjectUpdater.bulkUpdate()).  A chunk with any
+        item that is not saved (i.e. not matched, upserted or skipped as unchanged) is counted as an
+        error, and the tag submitted with the chunk is returned by getFailedTags().
+
+        Example:
+            with ObjectUpdaterQueue(cfgOb, changeOnly=True) as uQ:
+                for ii, chunk in enumerate(...):
+                    uQ.put(databaseName, collectionName, updateDL, tag=ii)
+            failedTagL = uQ.getFailedTags()
+    """
+
+    def __init__(self, cfgOb, maxQueueSize=2, **kwargs):
+        """
+        Args:
+            cfgOb (obj): configuration object
+            maxQueueSize (int, optional): maximum number of pending chunks. Defaults to 2.
+            kwargs: ObjectUpdater.bulkUpdate() options (batchSize, changeOnly, ignoreAttributes)
+        """
+        self.__cfgOb = cfgOb
+        self.__updateKwargs = {ky: kwargs[ky] for ky in ["batchSize", "changeOnly", "ignoreAttributes"] if ky in kwargs}
+        self.__queue = queue.Queue(maxsize=max(1, int(maxQueueSize)))
+        self.__thread = None
+        self.__lock = threading.Lock()
+        self.__countD = {"chunks": 0, "updated": 0, "errors": 0}
+        self.__failedTagL = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def put(self, databaseName, collectionName, updateDL, tag=None):
+        """Submit a chunk of updates (as in ObjectUpdater.update()), blocking while the queue is full.
+
+        Args:
+            databaseName (str): Target database name
+            collectionName (str): Target collection name
+            updateDL (list): [{selectD: ..., updateD: ... }, ....]
+            tag (obj, optional): caller identifier for the chunk reported by getFailedTags() if the save fails. Defaults to None.
+        """
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="ObjectUpdaterQueue", daemon=True)
+                self.__thread.start()
+        self.__queue.put((databaseName, collectionName, updateDL, tag))
+
+    def flush(self):
+        """Wait until all submitted chunks have been saved."""
+        if self.__thread is not None:
+            self.__queue.join()
+
+    def close(self):
+        """Save any pending chunks and stop the background thread.
+
+        Returns:
+            dict: {"chunks": saved chunk count, "updated": updated document count, "errors": failed chunk count}
+        """
+        with self.__lock:
+            if self.__thread is not None:
+                self.__queue.put(None)
+                self.__thread.join()
+                self.__thread = None
+        return self.getCounts()
+
+    def getCounts(self):
+        return dict(self.__countD)
+
+    def getFailedTags(self):
+        """Return the list of tags for chunks that were not completely saved (call after flush() or close())."""
+        return list(self.__failedTagL)
+
+    def __run(self):
+        obUpd = ObjectUpdater(self.__cfgOb, usePool=True)
+        try:
+            while True:
+                tup = self.__queue.get()
+                ok = False
+                try:
+                    if tup is None:
+                        break
+                    databaseName, collectionName, updateDL, _ = tup
+                    startTime = time.time()
+                    cD = obUpd.bulkUpdate(databaseName, collectionName, updateDL, **self.__updateKwargs)
+                    numSaved = cD["matched"] + cD["upserted"] + cD["skipped"]
+                    numUpd = cD["modified"] + cD["upserted"]
+                    self.__countD["chunks"] += 1
+                    self.__countD["updated"] += numUpd
+                    ok = not cD["errors"] and numSaved >= len(updateDL)
+                    if ok:
+                        logger.info("Saved %s %s chunk (len=%d) updated %d in %.3f secs", databaseName, collectionName, len(updateDL), numUpd, time.time() - startTime)
+                    else:
+                        logger.error("Failing %s %s chunk (len=%d) saved %d errors %d", databaseName, collectionName, len(updateDL), numSaved, cD["errors"])
+                except Exception as e:
+                    logger.exception("Failing with %s", str(e))
+                finally:
+                    if tup is not None and not ok:
+                        self.__countD["errors"] += 1
+                        self.__failedTagL.append(tup[3])
+                    self.__queue.task_done()
+        finally:
+            obUpd.close()
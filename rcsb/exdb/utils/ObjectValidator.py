@@ -5,6 +5,10 @@
 # Utilities to extract and update object from the document object server including validation.
 #
 # Updates:
+# 16-Oct-2026  jdw use cached compiled validators, add post-filter only and first error validation options
+# 16-Oct-2026  jdw add sampled and parallel (numProc) validation modes and a validation error summary by path
+# 16-Oct-2026  jdw apply validation samples only to validation (all selected objects are transformed and replaced)
+# 16-Oct-2026  jdw make schema regeneration opt-in (rebuildSchema=True)
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -12,48 +16,138 @@ __author__ = "John Westbrook"
 __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
+import collections
 import logging
+import random
 
-from jsonschema import Draft4Validator
-from jsonschema import FormatChecker
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
 
 from rcsb.db.mongo.Connection import Connection
 from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
 from rcsb.db.processors.DataExchangeStatus import DataExchangeStatus
 from rcsb.db.utils.SchemaProvider import SchemaProvider
 from rcsb.db.utils.TimeUtil import TimeUtil
+from rcsb.exdb.utils.ConnectionPool import ConnectionPool
+from rcsb.exdb.utils.SchemaValidatorCache import SchemaValidatorCache
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
 
 logger = logging.getLogger(__name__)
 
 
+def _getErrors(valInst, rObj, firstErrorOnly=False):
+    """Return the sorted validation errors for the input object (or only the first error unsorted)."""
+    if firstErrorOnly:
+        error = next(valInst.iter_errors(rObj), None)
+        return [error] if error is not None else []
+    return sorted(valInst.iter_errors(rObj), key=str)
+
+
+def _getErrorKey(error, label):
+    """Return the summary key (label, path, validator) for the input validation error (path as e.g. "a.b[].c")."""
+    pth = ""
+    for tok in error.absolute_path:
+        if isinstance(tok, int):
+            pth += "[]"
+        else:
+            pth += "." + tok if pth else tok
+    return (label, pth, error.validator)
+
+
+class ObjectValidatorWorker(object):
+    """  A skeleton class that implements the interface expected by the multiprocessing
+         for transforming and validating the objects for lists of object identifiers --
+
+         The compiled validator and the object adapter are held by the worker instance and are
+         inherited by the forked worker processes (copy-on-write).
+    """
+
+    def __init__(self, cfgOb, valInst, objectAdapter=None, **kwargs):
+        self.__cfgOb = cfgOb
+        self.__valInst = valInst
+        self.__oAdapt = objectAdapter
+        self.__resourceName = "MONGO_DB"
+        _ = kwargs
+
+    def validateList(self, dataList, procName, optionsD, workingDir):
+        """  Transform, validate and replace the objects for the input list of object identifiers and
+             return the validation error counts [((label, path, validator), count), ...].
+        """
+        _ = workingDir
+        databaseName = optionsD.get("databaseName", "pdbx_core")
+        collectionName = optionsD.get("collectionName", "pdbx_core_entry")
+        validateOriginal = optionsD.get("validateOriginal", True)
+        firstErrorOnly = optionsD.get("firstErrorOnly", False)
+        fetchBatchSize = optionsD.get("fetchBatchSize", 100)
+        validateIdS = optionsD.get("validateIdS", None)
+        successList = []
+        diagList = []
+        errCounter = collections.Counter()
+        #
+        try:
+            failedS = set()
+            with ConnectionPool(self.__cfgOb, resourceName=self.__resourceName, usePool=True).connection() as client:
+                clt = client[databaseName].get_collection(collectionName)
+                for ii in range(0, len(dataList), fetchBatchSize):
+                    opL = []
+                    for rObj in clt.find({"_id": {"$in": dataList[ii : ii + fetchBatchSize]}}, batch_size=fetchBatchSize):
+                        objId = rObj.pop("_id")
+                        validate = validateIdS is None or objId in validateIdS
+                        fOk = True
+                        if self.__oAdapt:
+                            if validate and validateOriginal:
+                                errCounter.update([_getErrorKey(error, "Original") for error in _getErrors(self.__valInst, rObj, firstErrorOnly=firstErrorOnly)])
+                            fOk, rObj = self.__oAdapt.filter(rObj)
+                            if validate:
+                                errCounter.update([_getErrorKey(error, "Updated") for error in _getErrors(self.__valInst, rObj, firstErrorOnly=firstErrorOnly)])
+                        if fOk:
+                            opL.append((objId, ReplaceOne({"_id": objId}, rObj, upsert=True)))
+                    if opL:
+                        try:
+                            clt.bulk_write([op for _, op in opL], ordered=False)
+                        except BulkWriteError as e:
+                            failedS.update([opL[err["index"]][0] for err in e.details.get("writeErrors", [])])
+                            logger.error("%s bulk replace failing for %d objects", procName, len(e.details.get("writeErrors", [])))
+            successList = [objId for objId in dataList if objId not in failedS]
+        except Exception as e:
+            logger.exception("Failing %s for %d data items %s", procName, len(dataList), str(e))
+        logger.info("%s object count %d success count %d validation error count %d", procName, len(dataList), len(successList), sum(errCounter.values()))
+        #
+        return successList, list(errCounter.items()), diagList
+
+
 class ObjectValidator(object):
     """ Utilities to extract and update object from the document object server with validation.
+
+        Validators are built from the cached schema unless rebuildSchema=True, in which case the schema
+        definition and JSON schema are regenerated once in the current process.
     """
 
-    def __init__(self, cfgOb, objectAdapter=None, cachePath=".", useCache=True, **kwargs):
+    def __init__(self, cfgOb, objectAdapter=None, cachePath=".", useCache=True, rebuildSchema=False, **kwargs):
         self.__cfgOb = cfgOb
         self.__oAdapt = objectAdapter
+        self.__rebuildSchema = rebuildSchema
         self.__resourceName = "MONGO_DB"
         _ = kwargs
         self.__statusList = []
         self.__schP = SchemaProvider(self.__cfgOb, cachePath, useCache=useCache)
+        self.__valCache = SchemaValidatorCache(self.__cfgOb, cachePath=cachePath, useCache=useCache, schemaProvider=self.__schP)
         self.__valInst = None
+        self.__errCounter = collections.Counter()
+        self.__summaryD = {}
 
     def __getValidator(self, databaseName, collectionName, schemaLevel="full"):
-        _ = self.__schP.makeSchemaDef(databaseName, dataTyping="ANY", saveSchema=True)
-        cD = self.__schP.makeSchema(databaseName, collectionName, encodingType="JSON", level=schemaLevel, saveSchema=True)
-        # Raises exceptions for schema compliance.
-        Draft4Validator.check_schema(cD)
-        valInst = Draft4Validator(cD, format_checker=FormatChecker())
-        return valInst
-
-    def __validateObj(self, databaseName, collectionName, rObj, label=""):
+        return self.__valCache.getValidator(databaseName, collectionName, level=schemaLevel, rebuildSchema=self.__rebuildSchema)
+
+    def __validateObj(self, databaseName, collectionName, rObj, label="", firstErrorOnly=False):
         try:
             eCount = 0
             tId = rObj["rcsb_id"] if rObj and "rcsb_id" in rObj else "anonymous"
-            for error in sorted(self.__valInst.iter_errors(rObj), key=str):
-                logger.info("Database %s collection %s (%s %r) path %s error: %s", databaseName, collectionName, label, tId, error.path, error.message)
-                logger.debug(">>> Failing object is %r", rObj)
+            for error in _getErrors(self.__valInst, rObj, firstErrorOnly=firstErrorOnly):
+                # Errors are counted by path in the validation summary
+                logger.debug("Database %s collection %s (%s %r) path %s error: %s", databaseName, collectionName, label, tId, error.path, error.message)
+                self.__errCounter[_getErrorKey(error, label)] += 1
                 eCount += 1
         except Exception as e:
             logger.exception("Validation failing %s", str(e))
@@ -61,6 +155,22 @@ class ObjectValidator(object):
         return eCount
 
     def doTransform(self, **kwargs):
+        """  Transform, validate and replace the selected objects.
+
+             Options: validateOriginal=False validates only the filtered object (default validates both
+             the original and filtered objects), firstErrorOnly=True reports only the first validation
+             error for each object (unsorted).
+
+             Sampling: sampleFraction=f validates a random fraction of the selected objects and
+             sampleSize=n validates a stratified sample of n objects (one object drawn at random from each
+             of n equal strata of the selection ordered by object identifier); sampleSeed fixes the sample.
+             All selected objects are transformed and replaced whether or not these are validated.
+
+             With numProc > 1, objects are validated by numProc worker processes in chunks of chunkSize.
+
+             Validation errors are counted by (label, path, validator) in a summary document
+             (getValidationSummary()), optionally exported to summaryFilePath (JSON).
+        """
         desp = DataExchangeStatus()
         statusStartTimestamp = desp.setStartTime()
         #
@@ -69,20 +179,90 @@ class ObjectValidator(object):
         selectionQueryD = kwargs.get("selectionQuery", {})
         fetchLimit = kwargs.get("fetchLimit", None)
         #
-
+        validateOriginal = kwargs.get("validateOriginal", True)
+        firstErrorOnly = kwargs.get("firstErrorOnly", False)
+        numProc = int(kwargs.get("numProc", 1) or 1)
         #
         tU = TimeUtil()
         updateId = kwargs.get("updateId", tU.getCurrentWeekSignature())
         #
         docSelectList = self.__selectObjectIds(databaseName, collectionName, selectionQueryD)
         docSelectList = docSelectList[:fetchLimit] if fetchLimit else docSelectList
-
-        ok = self.__transform(databaseName, collectionName, docSelectList)
+        numSelected = len(docSelectList)
+        sampleList = self.__sampleObjectIds(docSelectList, kwargs.get("sampleFraction", None), kwargs.get("sampleSize", None), kwargs.get("sampleSeed", None))
+        validateIdS = set([dD["_id"] for dD in sampleList if "_id" in dD]) if len(sampleList) < numSelected else None
+        #
+        self.__errCounter = collections.Counter()
+        if numProc > 1:
+            ok = self.__transformMulti(
+                databaseName,
+                collectionName,
+                docSelectList,
+                numProc,
+                chunkSize=kwargs.get("chunkSize", None),
+                validateOriginal=validateOriginal,
+                firstErrorOnly=firstErrorOnly,
+                validateIdS=validateIdS,
+            )
+        else:
+            ok = self.__transform(databaseName, collectionName, docSelectList, validateOriginal=validateOriginal, firstErrorOnly=firstErrorOnly, validateIdS=validateIdS)
+        self.__summaryD = self.__makeSummary(updateId, databaseName, collectionName, numSelected, len(sampleList), kwargs.get("summaryFilePath", None))
         #
         if updateId:
             okS = self.__updateStatus(updateId, databaseName, collectionName, ok, statusStartTimestamp)
         return ok and okS
 
+    def getValidationSummary(self):
+        """Return the validation summary document for the last transform.
+
+        Returns:
+            dict: {"update_id": ..., "database_name": ..., "collection_name": ..., "selected_count": ..., "validated_count": ...,
+                   "error_count": ..., "path_errors": [{"label": ..., "path": ..., "validator": ..., "count": ...}, ...]}
+        """
+        return self.__summaryD
+
+    def __makeSummary(self, updateId, databaseName, collectionName, numSelected, numValidated, summaryFilePath=None):
+        sD = {
+            "update_id": updateId,
+            "database_name": databaseName,
+            "collection_name": collectionName,
+            "selected_count": numSelected,
+            "validated_count": numValidated,
+            "error_count": sum(self.__errCounter.values()),
+            "path_errors": [{"label": label, "path": pth, "validator": vName, "count": cnt} for (label, pth, vName), cnt in self.__errCounter.most_common()],
+        }
+        logger.info(
+            "Database %s collection %s validated %d of %d objects with %d errors in %d paths",
+            databaseName,
+            collectionName,
+            numValidated,
+            numSelected,
+            sD["error_count"],
+            len(sD["path_errors"]),
+        )
+        if summaryFilePath:
+            mU = MarshalUtil()
+            ok = mU.doExport(summaryFilePath, sD, fmt="json", indent=3)
+            logger.info("Exported validation summary to %s (%r)", summaryFilePath, ok)
+        return sD
+
+    def __sampleObjectIds(self, docSelectList, sampleFraction=None, sampleSize=None, sampleSeed=None):
+        """  Return a random (sampleFraction) or stratified (sampleSize) sample of the input object selection.
+        """
+        numDoc = len(docSelectList)
+        rng = random.Random(sampleSeed)
+        if sampleSize is not None and 0 < int(sampleSize) < numDoc:
+            numSample = int(sampleSize)
+            dL = sorted(docSelectList, key=lambda dD: dD["_id"])
+            rL = [dL[rng.randrange(ii * numDoc // numSample, (ii + 1) * numDoc // numSample)] for ii in range(numSample)]
+        elif sampleFraction is not None and 0.0 < float(sampleFraction) < 1.0:
+            numSample = max(1, int(round(numDoc * float(sampleFraction))))
+            rL = [docSelectList[ii] for ii in sorted(rng.sample(range(numDoc), numSample))]
+        else:
+            return docSelectList
+        logger.info("Validating a sample of %d of %d selected objects", len(rL), numDoc)
+        return rL
+
     def __selectObjectIds(self, databaseName, collectionName, selectionQueryD):
         """  Return a list of object identifiers for the input selection query.
         """
@@ -104,7 +284,7 @@ class ObjectValidator(object):
         return dL
         #
 
-    def __transform(self, databaseName, collectionName, docSelectList, logIncrement=100):
+    def __transform(self, databaseName, collectionName, docSelectList, logIncrement=100, validateOriginal=True, firstErrorOnly=False, validateIdS=None):
         """  Return a list of object identifiers for the input selection query.
         """
         #
@@ -120,13 +300,16 @@ class ObjectValidator(object):
                             continue
                         rObj = mg.fetchOne(databaseName, collectionName, "_id", dD["_id"])
                         del rObj["_id"]
+                        validate = validateIdS is None or dD["_id"] in validateIdS
                         #
                         fOk = True
 
                         if self.__oAdapt:
-                            self.__validateObj(databaseName, collectionName, rObj, label="Original")
+                            if validate and validateOriginal:
+                                self.__validateObj(databaseName, collectionName, rObj, label="Original", firstErrorOnly=firstErrorOnly)
                             fOk, rObj = self.__oAdapt.filter(rObj)
-                            self.__validateObj(databaseName, collectionName, rObj, label="Updated")
+                            if validate:
+                                self.__validateObj(databaseName, collectionName, rObj, label="Updated", firstErrorOnly=firstErrorOnly)
                         if fOk:
                             rOk = mg.replace(databaseName, collectionName, rObj, dD)
                             if rOk is None:
@@ -144,6 +327,40 @@ class ObjectValidator(object):
             logger.exception("Failing with %s", str(e))
         return ok
 
+    def __transformMulti(self, databaseName, collectionName, docSelectList, numProc, chunkSize=None, validateOriginal=True, firstErrorOnly=False, validateIdS=None):
+        """  Transform and validate the input objects in parallel with numProc worker processes.
+        """
+        ok = False
+        try:
+            idL = [dD["_id"] for dD in docSelectList if "_id" in dD]
+            if not idL:
+                return True
+            # The validator is compiled before the worker processes are forked
+            self.__valInst = self.__getValidator(databaseName, collectionName, schemaLevel="full")
+            chunkSize = int(chunkSize) if chunkSize else max(1, min(1000, len(idL) // (numProc * 4)))
+            optD = {
+                "databaseName": databaseName,
+                "collectionName": collectionName,
+                "validateOriginal": validateOriginal,
+                "firstErrorOnly": firstErrorOnly,
+                "validateIdS": validateIdS,
+            }
+            logger.info("Transforming %d objects with numProc %d chunkSize %d", len(idL), numProc, chunkSize)
+            #
+            vWorker = ObjectValidatorWorker(self.__cfgOb, self.__valInst, objectAdapter=self.__oAdapt)
+            mpu = MultiProcUtil(verbose=True)
+            mpu.setOptions(optD)
+            mpu.set(workerObj=vWorker, workerMethod="validateList")
+            ok, failList, resultList, _ = mpu.runMulti(dataList=idL, numProc=numProc, numResults=1, chunkSize=chunkSize)
+            for ky, cnt in resultList[0]:
+                self.__errCounter[ky] += cnt
+            if failList:
+                logger.error("%r %r transform failing for %d of %d objects", databaseName, collectionName, len(failList), len(idL))
+                ok = False
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return ok
+
     def getLoadStatus(self):
         return self.__statusList
 
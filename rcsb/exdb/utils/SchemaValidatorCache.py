@@ -0,0 +1,113 @@
+##
+# File: SchemaValidatorCache.py
+# Date: 16-Oct-2026  jdw
+#
+# Process-wide cache of compiled JSON schema validators.
+#
+# Updates:
+# 16-Oct-2026  jdw key validators by schema source and recompile on the first rebuild request of each instance
+#
+##
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import logging
+import threading
+
+from jsonschema import Draft4Validator
+from jsonschema import FormatChecker
+
+from rcsb.db.helpers.DocumentDefinitionHelper import DocumentDefinitionHelper
+from rcsb.db.utils.SchemaProvider import SchemaProvider
+
+logger = logging.getLogger(__name__)
+
+# Compiled validators for the current process {(cachePath, useCache, databaseName, collectionName, level, schemaVersion): validator, ...}
+_validatorD = {}
+_validatorLock = threading.Lock()
+
+
+class SchemaValidatorCache(object):
+    """ Process-wide cache of compiled JSON schema (Draft4) validators keyed by schema source (cachePath
+        and useCache), database, collection, schema level and schema version.
+
+        The schema version is taken from the document collection configuration unless provided.
+        Schemas are reloaded from the schema cache only on the first request for each key in the
+        current process.  A rebuild request (rebuildSchema=True) replaces any cached validator for the
+        key the first time it is made through each SchemaValidatorCache() instance.
+    """
+
+    def __init__(self, cfgOb, cachePath=".", useCache=True, schemaProvider=None):
+        """
+        Args:
+            cfgOb (obj): configuration object
+            cachePath (str, optional): top cache path for schema files. Defaults to ".".
+            useCache (bool, optional): use cached schema files. Defaults to True.
+            schemaProvider (obj, optional): instance of SchemaProvider(). Defaults to None.
+        """
+        self.__cfgOb = cfgOb
+        self.__cachePath = cachePath
+        self.__useCache = useCache
+        self.__schP = schemaProvider
+        self.__docHelper = None
+        self.__rebuiltS = set()
+
+    def getValidator(self, databaseName, collectionName, level="full", schemaVersion=None, rebuildSchema=False):
+        """Return a compiled validator for the input collection schema.
+
+        Args:
+            databaseName (str): database (collection schema group) name
+            collectionName (str): collection name
+            level (str, optional): schema completeness level (e.g. min or full). Defaults to "full".
+            schemaVersion (str, optional): schema version. Defaults to the configured collection version.
+            rebuildSchema (bool, optional): regenerate the schema definition and JSON schema (once for each instance). Defaults to False.
+
+        Returns:
+            (obj): Draft4Validator instance
+        """
+        if schemaVersion is None:
+            schemaVersion = self.__getCollectionVersion(databaseName, collectionName)
+        ky = (self.__cachePath, self.__useCache, databaseName, collectionName, level, schemaVersion)
+        rebuildSchema = rebuildSchema and ky not in self.__rebuiltS
+        with _validatorLock:
+            if ky in _validatorD and not rebuildSchema:
+                logger.debug("Using cached validator for %r", ky)
+                return _validatorD[ky]
+        #
+        schP = self.__getSchemaProvider()
+        if rebuildSchema:
+            _ = schP.makeSchemaDef(databaseName, dataTyping="ANY", saveSchema=True)
+            cD = schP.makeSchema(databaseName, collectionName, encodingType="JSON", level=level, saveSchema=True)
+        else:
+            logger.info("Fetch schema for %r %r validation level %r", databaseName, collectionName, level)
+            cD = schP.getJsonSchema(databaseName, collectionName, encodingType="JSON", level=level)
+        # Raises exceptions for schema compliance.
+        Draft4Validator.check_schema(cD)
+        valInst = Draft4Validator(cD, format_checker=FormatChecker())
+        with _validatorLock:
+            _validatorD[ky] = valInst
+        if rebuildSchema:
+            self.__rebuiltS.add(ky)
+        logger.info("Compiled validator for %r", ky)
+        return valInst
+
+    def clear(self):
+        """Discard all cached validators in the current process."""
+        with _validatorLock:
+            _validatorD.clear()
+
+    def __getSchemaProvider(self):
+        if self.__schP is None:
+            self.__schP = SchemaProvider(self.__cfgOb, self.__cachePath, useCache=self.__useCache)
+        return self.__schP
+
+    def __getCollectionVersion(self, databaseName, collectionName):
+        try:
+            if self.__docHelper is None:
+                self.__docHelper = DocumentDefinitionHelper(cfgOb=self.__cfgOb)
+            return self.__docHelper.getCollectionVersion(databaseName, collectionName)
+        except Exception as e:
+            logger.debug("Collection version for %s %s failing with %s", databaseName, collectionName, str(e))
+        return None
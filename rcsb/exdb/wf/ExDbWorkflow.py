@@ -5,6 +5,10 @@
 #  Workflow wrapper  --  exchange database loading utilities --
 #
 #  Updates:
+#  16-Oct-2026 jdw pass numProc to the reference sequence update transform
+#  16-Oct-2026 jdw checkpoint the reference sequence update transform and add resume option
+#  16-Oct-2026 jdw use a separate transformNumProc option (default 1) for the reference sequence update transform
+#  16-Oct-2026 jdw add checkpoint option for the reference sequence update transform (default True)
 #
 ##
 __docformat__ = "restructuredtext en"
@@ -68,8 +72,13 @@ class ExDbWorkflow(object):
             #
             readBackCheck = kwargs.get("readBackCheck", False)
             numProc = int(kwargs.get("numProc", 1))
+            # worker processes for the reference sequence update transform (forked transform workers with transformNumProc > 1)
+            transformNumProc = int(kwargs.get("transformNumProc", 1))
             chunkSize = int(kwargs.get("chunkSize", 10))
             refChunkSize = int(kwargs.get("refChunkSize", 100))
+            # record (checkpoint) and resume an interrupted reference sequence update transform from its checkpoint
+            checkpoint = kwargs.get("checkpoint", True)
+            resume = kwargs.get("resume", False)
             documentLimit = int(kwargs.get("documentLimit")) if "documentLimit" in kwargs else None
             loadType = kwargs.get("loadType", "full")  # or replace
             dbType = kwargs.get("dbType", "mongo")
@@ -135,6 +144,9 @@ class ExDbWorkflow(object):
                     minMatchPrimaryPercent=minMatchPrimaryPercent,
                     minMissing=minMissing,
                     refChunkSize=refChunkSize,
+                    transformNumProc=transformNumProc,
+                    checkpoint=checkpoint,
+                    resume=resume,
                 )
                 okS = ok
 
@@ -166,7 +178,19 @@ class ExDbWorkflow(object):
             logger.exception("Failing with %s", str(e))
         return ret
 
-    def doReferenceSequenceUpdate(self, fetchLimit=None, useSequenceCache=False, testMode=False, minMatchPrimaryPercent=None, minMissing=0, refChunkSize=50, **kwargs):
+    def doReferenceSequenceUpdate(
+        self,
+        fetchLimit=None,
+        useSequenceCache=False,
+        testMode=False,
+        minMatchPrimaryPercent=None,
+        minMissing=0,
+        refChunkSize=50,
+        transformNumProc=1,
+        checkpoint=True,
+        resume=False,
+        **kwargs
+    ):
         try:
             _ = kwargs
             databaseName = "pdbx_core"
@@ -180,7 +204,13 @@ class ExDbWorkflow(object):
                 rsa = ReferenceSequenceAnnotationAdapter(rsaP)
                 obTr = ObjectTransformer(self.__cfgOb, objectAdapter=rsa)
                 ok = obTr.doTransform(
-                    databaseName=databaseName, collectionName=collectionName, fetchLimit=fetchLimit, selectionQuery={"entity_poly.rcsb_entity_polymer_type": polymerType}
+                    databaseName=databaseName,
+                    collectionName=collectionName,
+                    fetchLimit=fetchLimit,
+                    selectionQuery={"entity_poly.rcsb_entity_polymer_type": polymerType},
+                    numProc=transformNumProc,
+                    checkpoint=checkpoint,
+                    resume=resume,
                 )
             else:
                 logger.error("Reference sequence data cache build failing")
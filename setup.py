@@ -42,6 +42,7 @@ setup(
     install_requires=[
         "jsonschema >= 2.6.0",
         "numpy",
+        "requests",
         "rcsb.utils.io >= 0.90",
         "rcsb.db >= 1.001",
         "rcsb.utils.chemref >= 0.49",
@@ -65,7 +66,7 @@ setup(
     tests_require=["tox"],
     #
     # Not configured ...
-    extras_require={"dev": ["check-manifest"], "test": ["coverage"]},
+    extras_require={"dev": ["check-manifest"], "test": ["coverage"], "columnar": ["pyarrow"]},
     # Added for
     command_options={"build_sphinx": {"project": ("setup.py", thisPackage), "version": ("setup.py", version), "release": ("setup.py", version)}},
     # This setting for namespace package support -